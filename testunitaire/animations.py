@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+MasterCamp Robotique - Moteur d'animation des LED WS2812
+
+Les animations tournent sur un thread de fond à fréquence fixe : chaque trame
+est calculée à partir du temps écoulé (et non d'un compteur de sleep), avec une
+attente jusqu'à l'échéance suivante. Les trames en retard ou sautées sont
+comptées, et le programme principal reste libre pendant l'animation.
+
+Exemple:
+    engine = AnimationEngine(controller, fps=30)
+    engine.start()
+    engine.play(Blink('AG', (255, 80, 0), period=0.8))
+    engine.play(Breathe('C', (0, 0, 255)))
+    ...  # la boucle du robot continue
+    engine.stop()
+"""
+
+import math
+import threading
+import time
+
+import numpy
+
+
+def _check_positive(name, value):
+    """ValueError si value n'est pas un nombre fini strictement positif"""
+    if not value > 0 or not math.isfinite(value):
+        raise ValueError(f"{name} {value} invalide (> 0)")
+    return value
+
+
+class Effect:
+    """
+    Effet de base : calcule la couleur d'un ensemble de LED à l'instant t
+
+    Les sous-classes implémentent _colors(t) qui retourne un tableau (N, 3)
+    de couleurs RGB pour les N LED de l'effet.
+    """
+
+    def __init__(self, leds=None, duration=None):
+        """
+        Args:
+            leds: Groupe ('C', 'BG', 'BD', 'AG', 'AD'), numéro, liste de LED ou None (toutes)
+            duration (float): Durée de l'effet en secondes (None = infini)
+        """
+        self.leds = leds
+        self.duration = duration
+        self.index = None
+        self.start_time = None
+        self.done = threading.Event()
+        self.error = None           # Exception levée pendant le rendu (relancée par wait())
+
+    def bind(self, controller):
+        """Résout les LED de l'effet sur le contrôleur (ValueError si une LED n'existe pas)"""
+        if self.leds is None:
+            leds = list(range(controller.led_count))
+        elif isinstance(self.leds, (list, tuple, range)):
+            leds = list(self.leds)
+        else:
+            leds = controller._parse_led_identifier(self.leds)
+            if isinstance(leds, int):
+                leds = [leds]
+            if leds is None:
+                raise ValueError(f"Identifiant LED '{self.leds}' invalide")
+        invalid = [led for led in leds if not 0 <= led < controller.led_count]
+        if invalid:
+            raise ValueError(f"LED {invalid} hors de 0-{controller.led_count - 1}")
+        self.index = numpy.array(leds, dtype=numpy.intp)
+
+    def render(self, t):
+        """Retourne les couleurs (uint8, N x 3) à l'instant t (secondes depuis le début)"""
+        return numpy.clip(self._colors(t), 0, 255).astype(numpy.uint8)
+
+    def finished(self, t):
+        return self.duration is not None and t >= self.duration
+
+    def _colors(self, t):
+        raise NotImplementedError
+
+
+class Chase(Effect):
+    """Point lumineux avec traînée qui parcourt les LED"""
+
+    def __init__(self, leds=None, color=(255, 0, 0), speed=10.0, tail=3, duration=None):
+        """
+        Args:
+            speed (float): Vitesse en LED par seconde
+            tail (int): Longueur de la traînée en LED
+        """
+        super().__init__(leds, duration)
+        self.color = numpy.array(color, dtype=numpy.float32)
+        self.speed = speed
+        self.tail = max(1, tail)
+
+    def _colors(self, t):
+        n = len(self.index)
+        head = (t * self.speed) % n
+        distance = (head - numpy.arange(n)) % n
+        level = numpy.clip(1.0 - distance / self.tail, 0.0, 1.0)
+        return level[:, None] * self.color
+
+
+class Wipe(Effect):
+    """Allumage séquentiel des LED, une par une"""
+
+    def __init__(self, leds=None, color=(255, 0, 0), speed=10.0):
+        """
+        Args:
+            speed (float): Vitesse en LED par seconde (strictement positive)
+        """
+        _check_positive("Vitesse (LED/s)", speed)
+        super().__init__(leds)
+        self.color = numpy.array(color, dtype=numpy.float32)
+        self.speed = speed
+
+    def bind(self, controller):
+        super().bind(controller)
+        self.duration = len(self.index) / self.speed
+
+    def _colors(self, t):
+        lit = numpy.arange(len(self.index)) < t * self.speed
+        return lit[:, None] * self.color
+
+
+class Fade(Effect):
+    """Transition linéaire d'une couleur à une autre"""
+
+    def __init__(self, leds=None, start=(0, 0, 0), end=(255, 255, 255), duration=1.0):
+        super().__init__(leds, duration)
+        self.start = numpy.array(start, dtype=numpy.float32)
+        self.end = numpy.array(end, dtype=numpy.float32)
+
+    def _colors(self, t):
+        k = min(1.0, t / self.duration) if self.duration else 1.0
+        color = self.start + (self.end - self.start) * k
+        return numpy.broadcast_to(color, (len(self.index), 3))
+
+
+class Breathe(Effect):
+    """Respiration : intensité sinusoïdale entre 0 et la couleur"""
+
+    def __init__(self, leds=None, color=(0, 0, 255), period=2.0, duration=None):
+        _check_positive("Période", period)
+        super().__init__(leds, duration)
+        self.color = numpy.array(color, dtype=numpy.float32)
+        self.period = period
+
+    def _colors(self, t):
+        level = (1.0 - math.cos(2 * math.pi * t / self.period)) / 2
+        return numpy.broadcast_to(self.color * level, (len(self.index), 3))
+
+
+class Blink(Effect):
+    """Clignotement tout ou rien"""
+
+    def __init__(self, leds=None, color=(255, 0, 0), period=1.0, duty=0.5, duration=None):
+        """
+        Args:
+            period (float): Période de clignotement en secondes
+            duty (float): Fraction de la période où les LED sont allumées (0-1)
+        """
+        _check_positive("Période", period)
+        if not 0 <= duty <= 1:
+            raise ValueError(f"Rapport cyclique {duty} hors de 0-1")
+        super().__init__(leds, duration)
+        self.color = numpy.array(color, dtype=numpy.float32)
+        self.period = period
+        self.duty = duty
+
+    def _colors(self, t):
+        on = (t % self.period) < self.period * self.duty
+        return numpy.broadcast_to(self.color * on, (len(self.index), 3))
+
+
+class Sequence(Effect):
+    """Enchaîne plusieurs effets de durée finie sur leurs propres LED"""
+
+    def __init__(self, *effects):
+        if not effects:
+            raise ValueError("Sequence sans effet")
+        super().__init__()
+        self.effects = effects
+
+    def bind(self, controller):
+        for effect in self.effects:
+            effect.bind(controller)
+        self.duration = sum(effect.duration for effect in self.effects)
+        self.index = self.effects[0].index
+
+    def render(self, t):
+        for effect in self.effects:
+            if t < effect.duration or effect is self.effects[-1]:
+                self.index = effect.index
+                return effect.render(min(t, effect.duration))
+            t -= effect.duration
+
+
+class AnimationEngine:
+    """
+    Ordonnanceur d'animations à fréquence fixe pour un WS2812Controller
+
+    Les effets joués en même temps sont rendus dans l'ordre d'ajout
+    (le dernier ajouté est dessiné par-dessus), puis une seule trame est envoyée.
+    """
+
+    def __init__(self, controller, fps=30):
+        """
+        Args:
+            controller (WS2812Controller): Contrôleur des LED
+            fps (float): Fréquence d'images cible (> 0)
+        """
+        _check_positive("Fréquence d'images", fps)
+        self.controller = controller
+        self.fps = fps
+        self.effects = []
+        self._effects_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+        # Statistiques
+        self.frames_rendered = 0
+        self.late_frames = 0
+        self.dropped_frames = 0
+        self.render_time_total = 0.0
+        self.render_time_max = 0.0
+        self._started_at = None
+
+    def play(self, effect):
+        """Ajoute un effet (il démarre à la prochaine trame)"""
+        effect.bind(self.controller)
+        effect.start_time = None
+        effect.error = None
+        effect.done.clear()
+        with self._effects_lock:
+            self.effects.append(effect)
+        return effect
+
+    def cancel(self, effect):
+        """Retire un effet en cours"""
+        with self._effects_lock:
+            if effect in self.effects:
+                self.effects.remove(effect)
+        effect.done.set()
+
+    def clear(self):
+        """Retire tous les effets"""
+        with self._effects_lock:
+            effects, self.effects = self.effects, []
+        for effect in effects:
+            effect.done.set()
+
+    def wait(self, effect, timeout=None):
+        """
+        Attend la fin d'un effet de durée finie
+
+        Relance l'exception qui a interrompu l'effet pendant le rendu.
+        """
+        finished = effect.done.wait(timeout)
+        if effect.error is not None:
+            raise effect.error
+        return finished
+
+    def render_frame(self, now=None):
+        """Calcule et envoie une trame (utilisable sans le thread de fond)"""
+        if now is None:
+            now = time.monotonic()
+        start = time.perf_counter()
+
+        with self._effects_lock:
+            effects = list(self.effects)
+        finished = []
+        with self.controller.lock:
+            for effect in effects:
+                if effect.start_time is None:
+                    effect.start_time = now
+                t = now - effect.start_time
+                try:
+                    colors = effect.render(t)
+                    self.controller.set_pixels(effect.index, colors)
+                except Exception as e:
+                    # Un effet défaillant est retiré, les autres continuent
+                    print(f"❌ Effet {type(effect).__name__}: {e}")
+                    effect.error = e
+                    finished.append(effect)
+                    continue
+                if effect.finished(t):
+                    finished.append(effect)
+            self.controller.show()
+        for effect in finished:
+            self.cancel(effect)
+
+        elapsed = time.perf_counter() - start
+        self.frames_rendered += 1
+        self.render_time_total += elapsed
+        self.render_time_max = max(self.render_time_max, elapsed)
+
+    def _run(self):
+        period = 1.0 / self.fps
+        deadline = time.monotonic()
+        while not self._stop_event.is_set():
+            try:
+                self.render_frame(deadline)
+            except Exception as e:
+                # Envoi de trame impossible : les effets en attente sont libérés avec l'erreur
+                print(f"❌ Animation arrêtée: {e}")
+                with self._effects_lock:
+                    for effect in self.effects:
+                        effect.error = e
+                self.clear()
+                break
+            deadline += period
+            now = time.monotonic()
+            if now > deadline:
+                # Trame en retard : on saute les échéances déjà dépassées
+                self.late_frames += 1
+                missed = int((now - deadline) / period)
+                self.dropped_frames += missed
+                deadline += missed * period
+            self._stop_event.wait(max(0.0, deadline - now))
+
+    def start(self):
+        """Démarre le thread d'animation"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="ws2812-animation", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Arrête le thread d'animation (les LED gardent la dernière trame)"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def stats(self):
+        """Retourne les statistiques de rendu"""
+        elapsed = time.monotonic() - self._started_at if self._started_at else 0.0
+        frames = self.frames_rendered
+        return {
+            'target_fps': self.fps,
+            'actual_fps': frames / elapsed if elapsed > 0 else 0.0,
+            'frames': frames,
+            'late': self.late_frames,
+            'dropped': self.dropped_frames,
+            'render_ms_avg': self.render_time_total / frames * 1000 if frames else 0.0,
+            'render_ms_max': self.render_time_max * 1000,
+        }
+
+    def print_stats(self):
+        """Affiche les statistiques de rendu"""
+        s = self.stats()
+        print(f"📊 Animation: {s['frames']} trames à {s['actual_fps']:.1f}/{s['target_fps']} fps | "
+              f"retard: {s['late']} | sautées: {s['dropped']} | "
+              f"rendu: {s['render_ms_avg']:.2f} ms moy, {s['render_ms_max']:.2f} ms max")
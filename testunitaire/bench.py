@@ -0,0 +1,776 @@
+#!/usr/bin/env python3
+"""
+MasterCamp Robotique - Micro-benchmarks des chemins critiques
+
+Exécutable sur un simple PC Linux (sans le robot), avec les backends simulés
+de hal.py :
+    python3 bench.py            # tous les benchmarks
+    python3 bench.py ws2812     # un benchmark précis
+
+Les simulations de suivi de ligne utilisent la direction réelle de tache3
+(servo_configs[0]). La variante à direction symétrique ±30° n'est qu'une
+hypothèse (servo recentré) : elle est mesurée à part et étiquetée comme telle.
+"""
+
+import contextlib
+import math
+import os
+import sys
+import time
+
+import numpy
+
+import hal
+
+hal.set_backend('sim')
+
+
+@contextlib.contextmanager
+def _quiet():
+    """Redirige les affichages des pilotes pendant une mesure"""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def _print_cache(pca):
+    """Affiche les compteurs du cache d'écriture PCA9685"""
+    stats = pca.cache_stats()
+    print(f"   cache PCA9685: {stats['hits']} écritures évitées, {stats['misses']} transmises "
+          f"({stats['hit_rate'] * 100:.0f}% évitées)")
+    if stats['block_writes']:
+        print(f"   blocs PCA9685: {stats['block_writes']} écritures en bloc, "
+              f"{stats['transactions_saved']} transactions économisées")
+
+
+def _print_latency(name, device):
+    """Affiche les latences enregistrées par un périphérique simulé"""
+    for operation, stats in device.latency_stats().items():
+        print(f"   {name}.{operation}: {stats['count']} appels, "
+              f"{stats['mean_us']:.2f} µs moy, {stats['max_us']:.2f} µs max")
+
+
+def _legacy_ws2812_show(spi, led_color, speed_hz):
+    """Ancien chemin de show() : numpy.array + boucle 8 bits + tolist()"""
+    d = numpy.array(led_color).ravel()
+    tx = numpy.zeros(len(d)*8, dtype=numpy.uint8)
+    for ibit in range(8):
+        tx[7-ibit::8] = ((d >> ibit) & 1) * 0x78 + 0x80
+    spi.xfer(tx.tolist(), speed_hz)
+
+
+def _frames_per_second(func, duration=0.5):
+    """Nombre d'appels par seconde de func sur environ duration secondes"""
+    count = 0
+    start = time.perf_counter()
+    end = start + duration
+    while True:
+        func()
+        count += 1
+        now = time.perf_counter()
+        if now >= end:
+            return count / (now - start)
+
+
+def _legacy_switch(gpio, led_number, status):
+    """Ancien switch() de tache1 : table reconstruite et affichage à chaque appel"""
+    led_config = {
+        1: {'pin': 9, 'name': 'LED1', 'type': 'hat'},
+        2: {'pin': 25, 'name': 'LED2', 'type': 'hat'},
+        3: {'pin': 11, 'name': 'LED3', 'type': 'hat'},
+        4: {'pin': 0, 'name': 'left_R', 'type': 'front'},
+        5: {'pin': 19, 'name': 'left_G', 'type': 'front'},
+        6: {'pin': 13, 'name': 'left_B', 'type': 'front'},
+        7: {'pin': 1, 'name': 'right_R', 'type': 'front'},
+        8: {'pin': 5, 'name': 'right_G', 'type': 'front'},
+        9: {'pin': 6, 'name': 'right_B', 'type': 'front'}
+    }
+    led = led_config[led_number]
+    on = gpio.HIGH if led['type'] == 'hat' else gpio.LOW
+    off = gpio.LOW if led['type'] == 'hat' else gpio.HIGH
+    gpio.output(led['pin'], on if status == 1 else off)
+    print(f"{led['name']} {'allumée' if status == 1 else 'éteinte'}")
+
+
+def bench_gpio_leds():
+    """Bascules/s des LEDs de tache1 : ancien switch() contre table précalculée et écriture groupée"""
+    import tache1
+
+    gpio = tache1.GPIO
+    tache1.switchSetup()
+    tache1.set_silent(True)
+    state = {'on': 0}
+
+    def legacy_all():
+        state['on'] ^= 1
+        for n in range(1, 10):
+            _legacy_switch(gpio, n, state['on'])
+
+    def legacy_one():
+        state['on'] ^= 1
+        _legacy_switch(gpio, 1, state['on'])
+
+    def fast_all():
+        state['on'] ^= 1
+        (tache1.set_all_switch_on if state['on'] else tache1.set_all_switch_off)()
+
+    def fast_one():
+        state['on'] ^= 1
+        tache1.switch(1, state['on'])
+
+    print("\n📊 LEDs tache1 (GPIO simulé)")
+    for label, legacy, fast in (("une LED", legacy_one, fast_one), ("9 LEDs", legacy_all, fast_all)):
+        with _quiet():
+            slow = _frames_per_second(legacy)
+            gpio.reset_stats()
+            legacy()
+            legacy_calls = gpio.call_count('output')
+        quick = _frames_per_second(fast)
+        gpio.reset_stats()
+        fast()
+        fast_calls = gpio.call_count('output')
+        print(f"   {label:<8}: ancien {slow:9.0f}/s ({legacy_calls} GPIO.output) | "
+              f"silencieux {quick:9.0f}/s ({fast_calls} GPIO.output) | x{quick / slow:.1f}")
+    tache1.set_silent(False)
+
+
+def bench_rgb_pwm(frequency=200, duration=1.0):
+    """Charge CPU et gigue de la PWM logicielle des feux avant (couleurs fixes et mélangées)"""
+    import tache1
+
+    tache1.switchSetup()
+    print(f"\n📊 Feux avant RGB - PWM logicielle {frequency} Hz (GPIO simulé)")
+    for label, left, right in (("couleurs pleines", (255, 0, 0), (0, 0, 255)),
+                               ("couleurs mélangées", (255, 128, 16), (40, 200, 90))):
+        engine = tache1.FrontRGBEngine(frequency=frequency, backend='thread')
+        engine.set_color('left', left)
+        engine.set_color('right', right)
+        tache1.GPIO.reset_stats()
+        engine.start()
+        time.sleep(duration)
+        engine.stop()
+        s = engine.stats()
+        writes = tache1.GPIO.call_count('output')
+        print(f"   {label:<19}: CPU {s['cpu_percent']:5.1f}% | {writes / duration:6.0f} GPIO.output/s | "
+              f"gigue {s['jitter_us_avg']:6.1f} µs moy / {s['jitter_us_max']:7.1f} µs max | "
+              f"{s['late_periods']} périodes en retard")
+
+
+def bench_command_server(repeats=200):
+    """Débit et latences du serveur de commandes (socket UNIX, pilotes simulés)"""
+    import tempfile
+    from commandserver import CommandServer, replay
+    from tache2 import WS2812Controller
+    from tache3 import ServoController
+    import tache1
+    import tache4
+
+    with _quiet():
+        tache1.set_silent(True)
+        server = CommandServer(leds=True, ws2812=WS2812Controller(spi=hal.SimSPI()),
+                               servos=ServoController(), motor=tache4.MotorRamp())
+    script = ['led 11', 'led 21', 'ws AD R 200', 'ws 3 G', 'servo 1 30', 'servo 1 -30',
+              'servo glide 2 20', 'motor ramp 20 1 0.5 scurve', 'motor arret', 'ping'] * repeats
+    path = os.path.join(tempfile.mkdtemp(), 'jcvd.sock')
+    server.start(path=path)
+    print(f"\n📊 Serveur de commandes - {len(script)} commandes (socket UNIX)")
+    for label, pipeline in (("pipeline", True), ("une à une", False)):
+        start = time.perf_counter()
+        with _quiet():
+            results = replay(script, path=path, pipeline=pipeline)
+        elapsed = time.perf_counter() - start
+        rtt = numpy.array([r[2] for r in results]) * 1e6
+        errors = sum(1 for r in results if not r[1].startswith('OK'))
+        print(f"   {label:<9}: {len(results) / elapsed:7.0f} cmd/s | aller-retour p50 "
+              f"{numpy.percentile(rtt, 50):7.0f} µs, p99 {numpy.percentile(rtt, 99):7.0f} µs | {errors} erreur(s)")
+    server.stop()
+    tache1.set_silent(False)
+    server.print_stats()
+
+
+def bench_scheduler(duration=2.0):
+    """Tout le robot (simulé) : un thread par sous-système contre l'ordonnanceur coopératif"""
+    from scheduler import Scheduler, build_robot
+
+    print(f"\n📊 Robot complet simulé pendant {duration:.0f} s")
+    with _quiet():
+        robot = build_robot(Scheduler())
+    threads = [robot[name] for name in ('follower', 'ranging', 'sampler', 'engine', 'brightness', 'planner')]
+    cpu = time.process_time()
+    for subsystem in threads:
+        subsystem.start()
+    time.sleep(duration)
+    for subsystem in threads:
+        subsystem.stop()
+    cpu = time.process_time() - cpu
+    follower = robot['follower']
+    print(f"   threads       : CPU {cpu / duration * 100:5.1f}% | suivi de ligne "
+          f"{follower.ticks / duration:6.1f}/{follower.rate} Hz, {follower.late_ticks} ticks en retard")
+
+    scheduler = Scheduler()
+    with _quiet():
+        robot = build_robot(scheduler)
+    cpu = time.process_time()
+    scheduler.run(duration)
+    cpu = time.process_time() - cpu
+    with _quiet():
+        robot['follower'].stop()
+    line = scheduler.stats()['tasks']['line']
+    print(f"   ordonnanceur  : CPU {cpu / duration * 100:5.1f}% | suivi de ligne "
+          f"{line['runs'] / duration:6.1f}/{line['rate']:.0f} Hz, gigue {line['jitter_us']['avg']:.0f} µs moy, "
+          f"{line['jitter_us']['p99']:.0f} µs p99")
+    scheduler.print_stats()
+
+
+def bench_sensor_hub(reads=20000):
+    """Latence de lecture et âge des données : concentrateur en mémoire partagée contre lecture directe"""
+    from sensorhub import SensorHub
+    from tache5 import RangingService
+    from tache6 import LEFT_PIN, MIDDLE_PIN, RIGHT_PIN
+    from tache8 import ADCSampler
+
+    # Lecture directe dans le processus de contrôle (pilotes partagés avec la boucle moteur)
+    sensors = (hal.digital_input(LEFT_PIN), hal.digital_input(MIDDLE_PIN), hal.digital_input(RIGHT_PIN))
+    sampler = ADCSampler(capacity=2)
+    ranging = RangingService()
+    ranging.update()
+
+    def direct():
+        ir = [sensor.value for sensor in sensors]
+        sampler.scan()
+        return ir, ranging.latest()
+
+    latencies = []
+    for _ in range(reads // 10):
+        start = time.perf_counter()
+        direct()
+        latencies.append(time.perf_counter() - start)
+    direct_us = numpy.array(latencies) * 1e6
+
+    hub = SensorHub(name=f'jcvd_bench_{os.getpid()}')
+    hub.start()
+    client = hub.client()
+    time.sleep(0.2)
+    latencies = []
+    ages = {'ir': [], 'adc': [], 'distance': []}
+    for i in range(reads):
+        start = time.perf_counter()
+        record = client.read()
+        latencies.append(time.perf_counter() - start)
+        if i % 10 == 0:
+            now = time.monotonic()
+            for section in ages:
+                ages[section].append(now - record[section + '_time'])
+        if i % 100 == 0:
+            time.sleep(0.001)   # étale les lectures sur plusieurs périodes du concentrateur
+    hub_us = numpy.array(latencies) * 1e6
+    retries = client.retries
+    client.close()
+    hub.stop()
+
+    print(f"\n📊 Concentrateur de capteurs (mémoire partagée, seqlock) - {reads} lectures")
+    print(f"   lecture directe (3 IR + 8 ADC + ultrason filtré): p50 {numpy.percentile(direct_us, 50):6.1f} µs, "
+          f"p99 {numpy.percentile(direct_us, 99):6.1f} µs")
+    print(f"   lecture seqlock (enregistrement complet)       : p50 {numpy.percentile(hub_us, 50):6.1f} µs, "
+          f"p99 {numpy.percentile(hub_us, 99):6.1f} µs | {retries} relecture(s)")
+    for section, values in ages.items():
+        values = numpy.array(values) * 1000
+        print(f"   âge {section:<8}: p50 {numpy.percentile(values, 50):6.2f} ms, max {values.max():6.2f} ms")
+
+
+def bench_ws2812(led_counts=(14, 144, 1000)):
+    """Trames/s de WS2812Controller.show() contre l'ancien encodage"""
+    from tache2 import WS2812Controller
+
+    print("\n📊 WS2812 show() - trames/s (SPI simulé)")
+    print(f"{'LED':>6} | {'ancien':>10} | {'table':>10} | {'gain':>6}")
+    print("-" * 42)
+    for count in led_counts:
+        spi = hal.SimSPI()
+        controller = WS2812Controller(count=count, spi=spi)
+        for i in range(count):
+            controller.set_ledpixel(i, (i * 7) % 256, (i * 13) % 256, (i * 29) % 256)
+        controller.show()
+        led_color = controller.led_color.tolist()
+
+        legacy = _frames_per_second(
+            lambda: _legacy_ws2812_show(spi, led_color, controller.spi_speed))
+        current = _frames_per_second(lambda: controller.show(force=True))
+        print(f"{count:6d} | {legacy:10.0f} | {current:10.0f} | x{current / legacy:5.1f}")
+
+
+def bench_ws2812_pixels(led_counts=(14, 144, 1000)):
+    """Images/s pour écrire toute la bande : set_ledpixel() en boucle contre blit()"""
+    from tache2 import WS2812Controller
+
+    print("\n📊 WS2812 écriture d'une image complète + show() - images/s (SPI simulé)")
+    print(f"{'LED':>6} | {'set_ledpixel':>12} | {'blit':>10} | {'gain':>6}")
+    print("-" * 46)
+    for count in led_counts:
+        controller = WS2812Controller(count=count, brightness=128, spi=hal.SimSPI())
+        image = numpy.random.default_rng(0).integers(0, 256, (count, 3), dtype=numpy.uint8)
+        colors = image.tolist()
+
+        def per_pixel():
+            for i, (r, g, b) in enumerate(colors):
+                controller.set_ledpixel(i, r, g, b)
+            controller.show(force=True)
+
+        def bulk():
+            controller.blit(image)
+            controller.show(force=True)
+
+        slow = _frames_per_second(per_pixel)
+        fast = _frames_per_second(bulk)
+        print(f"{count:6d} | {slow:12.0f} | {fast:10.0f} | x{fast / slow:5.1f}")
+
+
+def bench_servo():
+    """Mises à jour servo/s de ServoController.set_angle() (PCA9685 simulé)"""
+    with _quiet():
+        from tache3 import ServoController
+        controller = ServoController()
+    controller.pwm.reset_stats()
+    controller.pwm.reset_cache_stats()
+
+    angles = list(range(-40, 41, 5))
+    with _quiet():
+        rate = _frames_per_second(lambda: [controller.set_angle(1, a) for a in angles])
+    print("\n📊 Servo set_angle() (PCA9685 simulé)")
+    print(f"   {rate * len(angles):.0f} mises à jour/s")
+    _print_latency('pca9685', controller.pwm)
+    _print_cache(controller.pwm)
+
+    # Consigne inchangée (servo de tête immobile dans une boucle de contrôle)
+    controller.pwm.reset_cache_stats()
+    with _quiet():
+        rate = _frames_per_second(lambda: controller.set_angle(1, 10))
+    print(f"   angle constant: {rate:.0f} mises à jour/s")
+    _print_cache(controller.pwm)
+
+
+def _legacy_angle_to_pwm(controller, channel, logical_angle):
+    """Ancien angle_to_pwm() : offset, bornage et division flottante à chaque appel"""
+    config = controller.servo_configs[channel]
+    mechanical_angle = max(-90, min(90, logical_angle + config["offset"]))
+    pwm_range = controller.servo_max - controller.servo_min
+    pwm_value = controller.servo_center + int((mechanical_angle / 90.0) * (pwm_range / 2))
+    return max(controller.servo_min, min(controller.servo_max, pwm_value))
+
+
+def bench_servo_lut():
+    """Conversions angle -> PWM/s : calcul direct contre table compilée par canal"""
+    with _quiet():
+        from tache3 import ServoController
+        controller = ServoController()
+
+    # Consignes fractionnaires des 4 servos, comme dans une boucle de contrôle
+    channels = list(controller.servo_configs)
+    samples = []
+    for i in range(100):
+        for ch in channels:
+            config = controller.servo_configs[ch]
+            span = config["max_angle"] - config["min_angle"]
+            samples.append((ch, config["min_angle"] + span * ((i * 0.37) % 1.0)))
+
+    legacy = _frames_per_second(
+        lambda: [_legacy_angle_to_pwm(controller, ch, a) for ch, a in samples]) * len(samples)
+    current = _frames_per_second(
+        lambda: [controller.angle_to_pwm(ch, a) for ch, a in samples]) * len(samples)
+    tick_us = len(channels) / current * 1e6
+    print(f"\n📊 Conversion angle -> PWM ({len(channels)} servos, pas {controller.lut_resolution}°)")
+    print(f"   calcul direct : {legacy:12.0f} conversions/s")
+    print(f"   table compilée: {current:12.0f} conversions/s (x{current / legacy:.1f})")
+    print(f"   boucle 100 Hz : {tick_us:.2f} µs/tick pour {len(channels)} servos "
+          f"({tick_us / 10000 * 100:.4f}% du budget de 10 ms)")
+
+
+def bench_motor():
+    """Commandes moteur/s de Motor() (PCA9685 simulé)"""
+    with _quiet():
+        import tache4
+        tache4.init_motors()
+    tache4.pwm_motor.reset_stats()
+    tache4.pwm_motor.reset_cache_stats()
+
+    speeds = list(range(0, 26))
+    rate = _frames_per_second(lambda: [tache4.Motor(1, tache4.DIR_FORWARD, v) for v in speeds])
+    print("\n📊 Motor() (PCA9685 simulé)")
+    print(f"   {rate * len(speeds):.0f} commandes/s")
+    _print_latency('pca9685', tache4.pwm_motor)
+    _print_cache(tache4.pwm_motor)
+
+
+def bench_ramp(duration=0.5):
+    """Écart de durée des rampes moteur (MotorRamp.run_blocking, PCA9685 simulé)"""
+    with _quiet():
+        import tache4
+        tache4.init_motors()
+
+    print(f"\n📊 Rampes moteur 0 → 25% → 0 (durée demandée: {duration * 1000:.0f} ms)")
+    for profile in tache4.RAMP_PROFILES:
+        ramp = tache4.MotorRamp()
+        tache4.pwm_motor.reset_stats()
+        tache4.pwm_motor.reset_cache_stats()
+        errors = []
+        for target in (25, 0):
+            ramp.start(target, tache4.DIR_FORWARD, duration, profile)
+            ramp.run_blocking()
+            errors.append(ramp.duration_error * 1000)
+        print(f"   {profile:<12}: écart {errors[0]:+.2f} / {errors[1]:+.2f} ms, "
+              f"{tache4.pwm_motor.i2c_writes} écritures PCA9685, "
+              f"{tache4.pwm_motor.hits} évitées par le cache")
+
+
+def bench_pca9685_tick(ticks=2000):
+    """Transactions I2C par tick de contrôle : écritures séparées contre transaction()"""
+    with _quiet():
+        import tache4
+        from tache3 import ServoController
+        servos = ServoController()
+        tache4.init_motors()
+    pca = servos.pwm
+    # Servos et moteurs partagent la puce : elle doit rester à la fréquence des servos
+    assert pca is tache4.pwm_motor and pca.frequency == hal.SERVO_FREQUENCY, \
+        f"PCA9685 0x5f à {pca.frequency} Hz au lieu de {hal.SERVO_FREQUENCY} Hz"
+
+    def control_tick(i):
+        servos.set_angle(0, -20 + i % 20)          # direction
+        servos.set_angle(1, -30 + i % 60)          # tête gauche/droite
+        servos.set_angle(2, -20 + i % 40)          # tête haut/bas
+        tache4.Motor(1, tache4.DIR_FORWARD, i % 25)  # propulsion
+
+    print(f"\n📊 Tick de contrôle (3 servos + propulsion, PCA9685 partagé à {pca.frequency} Hz), {ticks} ticks")
+    for label, grouped in (("écritures séparées", False), ("transaction()", True)):
+        pca.invalidate()
+        pca.reset_stats()
+        pca.reset_cache_stats()
+        start = time.perf_counter()
+        with _quiet():
+            for i in range(ticks):
+                if grouped:
+                    with pca.transaction():
+                        control_tick(i)
+                else:
+                    control_tick(i)
+        elapsed = time.perf_counter() - start
+        print(f"   {label:<20}: {pca.i2c_writes / ticks:.2f} transactions I2C/tick, "
+              f"{elapsed / ticks * 1e6:.1f} µs/tick")
+        assert pca.device.regs[1] == (0, servos.angle_to_pwm(1, servos.current_positions[1]))
+    _print_cache(pca)
+
+
+def bench_ranging(samples=100, speed=0.2):
+    """Service de mesure ultrason : erreur brute/filtrée et coût d'une lecture"""
+    import tache5
+
+    # Obstacle qui s'approche à `speed` m/s, bruit de 1 cm et 5% d'échos aberrants
+    rng = numpy.random.default_rng(0)
+    clock = {'t': 0.0}
+
+    def truth():
+        return 1.8 - speed * clock['t']
+
+    def measure():
+        if rng.random() < 0.05:
+            return 2.0
+        return truth() + rng.normal(0, 0.01)
+
+    sensor = hal.SimDistanceSensor(max_distance=2, simulate_echo=True)
+    sensor.source = measure
+    ranging = tache5.RangingService(sensor)
+    raw_errors, filtered_errors = [], []
+    for i in range(samples):
+        clock['t'] = i * ranging.interval
+        ranging.update(now=clock['t'])
+        distance, closing, _, raw = ranging.latest()
+        if i >= 10:  # après convergence du filtre
+            raw_errors.append(raw - truth())
+            filtered_errors.append(distance - truth())
+
+    def rms(values):
+        return float(numpy.sqrt(numpy.mean(numpy.square(values)))) * 100
+
+    calls = 100000
+    start = time.perf_counter()
+    for _ in range(calls):
+        ranging.latest()
+    latest_us = (time.perf_counter() - start) / calls * 1e6
+
+    print(f"\n📊 Mesure ultrason ({samples} mesures à {1 / ranging.interval:.0f} Hz, "
+          f"obstacle à {speed} m/s, 5% d'échos aberrants)")
+    print(f"   erreur RMS: brute {rms(raw_errors):.2f} cm, filtrée {rms(filtered_errors):.2f} cm")
+    print(f"   vitesse de rapprochement estimée: {closing:+.3f} m/s (réelle {speed:+.3f})")
+    print(f"   lecture bloquante (trigger/écho): {ranging.read_time_total / samples * 1000:.2f} ms, "
+          f"latest(): {latest_us:.3f} µs")
+
+
+def bench_scan(duration=3.0, legacy_sleep=0.2):
+    """Balayage ultrason : « angle, sleep, checkdist » contre SweepScanner pipeliné"""
+    import scanner
+    import simulator
+    import tache5
+
+    servos = _sim_servos()
+    track = simulator.Track.from_segments(simulator.OVAL_S)
+    sim = simulator.RobotSimulator(track)
+    track.add_obstacle(0.6, -0.45, 0.1, 0.2)    # obstacle devant à droite
+    track.add_obstacle(0.4, 0.35, 0.1, 0.2)     # obstacle à gauche
+    sim.attach_distance_sensor(tache5.sensor, pan=lambda: servos.current_positions[scanner.HEAD_CHANNEL])
+    tache5.sensor.simulate_echo = True
+
+    sweep = scanner.SweepScanner(servos, tache5.sensor)
+    print(f"\n📊 Balayage ultrason {sweep.angles[0]:+.0f}° → {sweep.angles[-1]:+.0f}° "
+          f"({len(sweep.angles)} cases, écho simulé)")
+
+    # Ancienne méthode : un rayon à la fois
+    start = time.perf_counter()
+    for angle in sweep.angles:
+        servos.set_angle(scanner.HEAD_CHANNEL, angle, verbose=False)
+        time.sleep(legacy_sleep)
+        tache5.checkdist()
+    legacy = 1.0 / (time.perf_counter() - start)
+    print(f"   angle + sleep({legacy_sleep}) + checkdist: {legacy:.2f} balayages/s")
+
+    sweep.start()
+    time.sleep(duration)
+    sweep.stop()
+    rate = sweep.scans_per_second()
+    print(f"   SweepScanner pipeliné         : {rate:.2f} balayages/s (x{rate / legacy:.1f}), "
+          f"{sweep.measurements} mesures")
+    angles, distances, ages = sweep.snapshot()
+    print("   carte: " + " ".join(f"{a:+.0f}°:{d * 100:.0f}" for a, d in zip(angles, distances)) + " (cm)")
+    print(f"   âge max d'une case: {ages.max() * 1000:.0f} ms, plus proche: "
+          f"{sweep.closest()[0]:+.0f}° à {sweep.closest()[1] * 100:.0f} cm")
+    tache5.sensor.simulate_echo = False
+    tache5.sensor.source = None
+
+
+def bench_adc(duration=1.0, rate=200):
+    """Acquisition ADS7830 : balayages/s des 8 canaux et coût des statistiques glissantes"""
+    import tache8
+
+    adc = hal.SimADS7830()
+    adc.sources[tache8.LIGHT_CHANNEL] = lambda: 30000 + 20000 * math.sin(time.monotonic())
+    sampler = tache8.ADCSampler(adc, rate=rate)
+
+    scans = _frames_per_second(sampler.scan)
+    print(f"\n📊 ADS7830 simulé ({len(sampler.channels)} canaux)")
+    print(f"   balayage complet: {scans:.0f} balayages/s max ({scans * len(sampler.channels):.0f} lectures/s)")
+
+    sampler.count = 0
+    sampler.start()
+    time.sleep(duration)
+    sampler.stop()
+    print(f"   thread à {rate} Hz: {sampler.count / duration:.0f} balayages/s, "
+          f"{sampler.late_scans} en retard, {sampler.scan_time_max * 1e6:.0f} µs max par balayage")
+
+    calls = _frames_per_second(lambda: sampler.stats(tache8.LIGHT_CHANNEL, seconds=1.0))
+    s = sampler.stats(tache8.LIGHT_CHANNEL, seconds=1.0)
+    print(f"   stats() fenêtre 1 s ({s['samples']} échantillons): {1e6 / calls:.1f} µs "
+          f"(moy {s['mean']:.0f}, min {s['min']:.0f}, max {s['max']:.0f}, {s['rate']:+.0f}/s)")
+
+
+def bench_auto_brightness(duration=600.0, rate=5):
+    """Luminosité automatique sur un crépuscule simulé (temps virtuel)"""
+    import tache8
+    from tache2 import AutoBrightness, WS2812Controller
+
+    # Lumière : plein jour -> nuit en `duration` secondes, bruit de capteur ±2%
+    rng = numpy.random.default_rng(0)
+    clock = {'t': 0.0}
+    adc = hal.SimADS7830()
+    adc.sources[tache8.LIGHT_CHANNEL] = lambda: max(0.0, 50000 * (1 - clock['t'] / duration)
+                                                     + rng.normal(0, 1000))
+    sampler = tache8.ADCSampler(adc, channels=(tache8.LIGHT_CHANNEL,), rate=50)
+
+    print(f"\n📊 Luminosité automatique: jour -> nuit en {duration:.0f} s simulées, mise à jour à {rate} Hz")
+    for label, hysteresis, smoothing in (("sans filtrage", 1, 1e-3), ("lissage + hystérésis", 8, 2.0)):
+        controller = WS2812Controller(count=14, spi=hal.SimSPI())
+        controller.fill(slice(None), (255, 160, 40))
+        controller.show()
+        auto = AutoBrightness(sampler, [controller], channel=tache8.LIGHT_CHANNEL,
+                              hysteresis=hysteresis, smoothing=smoothing, rate=rate)
+        sampler.count = 0
+        levels = []
+        steps = int(duration * 50)
+        for i in range(steps):
+            clock['t'] = i / 50
+            sampler.scan(now=clock['t'])
+            if i % (50 // rate) == 0:
+                auto.update(now=clock['t'])
+                levels.append(controller.led_brightness)
+        steps_applied = numpy.diff(levels)
+        steps_applied = numpy.sign(steps_applied[steps_applied != 0])
+        reversals = int(numpy.sum(steps_applied[1:] != steps_applied[:-1]))
+        print(f"   {label:<22}: {auto.changes} changements, {controller.frames_sent} trames SPI, "
+              f"{reversals} inversions de sens, luminosité moyenne {numpy.mean(levels):.0f}/255")
+
+
+def bench_line_follow(transitions=500):
+    """Latence front capteur IR -> commande moteur du suivi de ligne (GPIO simulé)"""
+    import tache6
+
+    gpio = hal.sim_gpio()
+    track = [(0, 1, 0), (1, 1, 0), (1, 0, 0), (0, 0, 0), (0, 1, 0), (0, 1, 1), (0, 0, 1), (0, 0, 0)]
+    pins = (tache6.LEFT_PIN, tache6.MIDDLE_PIN, tache6.RIGHT_PIN)
+
+    print(f"\n📊 Suivi de ligne: front capteur -> commande ({transitions} transitions)")
+    print("   ancienne boucle (sondage 50 ms): 25 ms moy, 50 ms max (théorique)")
+    for label, sample_rate in (("fronts (callbacks)", None), ("échantillonnage 1 kHz", 1000)):
+        for pin in pins:
+            gpio.set_input(pin, 0)
+        follower = tache6.LineFollower(sample_rate=sample_rate, verbose=False)
+        follower.start()
+        time.sleep(0.01)
+        follower.latencies.clear()
+        follower.line_loss_latencies.clear()
+        for i in range(transitions):
+            for pin, level in zip(pins, track[i % len(track)]):
+                gpio.set_input(pin, level)
+            time.sleep(0.002)
+        follower.stop()
+        stats = follower.latency_stats()
+        print(f"   {label:<22}: {stats['all']['mean_ms']:.3f} ms moy, {stats['all']['max_ms']:.3f} ms max | "
+              f"perte de ligne: {stats['line_loss']['mean_ms']:.3f} ms moy, "
+              f"{stats['line_loss']['max_ms']:.3f} ms max")
+        print(f"   {'':<22}  {follower.events_received} événements, {follower.commands_sent} commandes")
+
+
+def _sim_servos(steering=None):
+    """
+    ServoController simulé
+
+    Args:
+        steering (tuple): (min, max) de braquage en degrés logiques pour une
+            variante hypothétique, ou None pour la configuration réelle de
+            tache3 (servo_configs[0]) ; toute substitution est affichée
+    """
+    with _quiet():
+        from tache3 import ServoController
+        servos = ServoController()
+    if steering is not None:
+        servos.servo_configs[0].update(min_angle=steering[0], max_angle=steering[1])
+    return servos
+
+
+def _steering_label(servos):
+    config = servos.servo_configs[0]
+    return f"servo_configs[0] {config['min_angle']:+d}° → {config['max_angle']:+d}°"
+
+
+def _print_lap(label, result):
+    if result['lap_time'] is None:
+        reason = "sortie de piste" if result['off_track'] else "arrêt"
+        print(f"   {label:<13}: ❌ tour non terminé ({reason} à {result['laps'] * 100:.0f}% du tour)")
+    else:
+        print(f"   {label:<13}: tour en {result['lap_time']:.2f} s, "
+              f"{result['cpu_us_per_tick']:.1f} µs/tick, x{result['realtime_factor']:.0f} temps réel")
+
+
+def bench_line_pid(rate=100):
+    """Tour de piste simulé : ancienne boucle, suivi par événements (tout ou rien) et PID"""
+    import simulator
+    import tache6
+
+    servos = _sim_servos()
+    track = simulator.Track.from_segments(simulator.OVAL_S)
+    print(f"\n📊 Tour de piste simulé ({track.length:.2f} m, contrôle à {rate} Hz)")
+
+    # Ancienne boucle : avance si le capteur du milieu voit la ligne, sinon stop
+    sim = simulator.RobotSimulator(track)
+    middle = sim.ir_sensors()[1]
+
+    def legacy_step(dt, now):
+        sim.motor.throttle = 0.6 if middle.value == 1 else 0
+    _print_lap("ancienne", sim.run(legacy_step, rate=rate))
+
+    sim = simulator.RobotSimulator(track)
+    with _quiet():
+        bang = tache6.LineFollower(motor=sim.motor, sensors=sim.ir_sensors(), verbose=False,
+                                   steer=lambda a: servos.set_angle(0, a, verbose=False))
+        result = sim.run(lambda dt, now: bang.apply(bang.read_state()),
+                         steering=lambda: servos.current_positions[0], rate=rate)
+    _print_lap("tout ou rien", result)
+
+    # Direction réelle (servo_configs[0] de tache3), puis hypothèse d'une
+    # direction symétrique ±30° (servo recentré mécaniquement)
+    for label, steering in (("PID", None), ("PID ±30° hyp.", (-30, 30))):
+        servos = _sim_servos(steering)
+        sim = simulator.RobotSimulator(track)
+        with _quiet():
+            pid = tache6.PIDLineFollower(servos=servos, motor=sim.motor, sensors=sim.ir_sensors(), rate=rate)
+            result = sim.run(pid.step, steering=lambda: pid.angle, rate=rate)
+        print(f"   {label:<13}: {_steering_label(servos)}, PID borné à "
+              f"{pid.steer_min:+.0f}° → {pid.steer_max:+.0f}°")
+        _print_lap(label, result)
+
+
+def bench_sim_runs(runs=100, rates=(25, 50, 100)):
+    """Campagne de simulations PID (départs et bruit IR aléatoires mais reproductibles)"""
+    import simulator
+    import tache5
+    import tache6
+
+    track = simulator.Track.from_segments(simulator.OVAL_S)
+    print(f"\n📊 Campagne de simulation: {runs} tours par fréquence, piste {track.length:.2f} m")
+    # Direction réelle de tache3, puis hypothèse d'une direction symétrique ±30°
+    for label, steering in (("réelle", None), ("±30° (hypothèse)", (-30, 30))):
+        servos = _sim_servos(steering)
+        print(f"   Direction {label}: {_steering_label(servos)}")
+        print(f"{'Hz':>5} | {'réussis':>8} | {'tour moy':>9} | {'µs/tick':>8} | {'x temps réel':>12}")
+        print("-" * 56)
+        for rate in rates:
+            laps, cpu, factor = [], [], []
+            for seed in range(runs):
+                rng = numpy.random.default_rng(seed)
+                sim = simulator.RobotSimulator(track, ir_noise=0.01, seed=seed,
+                                               y=rng.uniform(-0.005, 0.005),
+                                               heading=rng.uniform(-0.05, 0.05))
+                with _quiet():
+                    pid = tache6.PIDLineFollower(servos=servos, motor=sim.motor,
+                                                 sensors=sim.ir_sensors(), rate=rate)
+                    result = sim.run(pid.step, steering=lambda: pid.angle, rate=rate)
+                if result['lap_time'] is not None:
+                    laps.append(result['lap_time'])
+                cpu.append(result['cpu_us_per_tick'])
+                factor.append(result['realtime_factor'])
+            mean_lap = f"{sum(laps) / len(laps):8.2f}s" if laps else f"{'-':>9}"
+            print(f"{rate:5d} | {len(laps):4d}/{runs:<3d} | {mean_lap} | {sum(cpu) / len(cpu):8.1f} | "
+                  f"{sum(factor) / len(factor):12.0f}")
+
+    # Capteur à ultrasons de tache5 branché sur le simulateur (mur à 0.5 m devant le départ)
+    sim = simulator.RobotSimulator(track)
+    track.add_obstacle(sim.ULTRASONIC_MOUNT + 0.5, -0.2, 0.05, 0.4)
+    sim.attach_distance_sensor(tache5.sensor)
+    print(f"   checkdist() au départ, mur à 50 cm: {tache5.checkdist():.1f} cm")
+
+
+BENCHMARKS = {
+    'gpio_leds': bench_gpio_leds,
+    'rgb_pwm': bench_rgb_pwm,
+    'command_server': bench_command_server,
+    'scheduler': bench_scheduler,
+    'sensor_hub': bench_sensor_hub,
+    'ws2812': bench_ws2812,
+    'ws2812_pixels': bench_ws2812_pixels,
+    'servo': bench_servo,
+    'servo_lut': bench_servo_lut,
+    'motor': bench_motor,
+    'ramp': bench_ramp,
+    'pca9685_tick': bench_pca9685_tick,
+    'ranging': bench_ranging,
+    'scan': bench_scan,
+    'adc': bench_adc,
+    'auto_brightness': bench_auto_brightness,
+    'line_follow': bench_line_follow,
+    'line_pid': bench_line_pid,
+    'sim_runs': bench_sim_runs,
+}
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"❌ Benchmark '{name}' inconnu. Disponibles: {', '.join(BENCHMARKS)}")
+            continue
+        BENCHMARKS[name]()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+MasterCamp Robotique - Base de calibrage persistante
+
+Un seul fichier JSON regroupe les valeurs mesurées par les outils de calibrage
+(offsets des servos de tache3, centre/limites PWM de la direction et zones
+mortes des moteurs de tache4). Il est lu une seule fois puis gardé en mémoire ;
+chaque sauvegarde écrit un fichier temporaire puis le renomme (os.replace),
+si bien qu'une coupure ne laisse jamais un fichier à moitié écrit.
+
+Emplacement : calibration.json à côté des modules, ou la variable
+d'environnement JCVD_CALIBRATION.
+
+Structure:
+    {
+        "servos":   {"0": {"offset": -35}, ...},
+        "steering": {"channel": 0, "center": 300, "left_50": 250, "right_50": 350},
+        "motors":   {"1": {"deadband": 8}}
+    }
+"""
+
+import json
+import os
+import tempfile
+import threading
+
+DEFAULT_PATH = os.environ.get(
+    'JCVD_CALIBRATION',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'calibration.json'))
+
+
+class CalibrationStore:
+    """Fichier de calibrage JSON chargé une fois et mis en cache"""
+
+    def __init__(self, path=DEFAULT_PATH):
+        """
+        Args:
+            path (str): Chemin du fichier JSON
+        """
+        self.path = path
+        self._data = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        """Charge le fichier au premier accès (fichier absent = calibrage vide)"""
+        if self._data is None:
+            try:
+                with open(self.path, 'r') as file:
+                    self._data = json.load(file)
+            except FileNotFoundError:
+                self._data = {}
+            except (OSError, ValueError) as e:
+                print(f"⚠ Calibrage illisible ({self.path}): {e} - valeurs par défaut")
+                self._data = {}
+        return self._data
+
+    def section(self, name):
+        """Retourne une copie d'une section (dict vide si absente)"""
+        with self._lock:
+            return json.loads(json.dumps(self._load().get(name, {})))
+
+    def get(self, section, key, default=None):
+        """Retourne une valeur d'une section"""
+        with self._lock:
+            return self._load().get(section, {}).get(str(key), default)
+
+    def update(self, section, values, save=True):
+        """
+        Fusionne des valeurs dans une section puis sauvegarde
+
+        Args:
+            section (str): Nom de la section ('servos', 'steering', 'motors'...)
+            values (dict): Valeurs à fusionner (les sous-dictionnaires sont fusionnés aussi)
+            save (bool): Écrit le fichier immédiatement
+        """
+        with self._lock:
+            target = self._load().setdefault(section, {})
+            for key, value in values.items():
+                key = str(key)
+                if isinstance(value, dict) and isinstance(target.get(key), dict):
+                    target[key].update(value)
+                else:
+                    target[key] = value
+            if save:
+                self._save()
+
+    def save(self):
+        """Écrit le fichier de façon atomique"""
+        with self._lock:
+            self._save()
+
+    def _save(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(prefix='.calibration-', suffix='.json', dir=directory)
+        try:
+            with os.fdopen(fd, 'w') as file:
+                json.dump(self._data, file, indent=2, sort_keys=True)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+_store = None
+
+
+def get_store():
+    """Retourne la base de calibrage partagée par tous les modules"""
+    global _store
+    if _store is None:
+        _store = CalibrationStore()
+    return _store
@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+"""
+MasterCamp Robotique - Serveur de commandes du robot
+
+Remplace les boucles input() bloquantes de tache1/2/3/4 par un serveur asyncio
+unique (socket UNIX locale ou TCP sur localhost). Le protocole est texte, une
+commande par ligne, une réponse par ligne dans l'ordre d'arrivée :
+
+    led <code>                         tache1 : 11-19 allumer, 21-29 éteindre, 0, 99
+    ws <led|groupe> <R|G|B|N> [int]    tache2 : LED WS2812 (ex: ws AD R 200)
+    ws off                             tache2 : toutes les WS2812 éteintes
+    rgb <left|right|both> <r> <g> <b>  tache1 : feux avant RGB (FrontRGBEngine)
+    servo <canal> <angle>              tache3 : consigne immédiate
+    servo glide <canal> <angle>        tache3 : trajectoire (ServoMotionPlanner)
+    servo center                       tache3 : tous les servos au centre
+    motor avant|arriere|arret          tache4 : fonction simple (MAX_SAFE_SPEED)
+    motor ramp <vitesse> <sens> <durée> [profil]   tache4 : rampe non bloquante
+    motor stop                         tache4 : arrêt immédiat
+    ping | stats
+
+Réponses : "OK <latence µs> [données]" ou "ERR <latence µs> <message>". La
+latence est le temps de traitement côté serveur (analyse + appel du pilote).
+Les commandes longues (rampes, trajectoires) rendent la main aussitôt : la
+rampe avance dans une tâche asyncio, les servos dans le timer du planificateur.
+
+Exemple:
+    server = CommandServer(leds=True, servos=ServoController())
+    server.start(path='/tmp/jcvd.sock')
+    replies = replay(['led 11', 'servo 1 30'], path='/tmp/jcvd.sock')
+"""
+
+import asyncio
+import math
+import sys
+import threading
+import time
+from collections import deque
+
+import numpy
+
+DEFAULT_PORT = 5045
+DEFAULT_SOCKET = '/tmp/jcvd.sock'
+
+# Couleurs de base des WS2812 (comme WS2812Controller.control_led)
+WS_COLORS = {'R': (1, 0, 0), 'G': (0, 1, 0), 'B': (0, 0, 1), 'N': (0, 0, 0)}
+
+
+class CommandError(Exception):
+    """Commande invalide ou pilote indisponible (renvoyée en ERR au client)"""
+
+
+class CommandServer:
+    """
+    Serveur asyncio qui répartit les commandes vers les pilotes du robot
+
+    Les pilotes absents (None) répondent ERR : le serveur tourne aussi sur
+    un robot partiel ou en simulation. Toutes les commandes sont traitées
+    sur la boucle asyncio du serveur, donc jamais en parallèle sur un même
+    pilote.
+    """
+
+    def __init__(self, leds=False, ws2812=None, rgb=None, servos=None, planner=None, motor=None,
+                 history=1024):
+        """
+        Args:
+            leds (bool): Pilote les LEDs de tache1 (GPIO)
+            ws2812 (WS2812Controller): Bandeau WS2812 (tache2)
+            rgb (FrontRGBEngine): Moteur PWM des feux avant (tache1), démarré et arrêté avec le serveur
+            servos (ServoController): Contrôleur des servos (tache3)
+            planner (ServoMotionPlanner): Planificateur (servos.planner si None)
+            motor (MotorRamp): Rampe du moteur de propulsion (tache4)
+            history (int): Nombre de latences conservées par commande
+        """
+        if leds:
+            import tache1
+            tache1.switchSetup()
+            self.tache1 = tache1
+        else:
+            self.tache1 = None
+        self.ws2812 = ws2812
+        self.rgb = rgb
+        self.servos = servos
+        if planner is None and servos is not None:
+            # Celui du contrôleur : un second planificateur enverrait des
+            # trajectoires concurrentes sur les mêmes canaux du PCA9685
+            planner = servos.planner
+        self.planner = planner
+        self.motor = motor
+        self._ramp_task = None
+
+        self.handlers = {
+            'led': self._cmd_led,
+            'ws': self._cmd_ws,
+            'rgb': self._cmd_rgb,
+            'servo': self._cmd_servo,
+            'motor': self._cmd_motor,
+            'ping': lambda args: 'pong',
+            'stats': self._cmd_stats,
+        }
+
+        # Latences par commande (µs), fenêtre glissante
+        self.history = history
+        self.latencies = {}
+        self.counts = {}
+        self.errors = 0
+        self.clients = 0
+
+        self._loop = None
+        self._server = None
+        self._thread = None
+        self._ready = threading.Event()
+
+    # ─── Pilotes ──────────────────────────────────────────────────────────
+
+    def _require(self, driver, name):
+        if driver is None:
+            raise CommandError(f"pilote indisponible: {name}")
+        return driver
+
+    def _number(self, text, name, kind=float):
+        """Argument numérique fini (nan et inf refusés)"""
+        try:
+            value = kind(text)
+        except ValueError:
+            raise CommandError(f"{name} invalide: '{text}'")
+        if not math.isfinite(value):
+            raise CommandError(f"{name} non fini: '{text}'")
+        return value
+
+    def _cmd_led(self, args):
+        tache1 = self._require(self.tache1, "LEDs tache1")
+        if len(args) != 1 or not args[0].isdigit():
+            raise CommandError("usage: led <11-19|21-29|0|99>")
+        code = args[0]
+        if code == '0':
+            tache1.set_all_switch_off(verbose=False)
+        elif code == '99':
+            tache1.set_all_switch_on(verbose=False)
+        elif len(code) == 2 and code[0] in '12' and code[1] in '123456789':
+            tache1.switch(int(code[1]), 1 if code[0] == '1' else 0, verbose=False)
+        else:
+            raise CommandError(f"code LED invalide: {code}")
+
+    def _cmd_ws(self, args):
+        ws2812 = self._require(self.ws2812, "WS2812")
+        if args == ['off']:
+            ws2812.set_all_led_color(0, 0, 0)
+            return
+        if len(args) not in (2, 3):
+            raise CommandError("usage: ws <led|groupe> <R|G|B|N> [intensité] | ws off")
+        leds = ws2812._parse_led_identifier(args[0])
+        if isinstance(leds, int):
+            if not 0 <= leds < ws2812.led_count:
+                raise CommandError(f"LED '{args[0]}' invalide")
+            leds = [leds]
+        elif leds is None:
+            raise CommandError(f"identifiant '{args[0]}' invalide")
+        color = WS_COLORS.get(args[1].upper())
+        if color is None:
+            raise CommandError(f"couleur '{args[1]}' invalide (R, G, B, N)")
+        intensity = max(0, min(255, int(args[2]))) if len(args) == 3 else 255
+        ws2812.fill(leds, tuple(c * intensity for c in color))
+        ws2812.show()
+
+    def _cmd_rgb(self, args):
+        rgb = self._require(self.rgb, "feux avant RGB")
+        if len(args) != 4 or args[0] not in ('left', 'right', 'both'):
+            raise CommandError("usage: rgb <left|right|both> <r> <g> <b>")
+        rgb.set_color(args[0], tuple(int(c) for c in args[1:]))
+
+    def _cmd_servo(self, args):
+        servos = self._require(self.servos, "servos")
+        if args == ['center']:
+            self.planner.start()
+            for channel in servos.servo_configs:
+                self.planner.set_target(channel, 0)
+            return
+        if len(args) == 3 and args[0] == 'glide':
+            self.planner.start()
+            channel = self._number(args[1], "canal", int)
+            angle = self._number(args[2], "angle")
+            if not self.planner.set_target(channel, angle):
+                raise CommandError("canal ou angle invalide")
+            return
+        if len(args) != 2:
+            raise CommandError("usage: servo <canal> <angle> | servo glide <canal> <angle> | servo center")
+        channel = self._number(args[0], "canal", int)
+        angle = self._number(args[1], "angle")
+        if not servos.set_angle(channel, angle, verbose=False):
+            raise CommandError("canal ou angle invalide")
+
+    def _cmd_motor(self, args):
+        import tache4
+        ramp = self._require(self.motor, "moteur")
+        simple = {'avant': (tache4.MAX_SAFE_SPEED, tache4.DIR_FORWARD),
+                  'arriere': (tache4.MAX_SAFE_SPEED, tache4.DIR_BACKWARD),
+                  'arret': (0, tache4.DIR_FORWARD), 'stop': (0, tache4.DIR_FORWARD)}
+        if len(args) == 1 and args[0] in simple:
+            # Rampe de durée nulle : consigne appliquée immédiatement
+            ramp.start(*simple[args[0]], duration=0)
+            ramp.tick()
+            return
+        if len(args) in (4, 5) and args[0] == 'ramp':
+            speed = self._number(args[1], "vitesse")
+            direction = self._number(args[2], "sens", int)
+            duration = self._number(args[3], "durée")
+            if direction not in (tache4.DIR_FORWARD, tache4.DIR_BACKWARD):
+                raise CommandError("sens: 1 (avant) ou -1 (arrière)")
+            try:
+                ramp.start(min(speed, 100), direction, max(duration, tache4.MIN_RAMP_TIME),
+                           args[4] if len(args) == 5 else 'linear')
+            except ValueError as e:
+                raise CommandError(str(e))
+            if self._ramp_task is None or self._ramp_task.done():
+                self._ramp_task = asyncio.ensure_future(ramp.run_async())
+            return
+        raise CommandError("usage: motor avant|arriere|arret|stop | motor ramp <vitesse> <sens> <durée> [profil]")
+
+    def _cmd_stats(self, args):
+        return " ".join(f"{name}:{s['count']}/{s['mean_us']:.0f}/{s['p99_us']:.0f}"
+                        for name, s in self.stats().items())
+
+    # ─── Répartition et statistiques ──────────────────────────────────────
+
+    def execute(self, line):
+        """
+        Exécute une ligne de commande
+
+        Returns:
+            str: Réponse du protocole (sans fin de ligne)
+        """
+        start = time.perf_counter()
+        parts = line.strip().lower().split()
+        name = parts[0] if parts else ''
+        try:
+            handler = self.handlers.get(name)
+            if handler is None:
+                raise CommandError(f"commande inconnue: '{name}'")
+            result = handler(parts[1:])
+            ok = True
+        except (CommandError, ValueError) as e:
+            result = str(e)
+            ok = False
+        except Exception as e:
+            # Une commande ne doit jamais couper la connexion du client
+            result = f"{type(e).__name__}: {e}"
+            ok = False
+        latency = (time.perf_counter() - start) * 1e6
+
+        if name in self.handlers:
+            if name not in self.latencies:
+                self.latencies[name] = deque(maxlen=self.history)
+                self.counts[name] = 0
+            self.latencies[name].append(latency)
+            self.counts[name] += 1
+        if not ok:
+            self.errors += 1
+            return f"ERR {latency:.0f} {result}"
+        return f"OK {latency:.0f}" + (f" {result}" if result else "")
+
+    def stats(self):
+        """
+        Latence de traitement par commande (fenêtre glissante)
+
+        Returns:
+            dict: {commande: {count, mean_us, p50_us, p99_us, max_us}}
+        """
+        stats = {}
+        for name, values in self.latencies.items():
+            values = numpy.array(values)
+            stats[name] = {
+                'count': self.counts[name],
+                'mean_us': float(values.mean()),
+                'p50_us': float(numpy.percentile(values, 50)),
+                'p99_us': float(numpy.percentile(values, 99)),
+                'max_us': float(values.max()),
+            }
+        return stats
+
+    def print_stats(self):
+        print(f"📊 Serveur de commandes : {self.clients} client(s), {self.errors} erreur(s)")
+        for name, s in self.stats().items():
+            print(f"   {name:<6}: {s['count']:6d} cmd | moy {s['mean_us']:7.1f} µs | "
+                  f"p50 {s['p50_us']:7.1f} µs | p99 {s['p99_us']:7.1f} µs | max {s['max_us']:8.1f} µs")
+
+    # ─── Transport ────────────────────────────────────────────────────────
+
+    async def _handle_client(self, reader, writer):
+        self.clients += 1
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                line = line.decode(errors='replace').strip()
+                if not line:
+                    continue
+                if line in ('quit', 'exit'):
+                    break
+                writer.write((self.execute(line) + "\n").encode())
+                # Évite d'accumuler les réponses d'un client qui ne lit pas
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, path=None, host='127.0.0.1', port=DEFAULT_PORT):
+        """
+        Sert les clients jusqu'à l'arrêt (coroutine)
+
+        Args:
+            path (str): Socket UNIX (prioritaire sur host/port)
+            host, port: Adresse TCP (localhost par défaut)
+        """
+        self._loop = asyncio.get_running_loop()
+        if path:
+            self._server = await asyncio.start_unix_server(self._handle_client, path=path)
+        else:
+            self._server = await asyncio.start_server(self._handle_client, host, port)
+        if self.rgb is not None:
+            self.rgb.start()
+        self._ready.set()
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            if self._ramp_task is not None:
+                self._ramp_task.cancel()
+            if self.rgb is not None:
+                self.rgb.stop()
+
+    def start(self, path=None, host='127.0.0.1', port=DEFAULT_PORT):
+        """Démarre le serveur sur un thread dédié (la boucle de contrôle reste libre)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._ready.clear()
+        self._thread = threading.Thread(target=asyncio.run, args=(self.serve(path, host, port),),
+                                        name="command-server", daemon=True)
+        self._thread.start()
+        self._ready.wait(5.0)
+
+    def stop(self):
+        """Arrête le serveur (et les feux avant RGB) et le planificateur des servos"""
+        if self._loop is not None and self._server is not None:
+            self._loop.call_soon_threadsafe(self._server.close)
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self.planner is not None:
+            self.planner.stop()
+
+
+async def send(lines, path=None, host='127.0.0.1', port=DEFAULT_PORT, pipeline=True):
+    """
+    Envoie des commandes et mesure leur temps aller-retour
+
+    Une ligne "sleep <s>" est exécutée côté client (scripts rejoués en temps réel).
+
+    Args:
+        pipeline (bool): Envoie sans attendre les réponses (débit) ; sinon une
+                         commande à la fois (latence d'une commande isolée)
+
+    Returns:
+        list: (commande, réponse, aller-retour en s) dans l'ordre d'envoi
+    """
+    if path:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    pending = asyncio.Queue()
+    results = []
+
+    async def write_all():
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if line.startswith('sleep '):
+                await asyncio.sleep(float(line.split()[1]))
+                continue
+            sent = time.perf_counter()
+            writer.write((line + "\n").encode())
+            await writer.drain()
+            if pipeline:
+                pending.put_nowait((line, sent))
+            else:
+                reply = await reader.readline()
+                results.append((line, reply.decode().strip(), time.perf_counter() - sent))
+        pending.put_nowait(None)   # fin du script
+
+    async def read_all():
+        while True:
+            sent = await pending.get()
+            if sent is None:
+                return
+            reply = await reader.readline()
+            if not reply:
+                return
+            line, sent = sent
+            results.append((line, reply.decode().strip(), time.perf_counter() - sent))
+
+    await asyncio.gather(write_all(), read_all())
+    writer.close()
+    return results
+
+
+def replay(lines, path=None, host='127.0.0.1', port=DEFAULT_PORT, pipeline=True):
+    """Version bloquante de send() (scripts de test de charge)"""
+    return asyncio.run(send(lines, path, host, port, pipeline))
+
+
+def build_server():
+    """Serveur avec tous les pilotes disponibles sur cette machine"""
+    drivers = {}
+    try:
+        from tache1 import FrontRGBEngine
+        drivers['rgb'] = FrontRGBEngine()
+    except Exception as e:
+        print(f"⚠ Feux avant RGB indisponibles: {e}")
+    try:
+        from tache2 import WS2812Controller
+        ws2812 = WS2812Controller()
+        if ws2812.led_init_state:
+            drivers['ws2812'] = ws2812
+    except Exception as e:
+        print(f"⚠ WS2812 indisponible: {e}")
+    try:
+        from tache3 import ServoController
+        drivers['servos'] = ServoController()
+    except Exception as e:
+        print(f"⚠ Servos indisponibles: {e}")
+    try:
+        import tache4
+        drivers['motor'] = tache4.MotorRamp(tache4.PROPULSION_MOTOR)
+    except Exception as e:
+        print(f"⚠ Moteur indisponible: {e}")
+    return CommandServer(leds=True, **drivers)
+
+
+def main():
+    """
+    python3 commandserver.py serve [socket|port]
+    python3 commandserver.py replay <script> [socket|port]
+    """
+    args = sys.argv[1:] or ['serve']
+    rest = args[2:] if args[0] == 'replay' else args[1:]
+    target = rest[0] if rest else DEFAULT_SOCKET
+    address = {'port': int(target)} if target.isdigit() else {'path': target}
+
+    if args[0] == 'serve':
+        server = build_server()
+        print(f"🎮 Serveur de commandes sur {target} (Ctrl+C pour arrêter)")
+        try:
+            asyncio.run(server.serve(**address))
+        except KeyboardInterrupt:
+            print("\n⏹️  Arrêt du serveur")
+        finally:
+            server.print_stats()
+    elif args[0] == 'replay' and len(args) > 1:
+        with open(args[1]) as script:
+            results = replay(script.readlines(), **address)
+        for line, reply, rtt in results:
+            print(f"{line:<30} -> {reply} ({rtt * 1e6:.0f} µs aller-retour)")
+    else:
+        print(main.__doc__)
+
+
+if __name__ == "__main__":
+    main()
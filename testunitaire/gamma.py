@@ -0,0 +1,10 @@
+#!/usr/bin/env python3
+"""
+MasterCamp Robotique - Correction gamma commune des LED
+
+Constante partagée par les feux avant RGB (tache1, PWM GPIO) et les WS2812
+(tache2, SPI), sans que l'un des pilotes dépende de l'autre.
+"""
+
+# Gamma par défaut : rend les intensités perceptuellement linéaires
+DEFAULT_GAMMA = 2.2
@@ -0,0 +1,923 @@
+#!/usr/bin/env python3
+"""
+MasterCamp Robotique - Couche d'abstraction matérielle (HAL)
+
+Chaque module tacheN obtient ses périphériques via les fabriques de ce module
+au lieu d'importer directement RPi.GPIO, spidev, adafruit_pca9685, gpiozero...
+
+Deux familles de backends :
+- réels   : bibliothèques du Raspberry Pi (RPi.GPIO, spidev, adafruit_pca9685,
+            adafruit_motor, adafruit_ads7830, gpiozero)
+- simulés : périphériques en mémoire qui horodatent chaque appel et mesurent
+            sa latence, pour benchmarker les chemins critiques sur un PC Linux
+
+Sélection par la variable d'environnement JCVD_BACKEND :
+- 'auto' (défaut) : backend réel si la bibliothèque est importable, sinon simulé
+- 'real'          : backend réel obligatoire
+- 'sim'           : backend simulé partout
+ou dans le code avec set_backend('sim') avant de créer les périphériques.
+"""
+
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+_backend = os.environ.get('JCVD_BACKEND', 'auto').lower()
+
+
+def set_backend(name):
+    """
+    Choisit le backend des périphériques créés ensuite
+
+    Args:
+        name (str): 'auto', 'real' ou 'sim'
+    """
+    global _backend
+    if name not in ('auto', 'real', 'sim'):
+        raise ValueError(f"Backend '{name}' inconnu (auto, real, sim)")
+    _backend = name
+
+
+def get_backend():
+    """Retourne le nom du backend courant"""
+    return _backend
+
+
+def _use_real(module_name, description):
+    """
+    Indique si le backend réel doit être utilisé pour un périphérique
+
+    En mode 'auto', bascule sur la simulation si la bibliothèque est absente.
+    """
+    if _backend == 'sim':
+        return False
+    try:
+        __import__(module_name)
+        return True
+    except ImportError:
+        if _backend == 'real':
+            raise
+        print(f"⚠ {module_name} non disponible - {description} simulé")
+        return False
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+#                          ENREGISTREMENT DES APPELS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class CallRecorder:
+    """Historique horodaté des appels d'un périphérique simulé"""
+
+    def __init__(self, maxlen=10000):
+        self.calls = deque(maxlen=maxlen)  # (nom, horodatage, latence en s)
+        self._counts = {}
+        self._totals = {}
+        self._maxima = {}
+
+    def _record(self, name, start):
+        latency = time.perf_counter() - start
+        self.calls.append((name, start, latency))
+        self._counts[name] = self._counts.get(name, 0) + 1
+        self._totals[name] = self._totals.get(name, 0.0) + latency
+        self._maxima[name] = max(self._maxima.get(name, 0.0), latency)
+
+    def call_count(self, name=None):
+        """Nombre d'appels (d'une opération précise ou au total)"""
+        if name is None:
+            return sum(self._counts.values())
+        return self._counts.get(name, 0)
+
+    def latency_stats(self):
+        """Statistiques de latence par opération : {nom: {count, mean_us, max_us}}"""
+        return {
+            name: {
+                'count': count,
+                'mean_us': self._totals[name] / count * 1e6,
+                'max_us': self._maxima[name] * 1e6,
+            }
+            for name, count in self._counts.items()
+        }
+
+    def reset_stats(self):
+        self.calls.clear()
+        self._counts.clear()
+        self._totals.clear()
+        self._maxima.clear()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+#                                    GPIO
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class SimGPIO(CallRecorder):
+    """GPIO simulé avec la même interface que le module RPi.GPIO"""
+
+    BCM = 11
+    BOARD = 10
+    OUT = 0
+    IN = 1
+    LOW = 0
+    HIGH = 1
+    PUD_OFF = 20
+    PUD_DOWN = 21
+    PUD_UP = 22
+    RISING = 31
+    FALLING = 32
+    BOTH = 33
+
+    def __init__(self):
+        super().__init__()
+        self.mode = None
+        self.directions = {}
+        self.levels = {}
+        self._callbacks = {}
+        self._lock = threading.Lock()
+
+    def setwarnings(self, flag):
+        pass
+
+    def setmode(self, mode):
+        self.mode = mode
+
+    def setup(self, channel, direction, pull_up_down=PUD_OFF, initial=None):
+        for pin in self._as_list(channel):
+            self.directions[pin] = direction
+            if initial is not None:
+                self.levels[pin] = initial
+            else:
+                self.levels.setdefault(pin, 1 if pull_up_down == self.PUD_UP else 0)
+
+    def output(self, channel, value):
+        start = time.perf_counter()
+        pins = self._as_list(channel)
+        values = self._as_list(value) if isinstance(value, (list, tuple)) else [value] * len(pins)
+        for pin, level in zip(pins, values):
+            self.levels[pin] = 1 if level else 0
+        self._record('output', start)
+
+    def input(self, channel):
+        start = time.perf_counter()
+        level = self.levels.get(channel, 0)
+        self._record('input', start)
+        return level
+
+    def add_event_detect(self, channel, edge, callback=None, bouncetime=None):
+        with self._lock:
+            self._callbacks[channel] = [edge, []]
+        if callback is not None:
+            self.add_event_callback(channel, callback)
+
+    def add_event_callback(self, channel, callback):
+        with self._lock:
+            self._callbacks[channel][1].append(callback)
+
+    def remove_event_detect(self, channel):
+        with self._lock:
+            self._callbacks.pop(channel, None)
+
+    def set_input(self, channel, level):
+        """Impose le niveau d'une entrée (côté simulation) et déclenche les fronts"""
+        level = 1 if level else 0
+        previous = self.levels.get(channel, 0)
+        self.levels[channel] = level
+        if level == previous:
+            return
+        with self._lock:
+            edge, callbacks = self._callbacks.get(channel, (None, ()))
+            callbacks = list(callbacks)
+        rising = level == 1
+        if edge == self.BOTH or (edge == self.RISING and rising) or (edge == self.FALLING and not rising):
+            for callback in callbacks:
+                callback(channel)
+
+    def PWM(self, channel, frequency):
+        return SimSoftPWM(self, channel, frequency)
+
+    def cleanup(self, channel=None):
+        pins = self._as_list(channel) if channel is not None else list(self.directions)
+        for pin in pins:
+            self.directions.pop(pin, None)
+            self._callbacks.pop(pin, None)
+
+    @staticmethod
+    def _as_list(value):
+        return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+class SimSoftPWM:
+    """Équivalent simulé de RPi.GPIO.PWM"""
+
+    def __init__(self, gpio, channel, frequency):
+        self.gpio = gpio
+        self.channel = channel
+        self.frequency = frequency
+        self.duty_cycle = 0.0
+        self.running = False
+
+    def start(self, duty_cycle):
+        self.duty_cycle = duty_cycle
+        self.running = True
+
+    def ChangeDutyCycle(self, duty_cycle):
+        start = time.perf_counter()
+        self.duty_cycle = duty_cycle
+        self.gpio._record('pwm_duty', start)
+
+    def ChangeFrequency(self, frequency):
+        self.frequency = frequency
+
+    def stop(self):
+        self.running = False
+
+
+class SimDigitalInput:
+    """Entrée numérique simulée (interface gpiozero.DigitalInputDevice)"""
+
+    def __init__(self, gpio, pin):
+        self.gpio = gpio
+        self.pin = pin
+        self.when_activated = None
+        self.when_deactivated = None
+        gpio.setup(pin, gpio.IN)
+        gpio.add_event_detect(pin, gpio.BOTH, callback=self._on_edge)
+
+    @property
+    def value(self):
+        return self.gpio.input(self.pin)
+
+    @property
+    def is_active(self):
+        return bool(self.value)
+
+    def _on_edge(self, pin):
+        callback = self.when_activated if self.gpio.levels.get(pin) else self.when_deactivated
+        if callback is not None:
+            callback()
+
+    def close(self):
+        self.gpio.remove_event_detect(self.pin)
+
+
+_sim_gpio = None
+
+
+def sim_gpio():
+    """GPIO simulé unique : toutes les entrées/sorties simulées partagent son état"""
+    global _sim_gpio
+    if _sim_gpio is None:
+        _sim_gpio = SimGPIO()
+    return _sim_gpio
+
+
+def gpio():
+    """Retourne le module GPIO (RPi.GPIO ou son équivalent simulé)"""
+    if _use_real('RPi.GPIO', "GPIO"):
+        import RPi.GPIO as GPIO
+        return GPIO
+    return sim_gpio()
+
+
+def pigpio_pi():
+    """
+    Connexion au démon pigpio (PWM cadencée par DMA), ou None
+
+    None en simulation, si pigpio n'est pas installé ou si le démon pigpiod
+    ne tourne pas : l'appelant choisit alors un autre mécanisme.
+    """
+    if _backend == 'sim':
+        return None
+    try:
+        import pigpio
+    except ImportError:
+        return None
+    pi = pigpio.pi()
+    if not pi.connected:
+        return None
+    return pi
+
+
+def digital_input(pin):
+    """Entrée numérique (capteurs IR de suivi de ligne)"""
+    if _use_real('gpiozero', f"entrée GPIO {pin}"):
+        from gpiozero import DigitalInputDevice
+        return DigitalInputDevice(pin)
+    return SimDigitalInput(sim_gpio(), pin)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+#                                     SPI
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class SimSPI(CallRecorder):
+    """Périphérique SPI simulé (interface spidev.SpiDev)"""
+
+    def __init__(self, bus=0, device=0):
+        super().__init__()
+        self.bus = bus
+        self.device = device
+        self.mode = 0
+        self.max_speed_hz = 0
+        self.bytes_sent = 0
+        self.last_transfer = b''
+
+    def open(self, bus, device):
+        self.bus = bus
+        self.device = device
+
+    def xfer(self, data, speed_hz=0, delay_usec=0, bits_per_word=8):
+        start = time.perf_counter()
+        self.last_transfer = bytes(data)
+        self.bytes_sent += len(data)
+        self._record('xfer', start)
+
+    xfer2 = xfer
+
+    def writebytes2(self, data):
+        self.xfer(data)
+
+    @property
+    def transfers(self):
+        return self.call_count('xfer')
+
+    def close(self):
+        pass
+
+
+def spi_device(bus=0, device=0):
+    """
+    Ouvre un périphérique SPI (mode 0)
+
+    Raises:
+        OSError: SPI matériel non activé (backend réel)
+    """
+    if _use_real('spidev', "SPI"):
+        import spidev
+        spi = spidev.SpiDev()
+        spi.open(bus, device)
+        spi.mode = 0
+        return spi
+    return SimSPI(bus, device)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+#                           PWM I2C (PCA9685) ET MOTEURS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+_i2c = None
+_pca9685_devices = {}
+
+# Fréquence du PCA9685 0x5f du Robot HAT : servos et moteurs partagent la puce,
+# elle reste donc à la fréquence des servos (le throttle des moteurs est un
+# rapport cyclique, valable à toute fréquence)
+SERVO_FREQUENCY = 50
+
+
+def _i2c_bus():
+    """Bus I2C matériel partagé par tous les périphériques réels"""
+    global _i2c
+    if _i2c is None:
+        import busio
+        from board import SCL, SDA
+        _i2c = busio.I2C(SCL, SDA)
+    return _i2c
+
+
+def _duty_to_regs(duty_cycle):
+    """Convertit un rapport cyclique 16 bits en registres (on, off) comme adafruit_pca9685"""
+    if duty_cycle == 0xFFFF:
+        return 0x1000, 0
+    if duty_cycle < 0x0010:
+        return 0, 0x1000
+    return 0, (duty_cycle >> 4) & 0x0FFF
+
+
+PCA9685_MODE1 = 0x00
+PCA9685_MODE1_AI = 0x20       # Auto-incrément des registres
+PCA9685_MODE1_RESTART = 0x80
+PCA9685_LED0_ON_L = 0x06      # Premier registre du canal 0 (4 registres par canal)
+
+
+def _block_payload(first_channel, regs):
+    """Trame I2C d'écriture en bloc : registre de départ puis (on, off) de chaque canal"""
+    payload = bytearray(1 + 4 * len(regs))
+    payload[0] = PCA9685_LED0_ON_L + 4 * first_channel
+    for i, (on, off) in enumerate(regs):
+        payload[1 + 4 * i:5 + 4 * i] = (on & 0xFF, on >> 8, off & 0xFF, off >> 8)
+    return payload
+
+
+def _regs_to_duty(on, off):
+    if on == 0x1000:
+        return 0xFFFF
+    if off == 0x1000:
+        return 0
+    return (off << 4) & 0xFFFF
+
+
+class RealPCA9685:
+    """
+    PCA9685 réel (adafruit_pca9685) avec l'interface commune :
+    - set_pwm(canal, on, off) / set_pwm_freq(f) pour les servos (12 bits)
+    - channels[n].duty_cycle pour adafruit_motor (16 bits)
+    """
+
+    def __init__(self, address=0x5f):
+        from adafruit_pca9685 import PCA9685
+        self.address = address
+        self._pca = PCA9685(_i2c_bus(), address=address)
+        self.channels = self._pca.channels
+        self._auto_increment = False
+
+    @property
+    def frequency(self):
+        return self._pca.frequency
+
+    @frequency.setter
+    def frequency(self, frequency):
+        self._pca.frequency = frequency
+
+    def set_pwm_freq(self, frequency):
+        self._pca.frequency = frequency
+
+    def set_pwm(self, channel, on, off):
+        self._pca.pwm_regs[channel] = (on, off)
+
+    def write_block(self, first_channel, regs):
+        """Écrit plusieurs canaux consécutifs en une seule transaction I2C"""
+        if not self._auto_increment:
+            mode1 = self._pca.mode1_reg & ~PCA9685_MODE1_RESTART
+            self._pca.mode1_reg = mode1 | PCA9685_MODE1_AI
+            self._auto_increment = True
+        with self._pca.i2c_device as i2c:
+            i2c.write(_block_payload(first_channel, regs))
+
+    def deinit(self):
+        self._pca.deinit()
+        self._auto_increment = False
+        _pca9685_devices.pop(self.address, None)
+
+
+class SimPWMChannel:
+    """Canal PWM simulé (interface adafruit_pca9685.PWMChannel)"""
+
+    def __init__(self, pca, index):
+        self._pca = pca
+        self._index = index
+
+    @property
+    def duty_cycle(self):
+        return _regs_to_duty(*self._pca.regs[self._index])
+
+    @duty_cycle.setter
+    def duty_cycle(self, value):
+        if not 0 <= value <= 0xFFFF:
+            raise ValueError(f"Out of range: value {value} not 0 <= value <= 65,535")
+        start = time.perf_counter()
+        self._pca.regs[self._index] = _duty_to_regs(value)
+        self._pca._record('write', start)
+
+
+class SimPCA9685(CallRecorder):
+    """PCA9685 simulé : 16 canaux (on, off) 12 bits, une écriture I2C par appel"""
+
+    def __init__(self, address=0x5f):
+        super().__init__()
+        self.address = address
+        self.frequency = 50
+        self.regs = [(0, 0x1000)] * 16
+        self.channels = [SimPWMChannel(self, i) for i in range(16)]
+
+    def set_pwm_freq(self, frequency):
+        self.frequency = frequency
+
+    def set_pwm(self, channel, on, off):
+        start = time.perf_counter()
+        self.regs[channel] = (on, off)
+        self._record('write', start)
+
+    def write_block(self, first_channel, regs):
+        """Écriture en bloc (auto-incrément) : une seule transaction I2C"""
+        start = time.perf_counter()
+        _block_payload(first_channel, regs)
+        for i, channel_regs in enumerate(regs):
+            self.regs[first_channel + i] = channel_regs
+        self._record('block_write', start)
+
+    @property
+    def i2c_writes(self):
+        """Nombre de transactions I2C (écritures simples et en bloc)"""
+        return self.call_count('write') + self.call_count('block_write')
+
+    def deinit(self):
+        _pca9685_devices.pop(self.address, None)
+
+
+class CachedPWMChannel:
+    """Canal PWM passant par le cache d'écriture (interface PWMChannel)"""
+
+    def __init__(self, cache, index):
+        self._cache = cache
+        self._index = index
+
+    @property
+    def duty_cycle(self):
+        regs = self._cache.last_regs[self._index]
+        if regs is None:
+            return self._cache.device.channels[self._index].duty_cycle
+        return _regs_to_duty(*regs)
+
+    @duty_cycle.setter
+    def duty_cycle(self, value):
+        if not 0 <= value <= 0xFFFF:
+            raise ValueError(f"Out of range: value {value} not 0 <= value <= 65,535")
+        self._cache.set_pwm(self._index, *_duty_to_regs(value))
+
+
+class CachedPCA9685:
+    """
+    Cache d'écriture devant un PCA9685
+
+    Mémorise le dernier couple (on, off) écrit sur chaque canal et saute les
+    transactions I2C qui ne changent rien. Servos (set_pwm) et moteurs
+    (channels[n].duty_cycle) passent par le même cache.
+
+    Dans un bloc transaction(), les écritures sont collectées puis envoyées
+    à la sortie en écritures de blocs de canaux consécutifs (auto-incrément).
+    """
+
+    def __init__(self, device, max_gap=2):
+        """
+        Args:
+            device: PCA9685 réel ou simulé
+            max_gap (int): Nombre max de canaux inchangés réécrits pour fusionner deux blocs
+        """
+        self.device = device
+        self.address = device.address
+        self.max_gap = max_gap
+        self.last_regs = [None] * 16
+        self.hits = 0      # écritures évitées
+        self.misses = 0    # écritures transmises
+        self.channels = [CachedPWMChannel(self, i) for i in range(16)]
+
+        # Transactions : écritures en attente et compteurs
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._pending = {}
+        self.block_writes = 0
+        self.transactions_saved = 0
+        self.locked_frequency = None
+
+    @property
+    def frequency(self):
+        return self.device.frequency
+
+    @frequency.setter
+    def frequency(self, frequency):
+        self._check_frequency(frequency)
+        self.device.frequency = frequency
+
+    def set_pwm_freq(self, frequency):
+        self._check_frequency(frequency)
+        self.device.set_pwm_freq(frequency)
+
+    def _check_frequency(self, frequency):
+        if self.locked_frequency is not None and frequency != self.locked_frequency:
+            raise RuntimeError(f"PCA9685 0x{self.address:02x} : fréquence verrouillée à "
+                               f"{self.locked_frequency} Hz (puce partagée servos/moteurs), "
+                               f"{frequency} Hz refusé")
+
+    def lock_frequency(self, frequency=SERVO_FREQUENCY):
+        """
+        Fixe la fréquence de la puce et refuse ensuite toute autre valeur
+
+        Appelé par chaque utilisateur de la puce partagée (servos, moteurs) :
+        le premier règle la fréquence, les suivants vérifient qu'elle convient.
+        """
+        with self._lock:
+            self._check_frequency(frequency)
+            if self.locked_frequency is None:
+                self.device.set_pwm_freq(frequency)
+                self.locked_frequency = frequency
+
+    def set_pwm(self, channel, on, off):
+        """
+        Écrit un canal si sa valeur change
+
+        Returns:
+            bool: True si une transaction I2C a été émise
+        """
+        regs = (on, off)
+        with self._lock:
+            if self._depth > 0:
+                self._pending[channel] = regs
+                return False
+            if self.last_regs[channel] == regs:
+                self.hits += 1
+                return False
+            self.device.set_pwm(channel, on, off)
+            self.last_regs[channel] = regs
+            self.misses += 1
+            return True
+
+    @contextmanager
+    def transaction(self):
+        """
+        Regroupe des mises à jour de canaux en écritures de blocs
+
+        Exemple (direction, tête et propulsion dans le même tick) :
+            with pca.transaction():
+                servos.set_angle(0, -20)
+                servos.set_angle(1, 15)
+                Motor(1, DIR_FORWARD, 20)
+        """
+        with self._lock:
+            self._depth += 1
+            try:
+                yield self
+            finally:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._flush()
+
+    def _flush(self):
+        """Envoie les écritures en attente, en blocs de canaux consécutifs"""
+        pending, self._pending = self._pending, {}
+        changed = []
+        for channel in sorted(pending):
+            if pending[channel] == self.last_regs[channel]:
+                self.hits += 1
+            else:
+                changed.append(channel)
+        if not changed:
+            return
+
+        # Fusion des canaux proches : les canaux intermédiaires inchangés sont
+        # réécrits avec leur valeur connue plutôt que d'ouvrir une transaction
+        blocks = [[changed[0], changed[0]]]
+        for channel in changed[1:]:
+            last = blocks[-1][1]
+            gap = range(last + 1, channel)
+            if len(gap) <= self.max_gap and all(self.last_regs[c] is not None for c in gap):
+                blocks[-1][1] = channel
+            else:
+                blocks.append([channel, channel])
+
+        for first, last in blocks:
+            regs = [pending.get(c, self.last_regs[c]) for c in range(first, last + 1)]
+            if first == last:
+                self.device.set_pwm(first, *regs[0])
+            elif hasattr(self.device, 'write_block'):
+                self.device.write_block(first, regs)
+                self.block_writes += 1
+            else:
+                for i, (on, off) in enumerate(regs):
+                    self.device.set_pwm(first + i, on, off)
+            for i, channel_regs in enumerate(regs):
+                self.last_regs[first + i] = channel_regs
+        self.misses += len(changed)
+        self.transactions_saved += len(changed) - len(blocks)
+
+    def invalidate(self, channel=None):
+        """Oublie la dernière valeur écrite (prochaine écriture forcée)"""
+        with self._lock:
+            if channel is None:
+                self.last_regs = [None] * 16
+            else:
+                self.last_regs[channel] = None
+
+    def cache_stats(self):
+        """Compteurs du cache : {hits, misses, hit_rate}"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'block_writes': self.block_writes,
+            'transactions_saved': self.transactions_saved,
+        }
+
+    def reset_cache_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.block_writes = 0
+        self.transactions_saved = 0
+
+    def deinit(self):
+        self.invalidate()
+        self.device.deinit()
+
+    def __getattr__(self, name):
+        # Statistiques du périphérique simulé (latency_stats, i2c_writes...)
+        return getattr(self.device, name)
+
+
+def pca9685(address=0x5f, busnum=1):
+    """
+    Retourne le PCA9685 à l'adresse donnée (une seule instance par adresse)
+
+    tache3 (servos) et tache4/tache6 (moteurs) partagent ainsi le même objet,
+    et le même cache d'écriture, pour la puce 0x5f du Robot HAT.
+    """
+    if address not in _pca9685_devices:
+        if _use_real('adafruit_pca9685', f"PCA9685 0x{address:02x}"):
+            device = RealPCA9685(address)
+        else:
+            device = SimPCA9685(address)
+        _pca9685_devices[address] = CachedPCA9685(device)
+    return _pca9685_devices[address]
+
+
+FAST_DECAY = 0
+SLOW_DECAY = 1
+
+
+class SimDCMotor:
+    """Moteur DC simulé (même pilotage des deux canaux que adafruit_motor.DCMotor)"""
+
+    def __init__(self, positive_pwm, negative_pwm):
+        self._positive = positive_pwm
+        self._negative = negative_pwm
+        self._throttle = None
+        self.decay_mode = FAST_DECAY
+
+    @property
+    def throttle(self):
+        return self._throttle
+
+    @throttle.setter
+    def throttle(self, value):
+        if value is not None and (value > 1.0 or value < -1.0):
+            raise ValueError("Throttle must be None or between -1.0 and +1.0")
+        self._throttle = value
+        if value is None:
+            self._positive.duty_cycle = 0
+            self._negative.duty_cycle = 0
+        elif value == 0:
+            self._positive.duty_cycle = 0xFFFF
+            self._negative.duty_cycle = 0xFFFF
+        else:
+            duty_cycle = int(0xFFFF * abs(value))
+            if self.decay_mode == SLOW_DECAY:
+                if value < 0:
+                    self._positive.duty_cycle = 0xFFFF - duty_cycle
+                    self._negative.duty_cycle = 0xFFFF
+                else:
+                    self._positive.duty_cycle = 0xFFFF
+                    self._negative.duty_cycle = 0xFFFF - duty_cycle
+            elif value < 0:
+                self._positive.duty_cycle = 0
+                self._negative.duty_cycle = duty_cycle
+            else:
+                self._positive.duty_cycle = duty_cycle
+                self._negative.duty_cycle = 0
+
+
+def dc_motor(pca, in1, in2, slow_decay=True):
+    """
+    Moteur DC sur deux canaux du PCA9685
+
+    Args:
+        pca: PCA9685 retourné par pca9685()
+        in1 (int): Canal du pôle positif
+        in2 (int): Canal du pôle négatif
+        slow_decay (bool): Mode de décroissance lente (comme motor.py d'Adeept)
+    """
+    try:
+        from adafruit_motor import motor
+        dc = motor.DCMotor(pca.channels[in1], pca.channels[in2])
+        dc.decay_mode = motor.SLOW_DECAY if slow_decay else motor.FAST_DECAY
+    except ImportError:
+        if isinstance(pca, RealPCA9685):
+            raise
+        dc = SimDCMotor(pca.channels[in1], pca.channels[in2])
+        dc.decay_mode = SLOW_DECAY if slow_decay else FAST_DECAY
+    return dc
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+#                                ADC (ADS7830)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class RealADS7830:
+    """ADS7830 réel : channel(n) retourne un AnalogIn (valeur 16 bits)"""
+
+    def __init__(self, address=0x48):
+        import adafruit_ads7830.ads7830 as ADC
+        from adafruit_ads7830.analog_in import AnalogIn
+        self.address = address
+        self._adc = ADC.ADS7830(_i2c_bus(), address)
+        self._channels = [AnalogIn(self._adc, i) for i in range(8)]
+
+    def channel(self, index):
+        return self._channels[index]
+
+    def read(self, index):
+        return self._channels[index].value
+
+
+class SimAnalogIn:
+    """Entrée analogique simulée (interface adafruit_ads7830 AnalogIn)"""
+
+    def __init__(self, adc, index):
+        self._adc = adc
+        self._index = index
+
+    @property
+    def value(self):
+        return self._adc.read(self._index)
+
+
+class SimADS7830(CallRecorder):
+    """ADS7830 simulé : valeurs imposées par set_value() ou par une fonction source"""
+
+    def __init__(self, address=0x48):
+        super().__init__()
+        self.address = address
+        self.values = [0] * 8
+        self.sources = [None] * 8
+        self._channels = [SimAnalogIn(self, i) for i in range(8)]
+
+    def channel(self, index):
+        return self._channels[index]
+
+    def set_value(self, index, value):
+        """
+        Impose la valeur 16 bits d'un canal
+
+        Comme AnalogIn.value d'adafruit_ads7830, la mesure 8 bits est placée
+        dans l'octet de poids fort (0x0000-0xFF00) : la valeur est bornée à
+        0-0xFFFF puis l'octet de poids faible, absent du convertisseur, est
+        mis à zéro.
+        """
+        if not math.isfinite(value):
+            raise ValueError(f"Valeur ADC non finie: {value}")
+        self.values[index] = max(0, min(0xFFFF, int(value))) & 0xFF00
+
+    def read(self, index):
+        start = time.perf_counter()
+        source = self.sources[index]
+        if source is not None:
+            self.set_value(index, source())
+        value = self.values[index]
+        self._record('read', start)
+        return value
+
+
+def ads7830(address=0x48):
+    """Convertisseur analogique/numérique 8 canaux du Robot HAT"""
+    if _use_real('adafruit_ads7830', f"ADS7830 0x{address:02x}"):
+        return RealADS7830(address)
+    return SimADS7830(address)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+#                             CAPTEUR À ULTRASONS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+SPEED_OF_SOUND = 343.0  # m/s
+
+
+class SimDistanceSensor(CallRecorder):
+    """
+    Capteur à ultrasons simulé (interface gpiozero.DistanceSensor)
+
+    La distance (en mètres) est imposée par set_distance() ou par une fonction
+    source. Avec simulate_echo=True, chaque lecture attend la durée aller-retour
+    de l'écho comme le vrai capteur.
+    """
+
+    def __init__(self, echo=None, trigger=None, max_distance=1.0, simulate_echo=False):
+        super().__init__()
+        self.echo = echo
+        self.trigger = trigger
+        self.max_distance = max_distance
+        self.simulate_echo = simulate_echo
+        self.source = None
+        self._distance = max_distance
+
+    def set_distance(self, distance):
+        self._distance = distance
+
+    @property
+    def distance(self):
+        start = time.perf_counter()
+        distance = self.source() if self.source is not None else self._distance
+        distance = max(0.0, min(self.max_distance, distance))
+        if self.simulate_echo:
+            time.sleep(2 * distance / SPEED_OF_SOUND)
+        self._record('distance', start)
+        return distance
+
+    def close(self):
+        pass
+
+
+def distance_sensor(echo, trigger, max_distance=1.0):
+    """Capteur à ultrasons HC-SR04 (distance en mètres)"""
+    if _use_real('gpiozero', "capteur à ultrasons"):
+        from gpiozero import DistanceSensor
+        return DistanceSensor(echo=echo, trigger=trigger, max_distance=max_distance)
+    return SimDistanceSensor(echo=echo, trigger=trigger, max_distance=max_distance)
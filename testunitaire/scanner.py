@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+MasterCamp Robotique - Balayage ultrason et carte polaire des obstacles
+
+Le capteur à ultrasons est porté par le servo de tête (tache3, canal 1). Le
+balayage va-et-vient sur une plage d'angles et remplit une carte polaire :
+une case par angle, avec la dernière distance mesurée et son horodatage.
+
+Pipeline : dès que l'écho d'une case est reçu, le servo part vers la case
+suivante ; l'attente avant la mesure suivante est le maximum entre le temps
+de déplacement du servo et l'intervalle minimal entre deux mesures HC-SR04,
+au lieu de « angle, sleep, checkdist » en série.
+
+Exemple:
+    scanner = SweepScanner(servos, tache5.sensor)
+    scanner.start()
+    angles, distances, ages = scanner.snapshot()
+"""
+
+import math
+import threading
+import time
+
+import numpy
+
+from tache5 import MIN_INTERVAL
+
+HEAD_CHANNEL = 1   # Servo tête gauche/droite qui porte le capteur
+
+
+class SweepScanner:
+    """Balayage du capteur à ultrasons et carte polaire des distances"""
+
+    def __init__(self, servos, sensor, channel=HEAD_CHANNEL, min_angle=-60, max_angle=60, step=10,
+                 settle=0.01):
+        """
+        Args:
+            servos (ServoController): Contrôleur des servos (tache3)
+            sensor: Capteur à ultrasons (interface gpiozero.DistanceSensor)
+            channel (int): Canal du servo qui porte le capteur
+            min_angle, max_angle (float): Plage de balayage (degrés logiques)
+            step (float): Pas angulaire entre deux cases (degrés)
+            settle (float): Temps de stabilisation après un déplacement (s)
+        """
+        config = servos.servo_configs.get(channel)
+        if config is None:
+            raise ValueError(f"Canal {channel} non configuré")
+        if not step > 0 or not min_angle < max_angle:
+            raise ValueError(f"Plage de balayage invalide: {min_angle}° → {max_angle}° par pas de {step}°")
+        # Hors limites, set_angle refuserait la case : sa mesure serait rangée au mauvais angle
+        if min_angle < config["min_angle"] or max_angle > config["max_angle"]:
+            raise ValueError(f"Balayage {min_angle}° → {max_angle}° hors des limites de {config['name']} "
+                             f"({config['min_angle']}° → {config['max_angle']}°)")
+        self.servos = servos
+        self.sensor = sensor
+        self.channel = channel
+        self.settle = settle
+        self.speed = config["max_speed"]   # °/s
+
+        self.angles = numpy.arange(min_angle, max_angle + step / 2, step, dtype=float)
+        self.distances = numpy.full(len(self.angles), numpy.nan)
+        self.timestamps = numpy.full(len(self.angles), numpy.nan)
+        self._lock = threading.Lock()
+        self._cursor = 0
+        self._stop_event = threading.Event()
+        self._thread = None
+
+        # Statistiques
+        self.measurements = 0
+        self.scans = 0
+        self._started_at = None
+
+    def _order(self):
+        """Indices des cases en va-et-vient (pas de retour à vide)"""
+        forward = list(range(len(self.angles)))
+        return forward + forward[-2:0:-1]
+
+    def _travel_time(self, from_angle, to_angle):
+        return abs(to_angle - from_angle) / self.speed + self.settle
+
+    def sweep(self, passes=1):
+        """
+        Effectue des balayages complets (bloquant) et met à jour la carte
+
+        Le balayage reprend là où le précédent s'est arrêté.
+
+        Args:
+            passes (int): Nombre d'allers (ou de retours) à effectuer
+        """
+        order = self._order()
+        last = len(self.angles) - 1
+        count = passes * last + (1 if self.measurements == 0 else 0)
+        position = self.servos.current_positions.get(self.channel, 0)
+        angle = self.angles[order[self._cursor]]
+        self.servos.set_angle(self.channel, angle, verbose=False)
+        ready = time.monotonic() + self._travel_time(position, angle)
+        last_ping = -math.inf
+
+        for _ in range(count):
+            if self._stop_event.is_set():
+                break
+            index = order[self._cursor]
+            angle = self.angles[index]
+
+            # Attente : servo arrivé ET intervalle minimal depuis la dernière mesure
+            delay = max(ready, last_ping + MIN_INTERVAL) - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            last_ping = time.monotonic()
+            distance = self.sensor.distance
+            now = time.monotonic()
+
+            # Le servo repart aussitôt l'écho reçu, pendant qu'on range la mesure
+            self._cursor = (self._cursor + 1) % len(order)
+            next_angle = self.angles[order[self._cursor]]
+            self.servos.set_angle(self.channel, next_angle, verbose=False)
+            ready = now + self._travel_time(angle, next_angle)
+
+            with self._lock:
+                self.distances[index] = distance
+                self.timestamps[index] = now
+            self.measurements += 1
+            if index in (0, last) and self.measurements > 1:
+                self.scans += 1
+
+    def snapshot(self, now=None):
+        """
+        Copie de la carte polaire
+
+        Returns:
+            tuple: (angles °, distances m (nan si jamais mesurée), âges s (inf si jamais mesurée))
+        """
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            distances = self.distances.copy()
+            ages = now - self.timestamps
+        ages[numpy.isnan(ages)] = numpy.inf
+        return self.angles.copy(), distances, ages
+
+    def occupancy(self, max_distance=0.5, max_age=1.0):
+        """Cases occupées : obstacle à moins de max_distance, mesure de moins de max_age"""
+        _, distances, ages = self.snapshot()
+        with numpy.errstate(invalid='ignore'):
+            return (distances < max_distance) & (ages < max_age)
+
+    def closest(self, max_age=1.0):
+        """(angle, distance) de l'obstacle le plus proche parmi les mesures récentes, ou None"""
+        angles, distances, ages = self.snapshot()
+        valid = ~numpy.isnan(distances) & (ages < max_age)
+        if not valid.any():
+            return None
+        i = numpy.flatnonzero(valid)[numpy.argmin(distances[valid])]
+        return float(angles[i]), float(distances[i])
+
+    def scans_per_second(self):
+        """Balayages complets (aller ou retour) par seconde depuis start()"""
+        elapsed = time.monotonic() - self._started_at if self._started_at else 0.0
+        return self.scans / elapsed if elapsed > 0 else 0.0
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            self.sweep()
+
+    def start(self):
+        """Démarre le balayage continu en tâche de fond"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="sweep-scanner", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Arrête le balayage (le servo reste à sa position)"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
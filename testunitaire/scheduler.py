@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+MasterCamp Robotique - Ordonnanceur temps réel coopératif
+
+Fait tourner tous les sous-systèmes du robot (capteurs, suivi de ligne,
+rampes, trames LED...) dans un seul thread, au lieu d'un thread et d'une
+boucle « while True: ...; sleep(x) » par module :
+- tâches périodiques à fréquence fixe, échéances absolues (pas de dérive)
+- priorités : quand plusieurs tâches sont dues, la plus prioritaire passe
+  d'abord (pas de préemption : une tâche doit rendre la main rapidement)
+- dépassements : durée d'exécution au-delà du budget, échéances sautées
+- statistiques par tâche : temps d'exécution, gigue de démarrage
+
+Exemple:
+    scheduler = Scheduler()
+    scheduler.add('line', lambda now: follower.step(0.01, now), rate=100, priority=10)
+    scheduler.add('adc', sampler.scan, rate=50, priority=3)
+    scheduler.start()
+"""
+
+import sys
+import threading
+import time
+from collections import deque
+
+import numpy
+
+
+class PeriodicTask:
+    """Tâche périodique et ses statistiques d'exécution"""
+
+    def __init__(self, name, func, period, priority=0, budget=None, phase=0.0, history=1024):
+        """
+        Args:
+            name (str): Nom de la tâche
+            func (callable): func(now), now = échéance (time.monotonic) de l'activation
+            period (float): Période (s)
+            priority (int): Priorité (plus grand = plus urgent)
+            budget (float): Durée d'exécution maximale attendue (s), la période par défaut
+            phase (float): Décalage de la première activation (s)
+            history (int): Nombre de mesures conservées pour les percentiles
+        """
+        self.name = name
+        self.func = func
+        self.period = period
+        self.priority = priority
+        self.budget = budget if budget is not None else period
+        self.phase = phase
+        self.deadline = None
+
+        self.runs = 0
+        self.overruns = 0
+        self.skipped = 0
+        self.exec_total = 0.0
+        self.exec_max = 0.0
+        self.jitter_total = 0.0
+        self.jitter_max = 0.0
+        self.exec_history = deque(maxlen=history)
+        self.jitter_history = deque(maxlen=history)
+
+    def record(self, jitter, elapsed):
+        self.runs += 1
+        self.exec_total += elapsed
+        self.exec_max = max(self.exec_max, elapsed)
+        self.jitter_total += jitter
+        self.jitter_max = max(self.jitter_max, jitter)
+        self.exec_history.append(elapsed)
+        self.jitter_history.append(jitter)
+        if elapsed > self.budget:
+            self.overruns += 1
+
+    def stats(self):
+        """
+        Returns:
+            dict: rate, runs, overruns, skipped, exec_us (moy, p99, max), jitter_us (moy, p99, max)
+        """
+        def summary(total, history, maximum):
+            if not self.runs:
+                return {'avg': 0.0, 'p99': 0.0, 'max': 0.0}
+            return {'avg': total / self.runs * 1e6,
+                    'p99': float(numpy.percentile(history, 99)) * 1e6,
+                    'max': maximum * 1e6}
+        return {
+            'rate': 1.0 / self.period,
+            'priority': self.priority,
+            'runs': self.runs,
+            'overruns': self.overruns,
+            'skipped': self.skipped,
+            'exec_us': summary(self.exec_total, self.exec_history, self.exec_max),
+            'jitter_us': summary(self.jitter_total, self.jitter_history, self.jitter_max),
+        }
+
+
+class Scheduler:
+    """
+    Ordonnanceur coopératif à échéances fixes
+
+    Une activation en retard démarre dès que possible (la gigue est mesurée) ;
+    si une ou plusieurs périodes entières sont déjà dépassées, elles sont
+    sautées et comptées plutôt que rattrapées en rafale.
+    """
+
+    def __init__(self, spin=0.0002, clock=time.monotonic):
+        """
+        Args:
+            spin (float): Attente active avant chaque échéance (s), réduit la gigue du réveil
+            clock: Horloge monotone (s)
+        """
+        self.spin = spin
+        self.clock = clock
+        self.tasks = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self.errors = 0
+        self.idle_time = 0.0
+        self._started_at = None
+        self._stopped_at = None
+
+    def add(self, name, func, rate=None, period=None, priority=0, budget=None, phase=0.0):
+        """
+        Ajoute (ou remplace) une tâche périodique
+
+        Args:
+            rate (float): Fréquence (Hz), ou period (s)
+            Voir PeriodicTask pour les autres paramètres
+
+        Returns:
+            PeriodicTask: La tâche créée
+        """
+        if period is None:
+            if not rate:
+                raise ValueError("rate ou period requis")
+            period = 1.0 / rate
+        task = PeriodicTask(name, func, period, priority, budget, phase)
+        with self._lock:
+            if self._started_at is not None:
+                task.deadline = self.clock() + phase
+            self.tasks[name] = task
+        self._wake.set()
+        return task
+
+    def remove(self, name):
+        """Retire une tâche"""
+        with self._lock:
+            self.tasks.pop(name, None)
+
+    def _next_task(self, now):
+        """
+        Tâche due la plus prioritaire (puis la plus en retard), ou la prochaine échéance
+
+        Sans préemption, une tâche lente lancée juste avant l'échéance d'une
+        tâche plus prioritaire la retarderait de toute sa durée : si une tâche
+        plus prioritaire tombe avant la fin estimée (durée moyenne) de la tâche
+        due, on attend celle-ci.
+        """
+        best = None
+        earliest = None
+        with self._lock:
+            tasks = list(self.tasks.values())
+        for task in tasks:
+            if task.deadline <= now:
+                if best is None or (task.priority, -task.deadline) > (best.priority, -best.deadline):
+                    best = task
+            elif earliest is None or task.deadline < earliest:
+                earliest = task.deadline
+        if best is not None and best.runs:
+            finish = now + best.exec_total / best.runs
+            for task in tasks:
+                if task.priority > best.priority and now < task.deadline < finish:
+                    return None, task.deadline
+        return best, earliest
+
+    def run_once(self, now=None):
+        """
+        Exécute la tâche due la plus prioritaire
+
+        Returns:
+            float: Prochaine échéance si aucune tâche n'était due, sinon None
+        """
+        if now is None:
+            now = self.clock()
+        task, earliest = self._next_task(now)
+        if task is None:
+            return earliest
+
+        jitter = self.clock() - task.deadline
+        start = time.perf_counter()
+        try:
+            task.func(task.deadline)
+        except Exception as e:
+            self.errors += 1
+            print(f"❌ Tâche {task.name}: {e}")
+        elapsed = time.perf_counter() - start
+        task.record(jitter, elapsed)
+
+        task.deadline += task.period
+        late = self.clock() - task.deadline
+        if late >= task.period:
+            # Périodes entières déjà dépassées : sautées
+            missed = int(late / task.period)
+            task.skipped += missed
+            task.deadline += missed * task.period
+        return None
+
+    def _wait_until(self, deadline):
+        """Attente jusqu'à l'échéance (réveil anticipé si une tâche est ajoutée)"""
+        start = self.clock()
+        delay = deadline - start - self.spin
+        if delay > 0:
+            self._wake.wait(delay)
+            self._wake.clear()
+        while self.clock() < deadline and not self._wake.is_set() and not self._stop_event.is_set():
+            pass
+        self.idle_time += self.clock() - start
+
+    def run(self, duration=None):
+        """
+        Boucle principale dans le thread appelant (jusqu'à stop() ou duration secondes)
+        """
+        if self._thread is not threading.current_thread():
+            self._stop_event.clear()
+        now = self.clock()
+        with self._lock:
+            for task in self.tasks.values():
+                task.deadline = now + task.phase
+        self._started_at = now
+        self._stopped_at = None
+        end = now + duration if duration is not None else None
+        try:
+            while not self._stop_event.is_set():
+                now = self.clock()
+                if end is not None and now >= end:
+                    break
+                earliest = self.run_once(now)
+                if earliest is not None or not self.tasks:
+                    if earliest is None:
+                        earliest = now + 0.1
+                    self._wait_until(earliest if end is None else min(earliest, end))
+        finally:
+            self._stopped_at = self.clock()
+
+    def start(self):
+        """Démarre l'ordonnanceur sur un thread dédié"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self.run, name="scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Arrête l'ordonnanceur (la tâche en cours se termine ; utilisable depuis une tâche)"""
+        self._stop_event.set()
+        self._wake.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+            self._thread = None
+
+    def stats(self):
+        """Statistiques par tâche, et charge globale"""
+        end = self._stopped_at or self.clock()
+        elapsed = end - self._started_at if self._started_at is not None else 0.0
+        return {
+            'elapsed': elapsed,
+            'load': 1.0 - self.idle_time / elapsed if elapsed > 0 else 0.0,
+            'errors': self.errors,
+            'tasks': {name: task.stats() for name, task in self.tasks.items()},
+        }
+
+    def print_stats(self):
+        s = self.stats()
+        print(f"📊 Ordonnanceur : {s['elapsed']:.1f} s, charge {s['load'] * 100:.1f}%, {s['errors']} erreur(s)")
+        for name, t in sorted(s['tasks'].items(), key=lambda item: -item[1]['priority']):
+            achieved = t['runs'] / s['elapsed'] if s['elapsed'] > 0 else 0.0
+            print(f"   {name:<10} P{t['priority']:<3} {achieved:6.1f}/{t['rate']:.0f} Hz | "
+                  f"exec {t['exec_us']['avg']:7.1f} µs moy, {t['exec_us']['max']:8.1f} max | "
+                  f"gigue {t['jitter_us']['avg']:7.1f} µs moy, {t['jitter_us']['p99']:8.1f} p99 | "
+                  f"dépassements {t['overruns']} | sautées {t['skipped']}")
+
+
+def build_robot(scheduler):
+    """
+    Enregistre les sous-systèmes du robot dans l'ordonnanceur (un seul processus)
+
+    La direction et la propulsion appartiennent au suivi de ligne : on réutilise
+    son planificateur de servos et son moteur plutôt que d'en créer des doubles
+    qui se disputeraient les mêmes canaux du PCA9685.
+
+    Returns:
+        dict: Objets créés (follower, ranging, sampler, brightness, planner, engine, motor)
+    """
+    from animations import AnimationEngine, Breathe
+    from tache2 import AutoBrightness, WS2812Controller
+    from tache5 import MIN_INTERVAL, RangingService
+    from tache6 import PIDLineFollower
+    from tache8 import LIGHT_CHANNEL, ADCSampler
+
+    follower = PIDLineFollower()
+    ranging = RangingService()
+    sampler = ADCSampler(channels=range(8), rate=50)
+    leds = WS2812Controller()
+    engine = AnimationEngine(leds, fps=30)
+    engine.play(Breathe('C', (0, 0, 255)))
+    brightness = AutoBrightness(sampler, [leds], channel=LIGHT_CHANNEL)
+    planner = follower.servos.planner
+
+    line_period = 1.0 / follower.rate
+    scheduler.add('line', lambda now: follower.step(line_period, now), period=line_period, priority=10)
+    scheduler.add('ranging', ranging.update, period=MIN_INTERVAL, priority=8)
+    scheduler.add('servos', lambda now: planner.step(1.0 / planner.rate), rate=planner.rate, priority=6)
+    scheduler.add('adc', sampler.scan, rate=sampler.rate, priority=4)
+    scheduler.add('leds', engine.render_frame, rate=engine.fps, priority=2)
+    scheduler.add('brightness', brightness.update, rate=brightness.rate, priority=1)
+    return {'follower': follower, 'ranging': ranging, 'sampler': sampler, 'brightness': brightness,
+            'planner': planner, 'engine': engine, 'motor': follower.motor}
+
+
+def main():
+    """python3 scheduler.py [durée s] : tout le robot dans un seul processus"""
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else None
+    scheduler = Scheduler()
+    robot = build_robot(scheduler)
+    print("🚀 Robot démarré sur l'ordonnanceur (Ctrl+C pour arrêter)")
+    try:
+        scheduler.run(duration)
+    except KeyboardInterrupt:
+        print("\n⏹️  Arrêt")
+    finally:
+        robot['follower'].stop()
+        scheduler.print_stats()
+
+
+if __name__ == "__main__":
+    main()
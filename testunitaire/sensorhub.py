@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+MasterCamp Robotique - Concentrateur de capteurs multiprocessus
+
+Un processus dédié possède les pilotes des capteurs (ultrason de tache5, IR
+de tache6, ADC de tache8), les échantillonne avec l'ordonnanceur coopératif
+et publie les dernières valeurs horodatées dans un bloc de mémoire partagée
+(multiprocessing.shared_memory) à disposition fixe. La boucle moteur, dans un
+autre processus, n'est plus ralentie par le GIL des lectures capteurs.
+
+Cohérence par seqlock : l'écrivain rend le compteur `seq` impair, copie
+l'enregistrement, puis le rend pair. Le lecteur copie l'enregistrement
+(≈100 octets, dans un tampon préalloué) entre deux lectures de `seq` et
+recommence si le compteur a changé ou était impair. Aucun verrou : un
+lecteur ne bloque jamais le concentrateur.
+
+Exemple:
+    hub = SensorHub()
+    hub.start()
+    client = SensorHubClient()
+    record = client.read()
+    print(record['distance'], record['ir'], client.staleness())
+    hub.stop()
+"""
+
+import multiprocessing
+import sys
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy
+
+DEFAULT_NAME = 'jcvd_sensors'
+
+# Disposition de l'enregistrement partagé (horodatages time.monotonic, commun aux processus)
+RECORD = numpy.dtype([
+    ('seq', '<u8'),               # Seqlock : impair pendant une écriture
+    ('publishes', '<u8'),         # Nombre de publications
+    ('hub_time', '<f8'),          # Dernière publication
+    ('distance', '<f8'),          # Ultrason filtré (m), nan avant la première mesure
+    ('closing', '<f8'),           # Vitesse de rapprochement (m/s)
+    ('distance_raw', '<f8'),      # Mesure brute (m)
+    ('distance_time', '<f8'),
+    ('ir', 'u1', (3,)),           # Capteurs IR gauche, milieu, droite
+    ('ir_time', '<f8'),
+    ('adc', '<u2', (8,)),         # Canaux ADS7830 (16 bits)
+    ('adc_time', '<f8'),
+], align=True)
+
+SECTIONS = ('distance', 'ir', 'adc')
+
+
+def _attach(name):
+    """
+    Ouvre un bloc existant sans l'enregistrer auprès du resource_tracker
+
+    Avant Python 3.13, tout processus qui ouvre le bloc l'enregistre et le
+    détruit à sa sortie, même s'il n'en est pas le créateur.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args, **kwargs: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+class SeqlockWriter:
+    """Publication d'un enregistrement RECORD dans un tampon partagé (un seul écrivain)"""
+
+    def __init__(self, buffer):
+        """
+        Args:
+            buffer (memoryview): Tampon partagé d'au moins RECORD.itemsize octets
+        """
+        self.record = numpy.zeros(1, dtype=RECORD)
+        for section in SECTIONS:
+            self.record[section + '_time'] = numpy.nan
+        self.record['distance'] = numpy.nan
+        self._seq = numpy.ndarray((1,), dtype='<u8', buffer=buffer)
+        # Tout sauf seq, copié d'un bloc
+        self._dst = numpy.ndarray((RECORD.itemsize - 8,), dtype=numpy.uint8, buffer=buffer, offset=8)
+        self._src = self.record.view(numpy.uint8)[8:]
+        self.publish()
+
+    def publish(self, now=None):
+        """Publie l'enregistrement local (self.record)"""
+        self.record['publishes'] += 1
+        self.record['hub_time'] = time.monotonic() if now is None else now
+        self._seq[0] += 1          # impair : écriture en cours
+        self._dst[:] = self._src
+        self._seq[0] += 1          # pair : enregistrement cohérent
+
+
+class SensorHubClient:
+    """
+    Lecture sans verrou de l'enregistrement publié par le concentrateur
+
+    read() retourne une vue sur un tampon local préalloué : le read() suivant
+    (ou distance(), ir(), adc(), staleness()) l'écrase. Copier l'enregistrement
+    (record.copy()) pour le conserver.
+    """
+
+    def __init__(self, name=DEFAULT_NAME, timeout=0.1):
+        """
+        Args:
+            name (str): Nom du bloc de mémoire partagée
+            timeout (float): Durée max d'une lecture (s) : au-delà, le concentrateur
+                             est considéré comme arrêté en pleine écriture
+        """
+        self.shm = _attach(name)
+        buffer = self.shm.buf
+        self._seq = numpy.ndarray((1,), dtype='<u8', buffer=buffer)
+        self._src = numpy.ndarray((RECORD.itemsize,), dtype=numpy.uint8, buffer=buffer)
+        self.snapshot = numpy.zeros(1, dtype=RECORD)
+        self._dst = self.snapshot.view(numpy.uint8)
+        self.timeout = timeout
+        self.reads = 0
+        self.retries = 0
+
+    def read(self):
+        """
+        Copie cohérente du dernier enregistrement
+
+        Returns:
+            numpy.void: Enregistrement RECORD (champs : record['distance'], record['ir'], ...),
+                        vue écrasée par la lecture suivante
+
+        Raises:
+            TimeoutError: Aucune copie cohérente pendant timeout secondes (concentrateur
+                          tué pendant une écriture : seq reste impair)
+        """
+        seq = self._seq
+        deadline = None
+        while True:
+            before = int(seq[0])
+            if not before & 1:
+                self._dst[:] = self._src
+                if int(seq[0]) == before:
+                    self.reads += 1
+                    return self.snapshot[0]
+            self.retries += 1
+            # Horloge lue seulement après un échec : le chemin sans conflit reste inchangé
+            now = time.monotonic()
+            if deadline is None:
+                deadline = now + self.timeout
+            elif now > deadline:
+                raise TimeoutError(f"Enregistrement '{self.shm.name}' incohérent depuis "
+                                   f"{self.timeout * 1000:.0f} ms (seq {before})")
+            if before & 1:
+                # Écriture en cours dans l'autre processus : on lui laisse le CPU
+                time.sleep(0)
+
+    def distance(self):
+        """(distance m, rapprochement m/s, horodatage), distance nan avant la première mesure"""
+        record = self.read()
+        return float(record['distance']), float(record['closing']), float(record['distance_time'])
+
+    def ir(self):
+        """((gauche, milieu, droite), horodatage)"""
+        record = self.read()
+        return tuple(int(v) for v in record['ir']), float(record['ir_time'])
+
+    def adc(self, channel):
+        """(valeur 16 bits, horodatage) d'un canal ADC"""
+        record = self.read()
+        return int(record['adc'][channel]), float(record['adc_time'])
+
+    def staleness(self, now=None):
+        """Âge (s) de la dernière mesure de chaque section (inf si jamais mesurée)"""
+        record = self.read()
+        if now is None:
+            now = time.monotonic()
+        ages = {}
+        for section in SECTIONS:
+            t = float(record[section + '_time'])
+            ages[section] = now - t if t == t else float('inf')
+        return ages
+
+    def close(self):
+        """Détache le bloc (sans le détruire)"""
+        self.snapshot = None
+        self._seq = self._src = self._dst = None
+        self.shm.close()
+
+
+def _hub_main(name, stop_event, ir_rate, adc_rate, ranging_interval):
+    """Processus concentrateur : pilotes, ordonnanceur, publication"""
+    import hal
+    from scheduler import Scheduler
+    from tache5 import RangingService
+    from tache6 import LEFT_PIN, MIDDLE_PIN, RIGHT_PIN
+    from tache8 import ADCSampler
+
+    shm = _attach(name)
+    writer = SeqlockWriter(shm.buf)
+    record = writer.record[0]
+    ranging = RangingService(interval=ranging_interval)
+    sensors = (hal.digital_input(LEFT_PIN), hal.digital_input(MIDDLE_PIN), hal.digital_input(RIGHT_PIN))
+    sampler = ADCSampler(rate=adc_rate, capacity=2)
+
+    def read_distance(now):
+        ranging.update(now)
+        distance, closing, _, raw = ranging.latest()
+        record['distance'], record['closing'], record['distance_raw'] = distance, closing, raw
+        record['distance_time'] = now
+        writer.publish(now)
+
+    def read_ir(now):
+        record['ir'] = [sensor.value for sensor in sensors]
+        record['ir_time'] = now
+        writer.publish(now)
+
+    def read_adc(now):
+        sampler.scan(now)
+        record['adc'] = sampler.values[:, (sampler.count - 1) % sampler.capacity]
+        record['adc_time'] = now
+        writer.publish(now)
+
+    # Pas d'attente active : le concentrateur laisse le CPU à la boucle moteur
+    scheduler = Scheduler(spin=0.0)
+    scheduler.add('ir', read_ir, rate=ir_rate, priority=10)
+    scheduler.add('ranging', read_distance, period=ranging.interval, priority=8)
+    scheduler.add('adc', read_adc, rate=adc_rate, priority=5)
+    scheduler.add('control', lambda now: stop_event.is_set() and scheduler.stop(), rate=20)
+    try:
+        scheduler.run()
+    finally:
+        writer = record = None
+        shm.close()
+
+
+class SensorHub:
+    """Démarre et arrête le processus concentrateur et son bloc de mémoire partagée"""
+
+    def __init__(self, name=DEFAULT_NAME, ir_rate=500, adc_rate=50, ranging_interval=0.06):
+        """
+        Args:
+            name (str): Nom du bloc de mémoire partagée
+            ir_rate (float): Fréquence de lecture des capteurs IR (Hz)
+            adc_rate (float): Fréquence de balayage de l'ADC (Hz)
+            ranging_interval (float): Période des mesures ultrason (s, au moins tache5.MIN_INTERVAL)
+        """
+        self.name = name
+        self.ir_rate = ir_rate
+        self.adc_rate = adc_rate
+        self.ranging_interval = ranging_interval
+        # spawn : le processus fils ouvre ses propres pilotes (pas d'état GPIO/I2C hérité)
+        self._context = multiprocessing.get_context('spawn')
+        self._stop_event = self._context.Event()
+        self.shm = None
+        self.process = None
+
+    def start(self, timeout=10.0):
+        """Crée le bloc partagé, lance le processus et attend sa première publication"""
+        if self.process is not None and self.process.is_alive():
+            return
+        self.shm = shared_memory.SharedMemory(name=self.name, create=True, size=RECORD.itemsize)
+        self.shm.buf[:RECORD.itemsize] = bytes(RECORD.itemsize)
+        self._stop_event.clear()
+        self.process = self._context.Process(
+            target=_hub_main, name="sensor-hub", daemon=True,
+            args=(self.name, self._stop_event, self.ir_rate, self.adc_rate, self.ranging_interval))
+        self.process.start()
+
+        seq = numpy.ndarray((1,), dtype='<u8', buffer=self.shm.buf)
+        deadline = time.monotonic() + timeout
+        while int(seq[0]) == 0 and self.process.is_alive() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        published = int(seq[0]) > 0
+        del seq   # plus aucune vue sur le bloc : il pourra être fermé
+        if not published:
+            self.stop()
+            raise RuntimeError("Le concentrateur de capteurs n'a rien publié")
+
+    def client(self, timeout=0.1):
+        """Client de lecture dans le processus courant"""
+        return SensorHubClient(self.name, timeout)
+
+    def stop(self):
+        """Arrête le processus et détruit le bloc partagé"""
+        self._stop_event.set()
+        if self.process is not None:
+            self.process.join(5.0)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join()
+            self.process = None
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+
+if __name__ == "__main__":
+    hub = SensorHub()
+    hub.start()
+    client = hub.client()
+    print("📡 Concentrateur de capteurs démarré (Ctrl+C pour arrêter)")
+    try:
+        while True:
+            time.sleep(0.5)
+            record = client.read()
+            ages = client.staleness()
+            print(f"Distance {record['distance'] * 100:6.1f} cm | IR {tuple(record['ir'])} | "
+                  f"lumière {record['adc'][1]} | âges " +
+                  ", ".join(f"{section} {age * 1000:.1f} ms" for section, age in ages.items()))
+    except KeyboardInterrupt:
+        print("\n⏹️  Arrêt")
+    finally:
+        client.close()
+        hub.stop()
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+MasterCamp Robotique - Simulateur cinématique déterministe du robot
+
+Permet d'évaluer hors robot les boucles de contrôle (suivi de ligne de tache6,
+rampes de tache4, direction de tache3) :
+- piste 2D en bitmap numpy (ligne noire + obstacles)
+- modèle bicyclette pour la direction, moteur avec retard du premier ordre
+- capteurs IR (gauche, milieu, droite) lus dans la bitmap à leur position de montage
+- distance ultrason par lancer de rayon dans les obstacles (checkdist de tache5)
+
+Le temps est virtuel (pas fixe) : une simulation tourne bien plus vite que le
+temps réel et deux exécutions avec les mêmes paramètres (et la même graine de
+bruit) donnent exactement le même résultat.
+
+Exemple:
+    track = Track.from_segments(OVAL_S)
+    sim = RobotSimulator(track)
+    follower = PIDLineFollower(servos=servos, motor=sim.motor, sensors=sim.ir_sensors())
+    result = sim.run(follower.step, steering=lambda: follower.angle, rate=100)
+"""
+
+import math
+import random
+import time
+
+import numpy
+
+import hal
+
+# Chicane : 30° à gauche, 60° à droite, 30° à gauche (rayon 0.5 m)
+_CHICANE = [(0.5 * math.pi / 6, 2.0), (0.5 * math.pi / 3, -2.0), (0.5 * math.pi / 6, 2.0)]
+
+# Piste de référence fermée : ovale (virages de rayon 0.5 m) avec une chicane sur
+# chaque ligne droite (segments (longueur m, courbure 1/m, >0 à gauche))
+OVAL_S = ([(0.3, 0.0)] + _CHICANE + [(0.3, 0.0), (math.pi * 0.5, 2.0)]
+          + [(0.3, 0.0)] + _CHICANE + [(0.3, 0.0), (math.pi * 0.5, 2.0)])
+
+
+class Track:
+    """
+    Piste en bitmap : line[y, x] vrai sur la ligne, obstacles[y, x] vrai sur un obstacle
+
+    La ligne médiane (centerline) sert à mesurer la progression et les tours.
+    """
+
+    def __init__(self, line, obstacles, resolution, origin, centerline):
+        """
+        Args:
+            line (numpy.ndarray): Bitmap booléenne de la ligne
+            obstacles (numpy.ndarray): Bitmap booléenne des obstacles (même taille)
+            resolution (float): Taille d'un pixel (m)
+            origin (tuple): Coordonnées (x, y) du pixel [0, 0] (m)
+            centerline (numpy.ndarray): Points (N, 2) de la ligne médiane, dans l'ordre du parcours
+        """
+        self.line = line
+        self.obstacles = obstacles
+        self.resolution = resolution
+        self.origin = origin
+        self.centerline = centerline
+        steps = numpy.hypot(*numpy.diff(centerline, axis=0).T)
+        self.progress = numpy.concatenate(([0.0], numpy.cumsum(steps)))
+        self.length = float(self.progress[-1])
+
+    @classmethod
+    def from_segments(cls, segments, line_width=0.02, resolution=0.005, margin=0.5):
+        """
+        Construit une piste à partir de segments (longueur m, courbure 1/m)
+
+        La piste démarre en (0, 0), cap vers +x.
+        """
+        points = [(0.0, 0.0)]
+        x = y = heading = 0.0
+        step = resolution / 2
+        for length, kappa in segments:
+            for _ in range(max(1, int(round(length / step)))):
+                ds = length / max(1, int(round(length / step)))
+                heading += kappa * ds
+                x += ds * math.cos(heading)
+                y += ds * math.sin(heading)
+                points.append((x, y))
+        centerline = numpy.array(points)
+
+        low = centerline.min(axis=0) - margin
+        high = centerline.max(axis=0) + margin
+        width, height = numpy.ceil((high - low) / resolution).astype(int) + 1
+        line = numpy.zeros((height, width), dtype=bool)
+
+        # Tampon circulaire du trait sur chaque point de la ligne médiane
+        radius = int(math.ceil(line_width / 2 / resolution))
+        offsets = numpy.arange(-radius, radius + 1)
+        dx, dy = numpy.meshgrid(offsets, offsets)
+        disk = (numpy.hypot(dx, dy) * resolution <= line_width / 2)
+        dx, dy = dx[disk], dy[disk]
+        pixels = numpy.round((centerline - low) / resolution).astype(int)
+        xs = numpy.clip(pixels[:, 0, None] + dx, 0, width - 1)
+        ys = numpy.clip(pixels[:, 1, None] + dy, 0, height - 1)
+        line[ys, xs] = True
+
+        return cls(line, numpy.zeros_like(line), resolution, tuple(low), centerline)
+
+    def add_obstacle(self, x, y, width, height):
+        """Ajoute un obstacle rectangulaire (coin bas-gauche x, y ; dimensions en m)"""
+        x0, y0 = self.to_pixel(x, y)
+        x1, y1 = self.to_pixel(x + width, y + height)
+        self.obstacles[max(0, y0):max(0, y1) + 1, max(0, x0):max(0, x1) + 1] = True
+
+    def to_pixel(self, x, y):
+        return (int(round((x - self.origin[0]) / self.resolution)),
+                int(round((y - self.origin[1]) / self.resolution)))
+
+    def on_line(self, x, y):
+        """Vrai si le point (x, y) est sur la ligne"""
+        px, py = self.to_pixel(x, y)
+        if 0 <= py < self.line.shape[0] and 0 <= px < self.line.shape[1]:
+            return bool(self.line[py, px])
+        return False
+
+    def raycast(self, x, y, heading, max_distance):
+        """Distance au premier obstacle (ou au bord de la piste) dans une direction"""
+        distances = numpy.arange(0.0, max_distance, self.resolution)
+        xs = numpy.round((x + distances * math.cos(heading) - self.origin[0]) / self.resolution).astype(int)
+        ys = numpy.round((y + distances * math.sin(heading) - self.origin[1]) / self.resolution).astype(int)
+        inside = (xs >= 0) & (xs < self.line.shape[1]) & (ys >= 0) & (ys < self.line.shape[0])
+        hit = ~inside
+        hit[inside] = self.obstacles[ys[inside], xs[inside]]
+        index = numpy.argmax(hit)
+        return float(distances[index]) if hit[index] else max_distance
+
+    def locate(self, x, y):
+        """Abscisse le long de la ligne médiane et distance à celle-ci (m)"""
+        d = numpy.hypot(self.centerline[:, 0] - x, self.centerline[:, 1] - y)
+        i = int(numpy.argmin(d))
+        return float(self.progress[i]), float(d[i])
+
+
+class SimIRSensor:
+    """Capteur IR de suivi de ligne simulé (interface .value de gpiozero)"""
+
+    def __init__(self, robot, forward, left):
+        self.robot = robot
+        self.forward = forward
+        self.left = left
+
+    @property
+    def value(self):
+        return self.robot.read_ir(self.forward, self.left)
+
+
+class RobotSimulator:
+    """
+    Robot simulé sur une piste (modèle bicyclette, essieu arrière comme référence)
+
+    Le throttle est lu sur un moteur simulé (self.motor, interface DCMotor) et
+    le braquage (degrés logiques, >0 à droite) sur une fonction steering().
+    """
+
+    WHEELBASE = 0.15          # m
+    MAX_SPEED = 1.0           # m/s à throttle 1
+    MOTOR_LAG = 0.1           # s (constante de temps du moteur)
+    MAX_STEER = 35            # Braquage mécanique maximal (degrés)
+    IR_MOUNTS = ((0.12, 0.018), (0.12, 0.0), (0.12, -0.018))   # (avant, gauche) en m : L, M, R
+    ULTRASONIC_MOUNT = 0.16   # m devant l'essieu arrière
+    OFF_TRACK = 0.1           # m : au-delà, le robot est sorti de la piste
+
+    def __init__(self, track, ir_noise=0.0, seed=0, motor=None, x=0.0, y=0.0, heading=0.0):
+        """
+        Args:
+            track (Track): Piste
+            ir_noise (float): Probabilité qu'une lecture IR soit inversée
+            seed (int): Graine du bruit (déterminisme)
+            motor: Moteur lu par la simulation (moteur simulé sur un PCA9685 simulé si None)
+            x, y, heading: Pose initiale (m, m, rad)
+        """
+        self.track = track
+        self.ir_noise = ir_noise
+        self.random = random.Random(seed)
+        if motor is None:
+            motor = hal.dc_motor(hal.SimPCA9685(), 15, 14)
+        self.motor = motor
+        self.x = x
+        self.y = y
+        self.heading = heading
+        self.speed = 0.0
+        self.time = 0.0
+        self.distance = 0.0
+        self._progress, _ = track.locate(x, y)
+
+    def ir_sensors(self):
+        """Capteurs IR (gauche, milieu, droite) à leurs positions de montage"""
+        return tuple(SimIRSensor(self, forward, left) for forward, left in self.IR_MOUNTS)
+
+    def read_ir(self, forward, left):
+        """Lecture IR à une position (avant, gauche) du repère robot"""
+        c, s = math.cos(self.heading), math.sin(self.heading)
+        value = self.track.on_line(self.x + forward * c - left * s, self.y + forward * s + left * c)
+        if self.ir_noise and self.random.random() < self.ir_noise:
+            value = not value
+        return int(value)
+
+    def ultrasonic_distance(self, max_distance=2.0, pan=0.0):
+        """
+        Distance (m) mesurée par le capteur à ultrasons (source pour SimDistanceSensor)
+
+        Args:
+            max_distance (float): Portée du capteur (m)
+            pan (float): Orientation du capteur par rapport au robot (degrés, >0 à droite)
+        """
+        mount = self.ULTRASONIC_MOUNT
+        return self.track.raycast(self.x + mount * math.cos(self.heading),
+                                  self.y + mount * math.sin(self.heading),
+                                  self.heading - math.radians(pan), max_distance)
+
+    def attach_distance_sensor(self, sensor, pan=lambda: 0.0):
+        """
+        Branche un SimDistanceSensor (ex: tache5.sensor) sur le lancer de rayon
+
+        Args:
+            pan (callable): Orientation courante du capteur (ex: angle du servo de tête)
+        """
+        sensor.source = lambda: self.ultrasonic_distance(sensor.max_distance, pan())
+
+    def step(self, dt, steer_deg=0.0):
+        """Avance la simulation de dt secondes"""
+        # nan passerait la saturation du braquage (min(35, nan) vaut 35 : plein braquage)
+        if not math.isfinite(steer_deg):
+            raise ValueError(f"Braquage non fini: {steer_deg}")
+        throttle = self.motor.throttle or 0.0
+        self.speed += (throttle * self.MAX_SPEED - self.speed) * min(1.0, dt / self.MOTOR_LAG)
+        steer = math.radians(max(-self.MAX_STEER, min(self.MAX_STEER, steer_deg)))
+        # Braquage positif = à droite = rotation horaire
+        self.heading -= self.speed / self.WHEELBASE * math.tan(steer) * dt
+        self.x += self.speed * math.cos(self.heading) * dt
+        self.y += self.speed * math.sin(self.heading) * dt
+        self.distance += abs(self.speed) * dt
+        self.time += dt
+
+    def run(self, controller_step, steering=lambda: 0.0, rate=100, laps=1, timeout=60.0):
+        """
+        Fait tourner une boucle de contrôle jusqu'à la fin des tours, la sortie de piste ou timeout
+
+        Args:
+            controller_step (callable): controller_step(dt, now), appelé à chaque tick
+            steering (callable): Retourne le braquage courant (degrés logiques)
+            rate (float): Fréquence de la boucle de contrôle (Hz)
+            laps (int): Nombre de tours à faire
+            timeout (float): Durée simulée maximale (s)
+
+        Returns:
+            dict: lap_time (None si non terminé), laps, off_track, ticks,
+                  cpu_us_per_tick (contrôleur), realtime_factor
+        """
+        if not rate > 0 or not math.isfinite(rate):
+            raise ValueError(f"Fréquence de contrôle invalide: {rate} Hz")
+        dt = 1.0 / rate
+        lap_length = self.track.length
+        progress = 0.0
+        last = self._progress
+        ticks = 0
+        cpu = 0.0
+        off_track = False
+        wall_start = time.perf_counter()
+
+        while self.time < timeout:
+            start = time.perf_counter()
+            controller_step(dt, self.time)
+            cpu += time.perf_counter() - start
+            self.step(dt, steering())
+            ticks += 1
+
+            position, distance = self.track.locate(self.x, self.y)
+            delta = position - last
+            if delta < -lap_length / 2:
+                delta += lap_length          # passage de la ligne d'arrivée
+            elif delta > lap_length / 2:
+                delta -= lap_length
+            progress += delta
+            last = position
+            if distance > self.OFF_TRACK:
+                off_track = True
+                break
+            if progress >= laps * lap_length:
+                break
+
+        wall = time.perf_counter() - wall_start
+        done = progress >= laps * lap_length
+        return {
+            'lap_time': self.time / laps if done else None,
+            'laps': progress / lap_length,
+            'off_track': off_track,
+            'ticks': ticks,
+            'sim_time': self.time,
+            'cpu_us_per_tick': cpu / ticks * 1e6 if ticks else 0.0,
+            'realtime_factor': self.time / wall if wall > 0 else float('inf'),
+        }
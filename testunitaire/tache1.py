@@ -1,92 +1,366 @@
-import RPi.GPIO as GPIO
+import threading
 import time
 
+import numpy
+
+import hal
+from gamma import DEFAULT_GAMMA
+
+GPIO = hal.gpio()  # RPi.GPIO sur le robot, GPIO simulé ailleurs
+
+# Table des LEDs : numéro -> (nom, GPIO, logique inversée)
+LED_TABLE = {
+    1: ('LED1', 9, False),
+    2: ('LED2', 25, False),
+    3: ('LED3', 11, False),
+    4: ('left_R', 0, True),     # Feux avant RGB : GPIO.LOW = allumé
+    5: ('left_G', 19, True),
+    6: ('left_B', 13, True),
+    7: ('right_R', 1, True),
+    8: ('right_G', 5, True),
+    9: ('right_B', 6, True),
+}
+
+# Tables précalculées par switchSetup() (index = numéro de LED)
+_names = [None] * 10
+_pins = [None] * 10
+_invert = [0] * 10
+
+# Mode silencieux : aucun affichage (bascule des LEDs dans la boucle de contrôle)
+silent = False
+
+def set_silent(flag):
+    """Active/désactive l'affichage des changements d'état des LEDs"""
+    global silent
+    silent = bool(flag)
+
 def switchSetup():
     """Configuration initiale des GPIO pour toutes les LEDs"""
     GPIO.setwarnings(False)
     GPIO.setmode(GPIO.BCM)
     
-    # Configuration des LEDs HAT 3.1
-    GPIO.setup(9, GPIO.OUT)   # LED1
-    GPIO.setup(25, GPIO.OUT)  # LED2
-    GPIO.setup(11, GPIO.OUT)  # LED3
-    
-    # Configuration des LEDs RGB feux avant (logique inversée)
-    GPIO.setup(0, GPIO.OUT)   # left_R
-    GPIO.setup(19, GPIO.OUT)  # left_G
-    GPIO.setup(13, GPIO.OUT)  # left_B
-    GPIO.setup(1, GPIO.OUT)   # right_R
-    GPIO.setup(5, GPIO.OUT)   # right_G
-    GPIO.setup(6, GPIO.OUT)   # right_B
-    
-    # Initialisation: LEDs HAT éteintes, LEDs avant éteintes (HIGH car logique inversée)
-    GPIO.output(9, GPIO.LOW)
-    GPIO.output(25, GPIO.LOW)
-    GPIO.output(11, GPIO.LOW)
-    GPIO.output(0, GPIO.HIGH)
-    GPIO.output(19, GPIO.HIGH)
-    GPIO.output(13, GPIO.HIGH)
-    GPIO.output(1, GPIO.HIGH)
-    GPIO.output(5, GPIO.HIGH)
-    GPIO.output(6, GPIO.HIGH)
-
-def switch(led_number, status):
+    # Table des broches et masque d'inversion, construits une seule fois
+    for led_number, (name, pin, inverted) in LED_TABLE.items():
+        _names[led_number] = name
+        _pins[led_number] = pin
+        _invert[led_number] = 1 if inverted else 0
+    
+    # Configuration des LEDs HAT 3.1 et des LEDs RGB feux avant, en un appel
+    pins = [_pins[n] for n in LED_TABLE]
+    GPIO.setup(pins, GPIO.OUT)
+    
+    # Initialisation: toutes les LEDs éteintes (HIGH pour les LEDs avant, logique inversée)
+    GPIO.output(pins, [_invert[n] for n in LED_TABLE])
+
+def _ensure_setup():
+    """Configure les GPIO au premier usage si switchSetup() n'a pas encore été appelé"""
+    if _pins[1] is None:
+        switchSetup()
+
+def switch(led_number, status, verbose=None):
     """
     Contrôle individuel d'une LED en mode ON/OFF
     Args:
         led_number (int): Numéro de LED (1-9)
         status (int): 1 pour allumer, 0 pour éteindre
+        verbose (bool): Affiche le changement (défaut: sauf en mode silencieux)
     """
-    # Mapping des LEDs avec leurs GPIO et noms
-    led_config = {
-        1: {'pin': 9, 'name': 'LED1', 'type': 'hat'},
-        2: {'pin': 25, 'name': 'LED2', 'type': 'hat'},
-        3: {'pin': 11, 'name': 'LED3', 'type': 'hat'},
-        4: {'pin': 0, 'name': 'left_R', 'type': 'front'},
-        5: {'pin': 19, 'name': 'left_G', 'type': 'front'},
-        6: {'pin': 13, 'name': 'left_B', 'type': 'front'},
-        7: {'pin': 1, 'name': 'right_R', 'type': 'front'},
-        8: {'pin': 5, 'name': 'right_G', 'type': 'front'},
-        9: {'pin': 6, 'name': 'right_B', 'type': 'front'}
-    }
-    
-    if led_number not in led_config:
+    if led_number not in LED_TABLE:
         print(f"Erreur: LED {led_number} n'existe pas (1-9)")
         return
+    if status not in (0, 1):
+        print(f"Erreur: Status invalide pour {LED_TABLE[led_number][0]} (0 ou 1)")
+        return
+    _ensure_setup()
     
-    led = led_config[led_number]
+    # Logique inversée des LEDs avant appliquée par le masque
+    GPIO.output(_pins[led_number], status ^ _invert[led_number])
+    if verbose or (verbose is None and not silent):
+        print(f"{_names[led_number]} {'allumée' if status else 'éteinte'}")
+
+def switch_many(led_numbers, statuses, verbose=None):
+    """
+    Change plusieurs LEDs en un seul appel GPIO.output(liste, liste)
     
-    if led['type'] == 'hat':
-        # LEDs HAT: GPIO.HIGH = allumé, GPIO.LOW = éteint
-        if status == 1:
-            GPIO.output(led['pin'], GPIO.HIGH)
-            print(f"{led['name']} allumée")
-        elif status == 0:
-            GPIO.output(led['pin'], GPIO.LOW)
-            print(f"{led['name']} éteinte")
-        else:
-            print(f"Erreur: Status invalide pour {led['name']} (0 ou 1)")
-    
-    elif led['type'] == 'front':
-        # LEDs avant: GPIO.LOW = allumé, GPIO.HIGH = éteint (logique inversée)
-        if status == 1:
-            GPIO.output(led['pin'], GPIO.LOW)
-            print(f"{led['name']} allumée")
-        elif status == 0:
-            GPIO.output(led['pin'], GPIO.HIGH)
-            print(f"{led['name']} éteinte")
-        else:
-            print(f"Erreur: Status invalide pour {led['name']} (0 ou 1)")
+    Args:
+        led_numbers (list): Numéros de LED (1-9)
+        statuses (list ou int): États (0/1) par LED, ou un état commun
+        verbose (bool): Affiche le résumé (défaut: sauf en mode silencieux)
+    
+    Raises:
+        ValueError: Listes led_numbers et statuses de longueurs différentes
+    """
+    invalid = [n for n in led_numbers if n not in LED_TABLE]
+    if invalid:
+        print(f"Erreur: LED {invalid} n'existe pas (1-9)")
+        return
+    if isinstance(statuses, int):
+        statuses = [statuses] * len(led_numbers)
+    elif len(statuses) != len(led_numbers):
+        raise ValueError(f"{len(led_numbers)} LED pour {len(statuses)} état(s)")
+    _ensure_setup()
+    GPIO.output([_pins[n] for n in led_numbers],
+                [s ^ _invert[n] for n, s in zip(led_numbers, statuses)])
+    if verbose or (verbose is None and not silent):
+        print(", ".join(f"{_names[n]} {'allumée' if s else 'éteinte'}"
+                        for n, s in zip(led_numbers, statuses)))
 
-def set_all_switch_off():
+def set_all_switch_off(verbose=None):
     """Éteint toutes les LEDs"""
-    for led_number in range(1, 10):
-        switch(led_number, 0)
+    switch_many(list(LED_TABLE), 0, verbose=False)
+    if verbose or (verbose is None and not silent):
+        print("Toutes les LEDs éteintes")
 
-def set_all_switch_on():
+def set_all_switch_on(verbose=None):
     """Allume toutes les LEDs"""
-    for led_number in range(1, 10):
-        switch(led_number, 1)
+    switch_many(list(LED_TABLE), 1, verbose=False)
+    if verbose or (verbose is None and not silent):
+        print("Toutes les LEDs allumées")
+
+
+# Feux avant RGB : numéros de LED (R, G, B) de chaque côté
+FRONT_RGB = {'left': (4, 5, 6), 'right': (7, 8, 9)}
+
+# Gamma des LEDs RGB : intensités perceptuellement linéaires (le même que les WS2812 de tache2)
+RGB_GAMMA = DEFAULT_GAMMA
+
+
+class FrontRGBEngine:
+    """
+    Couleurs 24 bits sur les feux avant par PWM
+    
+    Backends, par ordre de préférence avec backend='auto':
+    - 'pigpio' : PWM cadencée par DMA (démon pigpiod), sans charge CPU Python
+    - 'thread' : PWM logicielle sur un thread (attente + courte boucle active
+                 pour limiter la gigue), toutes les broches en un GPIO.output
+    - 'rpi'    : RPi.GPIO.PWM (un thread C par broche), sur demande
+    La logique inversée des feux avant est gérée ici : les couleurs sont
+    données en RGB normal. led_brightness (0-255) permet d'en faire un
+    récepteur de tache2.AutoBrightness.
+    """
+    
+    def __init__(self, frequency=200, backend='auto', brightness=255, spin=0.0003):
+        """
+        Args:
+            frequency (float): Fréquence PWM (Hz)
+            backend (str): 'auto', 'pigpio', 'thread' ou 'rpi'
+            brightness (int): Luminosité globale (0-255)
+            spin (float): Durée de la boucle active avant chaque front (backend 'thread', s)
+        """
+        _ensure_setup()
+        self.frequency = frequency
+        self.spin = spin
+        self.leds = FRONT_RGB['left'] + FRONT_RGB['right']
+        self.pins = [_pins[n] for n in self.leds]
+        self._on = [1 ^ _invert[n] for n in self.leds]     # niveau "allumé" par broche
+        self._off = [_invert[n] for n in self.leds]
+        
+        self.pi = None
+        if backend in ('auto', 'pigpio'):
+            self.pi = hal.pigpio_pi()
+            if self.pi is None and backend == 'pigpio':
+                raise RuntimeError("pigpio indisponible (pigpiod lancé ?)")
+            backend = 'pigpio' if self.pi is not None else 'thread'
+        self.backend = backend
+        
+        self.colors = {'left': (0, 0, 0), 'right': (0, 0, 0)}
+        self.duties = [0] * len(self.pins)    # 0-255 après gamma et luminosité
+        self._led_brightness = max(0, min(255, int(brightness)))
+        self._lut = self._build_lut()
+        self._lock = threading.Lock()
+        self._changed = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+        
+        # Statistiques (backend 'thread')
+        self.periods = 0
+        self.late_periods = 0
+        self.jitter_total = 0.0
+        self.jitter_max = 0.0
+        self.edges = 0
+        self._cpu_used = 0.0     # Temps CPU du thread PWM (s) ; pigpio/rpi : hors Python
+        self._cpu_mark = 0.0
+        self._wall_start = None
+        self._wall_end = None
+        
+        if self.backend == 'pigpio':
+            for pin in self.pins:
+                self.pi.set_PWM_frequency(pin, frequency)
+                self.pi.set_PWM_range(pin, 255)
+        elif self.backend == 'rpi':
+            self._pwm = [GPIO.PWM(pin, frequency) for pin in self.pins]
+            for pwm, off in zip(self._pwm, self._off):
+                pwm.start(100.0 * off)
+        self._apply()
+    
+    def _build_lut(self):
+        levels = numpy.arange(256) / 255.0
+        return numpy.round(self._led_brightness * levels ** RGB_GAMMA).astype(int).tolist()
+    
+    @property
+    def led_brightness(self):
+        """Luminosité globale (0-255)"""
+        return self._led_brightness
+    
+    @led_brightness.setter
+    def led_brightness(self, brightness):
+        brightness = max(0, min(255, int(brightness)))
+        if brightness != self._led_brightness:
+            self._led_brightness = brightness
+            self._lut = self._build_lut()
+            self._apply()
+    
+    def set_color(self, side, rgb):
+        """
+        Couleur d'un feu avant
+        
+        Args:
+            side (str): 'left', 'right' ou 'both'
+            rgb (tuple): (R, G, B) 0-255
+        """
+        sides = ('left', 'right') if side == 'both' else (side,)
+        rgb = tuple(max(0, min(255, int(c))) for c in rgb)
+        changed = False
+        for s in sides:
+            if self.colors[s] != rgb:
+                self.colors[s] = rgb
+                changed = True
+        if changed:
+            self._apply()
+    
+    def _apply(self):
+        """Recalcule les rapports cycliques et les transmet au backend"""
+        lut = self._lut
+        duties = [lut[c] for c in self.colors['left'] + self.colors['right']]
+        with self._lock:
+            self.duties = duties
+        if self.backend == 'pigpio':
+            for pin, duty, off in zip(self.pins, duties, self._off):
+                self.pi.set_PWM_dutycycle(pin, 255 - duty if off else duty)
+        elif self.backend == 'rpi':
+            for pwm, duty, off in zip(self._pwm, duties, self._off):
+                pwm.ChangeDutyCycle(100.0 * (255 - duty if off else duty) / 255)
+        else:
+            self._changed.set()
+    
+    def _wait_until(self, target):
+        """Attente jusqu'à target : sleep puis courte boucle active (gigue réduite)"""
+        delay = target - time.perf_counter() - self.spin
+        if delay > 0:
+            time.sleep(delay)
+        while time.perf_counter() < target:
+            pass
+        jitter = time.perf_counter() - target
+        self.jitter_total += jitter
+        self.jitter_max = max(self.jitter_max, jitter)
+        self.edges += 1
+    
+    def _run(self):
+        period = 1.0 / self.frequency
+        pins, on_levels, off_levels = self.pins, self._on, self._off
+        last_static = None
+        next_period = time.perf_counter()
+        while not self._stop_event.is_set():
+            self._account_cpu()
+            with self._lock:
+                duties = self.duties
+                # Remis à zéro après la lecture : un _apply() postérieur réveillera l'attente
+                self._changed.clear()
+            
+            # Tout allumé ou tout éteint : un seul GPIO.output, puis attente d'un changement
+            if all(d in (0, 255) for d in duties):
+                levels = [on if d else off for d, on, off in zip(duties, on_levels, off_levels)]
+                if levels != last_static:
+                    GPIO.output(pins, levels)
+                    last_static = levels
+                self._changed.wait(0.1)
+                next_period = time.perf_counter()
+                continue
+            last_static = None
+            
+            # Début de période : toutes les broches actives allumées en un appel
+            GPIO.output(pins, [on if d else off for d, on, off in zip(duties, on_levels, off_levels)])
+            # Puis extinction groupée par instant de front
+            edges = {}
+            for pin, duty, off in zip(pins, duties, off_levels):
+                if 0 < duty < 255:
+                    edges.setdefault(duty, ([], []))
+                    edges[duty][0].append(pin)
+                    edges[duty][1].append(off)
+            for duty in sorted(edges):
+                self._wait_until(next_period + period * duty / 255)
+                GPIO.output(*edges[duty])
+            
+            self.periods += 1
+            next_period += period
+            if time.perf_counter() > next_period:
+                self.late_periods += 1
+                next_period = time.perf_counter()
+            self._wait_until(next_period)
+    
+    def start(self):
+        """Démarre la mesure et, pour le backend 'thread', le thread PWM"""
+        self._wall_start = time.perf_counter()
+        self._wall_end = None
+        if self.backend != 'thread' or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run_measured, name="front-rgb-pwm", daemon=True)
+        self._thread.start()
+    
+    def _run_measured(self):
+        """_run avec mesure du temps CPU consommé par le thread"""
+        self._cpu_mark = time.thread_time()
+        try:
+            self._run()
+        finally:
+            self._account_cpu()
+    
+    def _account_cpu(self):
+        """Ajoute le temps CPU du thread PWM depuis le dernier appel (à chaque période)"""
+        now = time.thread_time()
+        self._cpu_used += now - self._cpu_mark
+        self._cpu_mark = now
+    
+    def stop(self):
+        """Arrête la PWM et éteint les feux avant"""
+        self._stop_event.set()
+        self._changed.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._wall_end = time.perf_counter()
+        if self.backend == 'pigpio':
+            for pin, off in zip(self.pins, self._off):
+                self.pi.set_PWM_dutycycle(pin, 255 if off else 0)
+            self.pi.stop()
+        elif self.backend == 'rpi':
+            for pwm in self._pwm:
+                pwm.stop()
+        GPIO.output(self.pins, self._off)
+    
+    def stats(self):
+        """Charge CPU (%) et gigue des fronts (µs) du backend"""
+        if self._wall_start is None:
+            wall = 0.0
+        else:
+            wall = (self._wall_end or time.perf_counter()) - self._wall_start
+        return {
+            'backend': self.backend,
+            'frequency': self.frequency,
+            'periods': self.periods,
+            'late_periods': self.late_periods,
+            'cpu_percent': self._cpu_used / wall * 100 if wall > 0 else 0.0,
+            'jitter_us_avg': self.jitter_total / self.edges * 1e6 if self.edges else 0.0,
+            'jitter_us_max': self.jitter_max * 1e6,
+        }
+    
+    def print_stats(self):
+        s = self.stats()
+        print(f"📊 Feux avant PWM ({s['backend']}, {s['frequency']} Hz): {s['periods']} périodes, "
+              f"{s['late_periods']} en retard, CPU {s['cpu_percent']:.1f}%, "
+              f"gigue {s['jitter_us_avg']:.1f} µs moy / {s['jitter_us_max']:.1f} µs max")
+
 
 def main():
     """
@@ -12,16 +12,111 @@ Configuration des LED WS2812 :
 - Total : 14 LED WS2812
 """
 
-import spidev
+import math
+import threading
 import time
+from contextlib import contextmanager
+
 import numpy
 
+import hal
+from animations import AnimationEngine, Blink, Breathe, Chase, Fade, Sequence, Wipe
+from gamma import DEFAULT_GAMMA
+
+# Table de codage WS2812 : chaque octet de couleur devient 8 symboles SPI
+# (bit de poids fort en premier), 0xF8 pour un bit à 1 et 0x80 pour un bit à 0
+_WS2812_LUT = numpy.zeros((256, 8), dtype=numpy.uint8)
+for _ibit in range(8):
+    _WS2812_LUT[:, 7 - _ibit] = ((numpy.arange(256) >> _ibit) & 1) * 0x78 + 0x80
+
+
+def _check_colors(colors):
+    """
+    Vérifie des couleurs avant écriture dans le framebuffer uint8
+
+    Hors de 0-255, numpy tronquerait la valeur sans prévenir (ou lèverait
+    OverflowError pour un int Python). Les tableaux uint8 (rendus des
+    animations) passent sans copie ni test.
+
+    Args:
+        colors: Couleur (r, g, b) ou tableau (N, 3)
+
+    Returns:
+        Les couleurs, prêtes à être affectées à pixels[...]
+
+    Raises:
+        ValueError: Composante hors de 0-255 (ou non finie)
+    """
+    if isinstance(colors, numpy.ndarray) and colors.dtype == numpy.uint8:
+        return colors
+    if isinstance(colors, tuple) and len(colors) == 3 and all(isinstance(c, int) for c in colors):
+        # Chemin rapide d'une seule couleur (set_ledpixel dans une boucle)
+        for value in colors:
+            if not 0 <= value <= 255:
+                raise ValueError(f"Composante {value} hors de 0-255")
+        return colors
+    array = numpy.asarray(colors)
+    if array.size and not (array.min() >= 0 and array.max() <= 255):
+        raise ValueError(f"Composantes hors de 0-255 (min {array.min()}, max {array.max()})")
+    return array
+
+
+
+# Groupes de LED (identifiants acceptés par control_led / control_group)
+LED_GROUPS = {
+    'C': [0, 1],                    # Carte
+    'CARTE': [0, 1],
+    'BG': [2, 3, 4],               # Bas Gauche
+    'BAS_GAUCHE': [2, 3, 4],
+    'BD': [5, 6, 7],               # Bas Droite
+    'BAS_DROITE': [5, 6, 7],
+    'AG': [8, 9, 10],              # Arrière Gauche
+    'ARRIERE_GAUCHE': [8, 9, 10],
+    'AD': [11, 12, 13],            # Arrière Droite
+    'ARRIERE_DROITE': [11, 12, 13]
+}
+
+
+class WS2812FrameEncoder:
+    """
+    Encodeur de trames SPI pour WS2812 avec buffer préalloué
+    
+    Le buffer de transmission est alloué une seule fois pour une longueur
+    de bande donnée, puis réécrit à chaque trame par indexation de la table.
+    """
+    
+    def __init__(self, count):
+        """
+        Args:
+            count (int): Nombre de LED de la bande
+        """
+        self.led_count = count
+        self._data = numpy.zeros(count * 3, dtype=numpy.uint8)
+        self.tx = bytearray(count * 3 * 8)
+        self._tx_view = numpy.frombuffer(self.tx, dtype=numpy.uint8).reshape(count * 3, 8)
+    
+    def encode(self, led_color):
+        """
+        Encode les octets de couleur (ordre de la bande) dans le buffer SPI
+        
+        Args:
+            led_color: Séquence de count*3 octets (liste ou tableau numpy)
+        
+        Returns:
+            bytearray: Buffer SPI prêt à être envoyé (réutilisé d'une trame à l'autre)
+        """
+        self._data[:] = led_color
+        numpy.take(_WS2812_LUT, self._data, axis=0, out=self._tx_view)
+        return self.tx
+
+
 class WS2812Controller:
     """
     Contrôleur pour les LED WS2812 basé sur le code Adeept
     """
     
-    def __init__(self, count=14, brightness=255, sequence='GRB', bus=0, device=0):
+    def __init__(self, count=14, brightness=255, sequence='GRB', bus=0, device=0, spi=None,
+                 gamma=DEFAULT_GAMMA):
         """
         Initialise le contrôleur WS2812
         
@@ -31,29 +126,56 @@ class WS2812Controller:
             sequence (str): Ordre des couleurs ('GRB' par défaut)
             bus (int): Bus SPI (0 par défaut)
             device (int): Device SPI (0 par défaut)
+            spi: Périphérique SPI déjà ouvert (optionnel, ex: hal.SimSPI pour les benchmarks)
+            gamma (float ou tuple): Correction gamma globale ou par canal (R, G, B), 1.0 = aucune
         """
         self.led_count = count
-        self.led_brightness = brightness
+        self._dirty = True
+        self._gamma = gamma
+        self._led_brightness = brightness
+        self._lut = numpy.zeros(3 * 256, dtype=numpy.uint8)
+        self._lut_stale = True
         self.set_led_type(sequence)
-        self.led_color = [0, 0, 0] * self.led_count
-        self.led_original_color = [0, 0, 0] * self.led_count
+        
+        # Framebuffer : couleurs d'origine (R, G, B) par LED, et trame rendue
+        # (luminosité appliquée, ordre de la bande) réutilisée à chaque show()
+        self.pixels = numpy.zeros((self.led_count, 3), dtype=numpy.uint8)
+        self._frame = numpy.zeros((self.led_count, 3), dtype=numpy.uint8)
+        self._reordered = numpy.zeros((self.led_count, 3), dtype=numpy.uint8)
+        self._lut_index = numpy.zeros((self.led_count, 3), dtype=numpy.intp)
+        self.led_color = self._frame.reshape(-1)
+        self.encoder = WS2812FrameEncoder(self.led_count)
+        
+        # Suivi des modifications : une trame identique à la précédente n'est pas renvoyée
+        self._last_frame = None
+        self._batch_depth = 0
+        self.lock = threading.RLock()  # partagé avec le moteur d'animation
+        self.frames_requested = 0
+        self.frames_sent = 0
         
         # Initialisation SPI
         self.bus = bus
         self.device = device
+        self.spi_speed = int(8/1.25e-6) if bus == 0 else int(8/1.0e-6)
+        if spi is not None:
+            self.spi = spi
+            self.led_init_state = 1
+        else:
+            self._open_spi()
+        
+        # Éteindre toutes les LED au démarrage
+        self.set_all_led_color(0, 0, 0)
+    
+    def _open_spi(self):
+        """Ouvre le périphérique SPI (matériel ou simulé selon le backend HAL)"""
         try:
-            self.spi = spidev.SpiDev()
-            self.spi.open(self.bus, self.device)
-            self.spi.mode = 0
+            self.spi = hal.spi_device(self.bus, self.device)
             self.led_init_state = 1
             print("✅ SPI initialisé avec succès")
         except OSError:
             print("❌ Erreur SPI - Vérifiez la configuration dans /boot/firmware/config.txt")
             print("Vous devez activer 'SPI' dans 'Interface Options' avec 'sudo raspi-config'")
             self.led_init_state = 0
-        
-        # Éteindre toutes les LED au démarrage
-        self.set_all_led_color(0, 0, 0)
     
     def set_led_type(self, rgb_type):
         """Configure l'ordre des couleurs RGB"""
@@ -64,30 +186,142 @@ class WS2812Controller:
             self.led_red_offset = (led_type_offset[index] >> 4) & 0x03
             self.led_green_offset = (led_type_offset[index] >> 2) & 0x03
             self.led_blue_offset = (led_type_offset[index] >> 0) & 0x03
-            return index
+            index_result = index
         except ValueError:
             self.led_red_offset = 1
             self.led_green_offset = 0
             self.led_blue_offset = 2
-            return -1
+            index_result = -1
+        
+        # Colonne RGB à placer à chaque position de la trame
+        self._channel_order = numpy.zeros(3, dtype=numpy.intp)
+        self._channel_order[self.led_red_offset] = 0
+        self._channel_order[self.led_green_offset] = 1
+        self._channel_order[self.led_blue_offset] = 2
+        # Décalage de chaque position de trame dans la table (R: 0, G: 256, B: 512)
+        self._lut_offsets = self._channel_order * 256
+        self._dirty = True
+        return index_result
+    
+    @property
+    def led_brightness(self):
+        """Luminosité globale (0-255)"""
+        return self._led_brightness
+    
+    @led_brightness.setter
+    def led_brightness(self, brightness):
+        brightness = max(0, min(255, int(brightness)))
+        # Appelé depuis AutoBrightness pendant que le moteur d'animation rend une trame
+        with self.lock:
+            if brightness != self._led_brightness:
+                self._led_brightness = brightness
+                self._lut_stale = True
+                self._dirty = True
+    
+    @property
+    def gamma(self):
+        """Correction gamma (float ou tuple R, G, B)"""
+        return self._gamma
+    
+    @gamma.setter
+    def gamma(self, gamma):
+        with self.lock:
+            self._gamma = gamma
+            self._lut_stale = True
+            self._dirty = True
+    
+    def _build_lut(self):
+        """Table 3 x 256 combinant gamma et luminosité (reconstruite si l'un change)"""
+        with self.lock:
+            # Remis à zéro avant la lecture : un changement concurrent la redemandera
+            self._lut_stale = False
+            brightness = self._led_brightness
+            gammas = self._gamma if isinstance(self._gamma, (tuple, list)) else (self._gamma,) * 3
+            levels = numpy.arange(256) / 255.0
+            for channel, gamma in enumerate(gammas):
+                values = numpy.round(brightness * levels ** gamma)
+                self._lut[channel * 256:(channel + 1) * 256] = values
+    
+    @property
+    def led_original_color(self):
+        """Couleurs d'origine (sans luminosité) dans l'ordre de la bande"""
+        return self.pixels[:, self._channel_order].ravel()
     
     def set_ledpixel(self, index, r, g, b):
-        """Configure une LED individuelle avec les valeurs RGB"""
-        if index >= self.led_count:
+        """
+        Configure une LED individuelle avec les valeurs RGB
+        
+        Raises:
+            ValueError: Composante hors de 0-255 (le framebuffer est en uint8)
+        """
+        if index < 0 or index >= self.led_count:
             print(f"❌ Index {index} invalide (max: {self.led_count-1})")
             return
+        r, g, b = _check_colors((r, g, b))
+        
+        with self.lock:
+            pixel = self.pixels[index]
+            pixel[0] = r
+            pixel[1] = g
+            pixel[2] = b
+            self._dirty = True
+    
+    def set_pixels(self, indices, rgb_array):
+        """
+        Configure plusieurs LED en une seule opération
+        
+        Args:
+            indices: Liste/tableau d'index de LED (ou slice)
+            rgb_array: Tableau (N, 3) de couleurs RGB, ou une seule couleur (r, g, b)
+        
+        Raises:
+            ValueError: Composante hors de 0-255
+        """
+        rgb_array = _check_colors(rgb_array)
+        with self.lock:
+            self.pixels[indices] = rgb_array
+            self._dirty = True
+    
+    def fill(self, leds, rgb):
+        """
+        Remplit une plage de LED avec la même couleur
         
-        p = [0, 0, 0]
-        p[self.led_red_offset] = round(r * self.led_brightness / 255)
-        p[self.led_green_offset] = round(g * self.led_brightness / 255)
-        p[self.led_blue_offset] = round(b * self.led_brightness / 255)
+        Args:
+            leds: slice, liste d'index ou index de LED (ex: slice(2, 5))
+            rgb (tuple): Couleur (r, g, b)
+        
+        Raises:
+            ValueError: Composante hors de 0-255
+        """
+        rgb = _check_colors(rgb)
+        with self.lock:
+            self.pixels[leds] = rgb
+            self._dirty = True
+    
+    def blit(self, image, offset=0):
+        """
+        Copie un tableau de couleurs dans le framebuffer
         
-        self.led_original_color[index*3 + self.led_red_offset] = r
-        self.led_original_color[index*3 + self.led_green_offset] = g
-        self.led_original_color[index*3 + self.led_blue_offset] = b
+        Args:
+            image: Tableau numpy (N, 3) de couleurs RGB 0-255
+            offset (int): Index de la première LED à écrire
         
-        for i in range(3):
-            self.led_color[index*3 + i] = p[i]
+        Raises:
+            ValueError: Composante hors de 0-255
+        """
+        image = numpy.asarray(_check_colors(image)).reshape(-1, 3)
+        end = min(self.led_count, offset + len(image))
+        with self.lock:
+            self.pixels[offset:end] = image[:end - offset]
+            self._dirty = True
+    
+    def _render(self):
+        """Applique ordre des couleurs, gamma et luminosité à tout le framebuffer"""
+        if self._lut_stale:
+            self._build_lut()
+        numpy.take(self.pixels, self._channel_order, axis=1, out=self._reordered)
+        numpy.add(self._reordered, self._lut_offsets, out=self._lut_index)
+        numpy.take(self._lut, self._lut_index, out=self._frame)
     
     def get_led_position_name(self, led_num):
         """Retourne le nom de la position de la LED"""
@@ -107,7 +341,7 @@ class WS2812Controller:
         Args:
             led_identifier (int/str): Numéro LED (0-13) ou nom groupe ('C', 'BG', 'BD', 'AG', 'AD')
             color (str): Couleur ('R', 'G', 'B', 'N')
-            intensity (int): Intensité (0-255) - Partie 3 de la tâche
+            intensity (int): Intensité perçue (0-255, corrigée gamma) - Partie 3 de la tâche
         """
         # Conversion des identifiants en numéros de LED
         led_nums = self._parse_led_identifier(led_identifier)
@@ -125,6 +359,9 @@ class WS2812Controller:
             print(f"❌ Identifiant '{led_identifier}' invalide")
             return
         
+        if not 0 <= intensity <= 255:
+            raise ValueError(f"Intensité {intensity} hors de 0-255")
+        
         # Définition des couleurs de base
         colors = {
             'R': (intensity, 0, 0),        # Rouge
@@ -169,46 +406,78 @@ class WS2812Controller:
         if isinstance(identifier, str) and identifier.isdigit():
             return int(identifier)
         
-        # Pour les groupes, on retourne une liste des LED du groupe
-        group_mapping = {
-            'C': [0, 1],                    # Carte
-            'CARTE': [0, 1],
-            'BG': [2, 3, 4],               # Bas Gauche
-            'BAS_GAUCHE': [2, 3, 4],
-            'BD': [5, 6, 7],               # Bas Droite
-            'BAS_DROITE': [5, 6, 7],
-            'AG': [8, 9, 10],              # Arrière Gauche
-            'ARRIERE_GAUCHE': [8, 9, 10],
-            'AD': [11, 12, 13],            # Arrière Droite
-            'ARRIERE_DROITE': [11, 12, 13]
-        }
-        
-        # Retourne la liste des LED du groupe ou None
-        return group_mapping.get(identifier.upper(), None)
+        # Pour les groupes, on retourne la liste des LED du groupe ou None
+        return LED_GROUPS.get(identifier.upper(), None)
     
     def set_all_led_color(self, r, g, b):
         """Allume toutes les LED avec la même couleur"""
-        for i in range(self.led_count):
-            self.set_ledpixel(i, r, g, b)
+        self.fill(slice(None), (r, g, b))
         self.show()
     
-    def show(self):
-        """Envoie les données aux LED via SPI"""
+    def show(self, force=False):
+        """
+        Envoie les données aux LED via SPI
+        
+        La transmission est sautée si aucune LED n'a changé depuis la dernière
+        trame envoyée, ou différée à la fin d'un bloc batch().
+        
+        Args:
+            force (bool): Renvoie la trame même si elle est identique
+        """
         if self.led_init_state == 0:
             print("❌ SPI non initialisé")
             return
         
-        # Conversion des données LED en signaux SPI
-        d = numpy.array(self.led_color).ravel()
-        tx = numpy.zeros(len(d)*8, dtype=numpy.uint8)
+        with self.lock:
+            self.frames_requested += 1
+            if self._batch_depth == 0:
+                self._flush(force)
+    
+    def _flush(self, force=False):
+        """Encode et transmet la trame si elle diffère de la dernière envoyée"""
+        if not self._dirty and not force:
+            return
         
-        for ibit in range(8):
-            tx[7-ibit::8] = ((d >> ibit) & 1) * 0x78 + 0x80
+        # Conversion des données LED en signaux SPI (table + buffer préalloué)
+        self._render()
+        tx = self.encoder.encode(self.led_color)
+        self._dirty = False
+        if not force and self._last_frame == tx:
+            return
         
-        if self.bus == 0:
-            self.spi.xfer(tx.tolist(), int(8/1.25e-6))
+        self.spi.xfer(tx, self.spi_speed)
+        self.frames_sent += 1
+        if self._last_frame is None:
+            self._last_frame = bytearray(tx)
         else:
-            self.spi.xfer(tx.tolist(), int(8/1.0e-6))
+            self._last_frame[:] = tx
+    
+    @contextmanager
+    def batch(self):
+        """
+        Regroupe plusieurs écritures de pixels en une seule trame SPI
+        
+        Exemple:
+            with controller.batch():
+                controller.control_led(2, 'R')
+                controller.control_led(5, 'G')
+        """
+        with self.lock:
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+                if self._batch_depth == 0 and self.led_init_state:
+                    self._flush()
+    
+    def frame_stats(self):
+        """Retourne les compteurs de trames demandées / envoyées"""
+        return {
+            'requested': self.frames_requested,
+            'sent': self.frames_sent,
+            'skipped': self.frames_requested - self.frames_sent,
+        }
     
     def control_group(self, group_name, color, intensity=255):
         """
@@ -219,27 +488,15 @@ class WS2812Controller:
             color (str): Couleur ('R', 'G', 'B', 'N')
             intensity (int): Intensité (0-255)
         """
-        group_mapping = {
-            'C': [0, 1],                    # Carte
-            'CARTE': [0, 1],
-            'BG': [2, 3, 4],               # Bas Gauche
-            'BAS_GAUCHE': [2, 3, 4],
-            'BD': [5, 6, 7],               # Bas Droite
-            'BAS_DROITE': [5, 6, 7],
-            'AG': [8, 9, 10],              # Arrière Gauche
-            'ARRIERE_GAUCHE': [8, 9, 10],
-            'AD': [11, 12, 13],            # Arrière Droite
-            'ARRIERE_DROITE': [11, 12, 13]
-        }
-        
         group_name_upper = group_name.upper()
-        if group_name_upper not in group_mapping:
+        if group_name_upper not in LED_GROUPS:
             print(f"❌ Groupe '{group_name}' invalide. Utilisez: C, BG, BD, AG, AD")
             return
         
-        leds = group_mapping[group_name_upper]
-        for led_num in leds:
-            self.control_led(led_num, color, intensity)
+        leds = LED_GROUPS[group_name_upper]
+        with self.batch():
+            for led_num in leds:
+                self.control_led(led_num, color, intensity)
         
         group_names = {
             'C': 'Carte', 'BG': 'Bas_Gauche', 'BD': 'Bas_Droite',
@@ -247,18 +504,20 @@ class WS2812Controller:
         }
         color_name = {'R': 'Rouge', 'G': 'Vert', 'B': 'Bleu', 'N': 'Éteinte'}
         print(f"🎯 Groupe {group_names.get(group_name_upper, group_name)}: {color_name[color.upper()]}")
-        
+    
+    def test_all_leds(self):
         """Test de toutes les LED avec différentes couleurs"""
-        print("🔄 Test de toutes les LED...")
-        colors = [('R', 255, 0, 0), ('G', 0, 255, 0), ('B', 0, 0, 255)]
-        
-        for color_name, r, g, b in colors:
-            print(f"  Test couleur {color_name}")
-            for i in range(self.led_count):
-                self.set_ledpixel(i, r, g, b)
-                self.show()
-                time.sleep(0.1)
-            time.sleep(0.5)
+        print("🔄 Test de toutes les LED (R, G, B)...")
+        engine = AnimationEngine(self, fps=30)
+        engine.start()
+        test = Sequence(
+            Wipe(color=(255, 0, 0), speed=10), Fade(start=(255, 0, 0), end=(255, 0, 0), duration=0.5),
+            Wipe(color=(0, 255, 0), speed=10), Fade(start=(0, 255, 0), end=(0, 255, 0), duration=0.5),
+            Wipe(color=(0, 0, 255), speed=10), Fade(start=(0, 0, 255), end=(0, 0, 255), duration=0.5),
+        )
+        engine.wait(engine.play(test))
+        engine.stop()
+        engine.print_stats()
         
         # Éteindre toutes les LED
         self.set_all_led_color(0, 0, 0)
@@ -269,8 +528,121 @@ class WS2812Controller:
         self.set_all_led_color(0, 0, 0)
         if hasattr(self, 'spi'):
             self.spi.close()
+        stats = self.frame_stats()
+        print(f"📊 Trames demandées: {stats['requested']} | envoyées: {stats['sent']} "
+              f"| évitées: {stats['skipped']}")
         print("🔌 Connexion SPI fermée")
 
+
+class AutoBrightness:
+    """
+    Luminosité automatique des LED d'après le capteur de lumière (tache8)
+
+    La lumière moyenne sur une courte fenêtre de l'ADCSampler donne une
+    luminosité cible, lissée exponentiellement. La nouvelle luminosité n'est
+    appliquée que si elle s'écarte de plus de `hysteresis` de la valeur en
+    place : pas de scintillement ni de trame supplémentaire quand la lumière
+    varie peu. Chaque changement reconstruit la table gamma/luminosité et
+    n'envoie qu'une trame.
+    """
+
+    def __init__(self, sampler, sinks, channel=1, dark=2000, bright=50000,
+                 min_brightness=16, max_brightness=255, inverted=False,
+                 smoothing=2.0, hysteresis=8, rate=5, window=0.5):
+        """
+        Args:
+            sampler (ADCSampler): Acquisition ADC partagée (tache8)
+            sinks (list): Récepteurs ayant un attribut led_brightness (ex: WS2812Controller)
+            channel (int): Canal ADC du capteur de lumière
+            dark, bright (int): Valeurs ADC (16 bits) de l'obscurité et du plein jour
+            min_brightness, max_brightness (int): Luminosité appliquée dans le noir / en plein jour
+            inverted (bool): Capteur dont la valeur baisse quand la lumière augmente
+            smoothing (float): Constante de temps du lissage (s)
+            hysteresis (int): Écart minimal de luminosité pour appliquer un changement
+            rate (float): Fréquence de mise à jour (Hz)
+            window (float): Fenêtre de moyenne du capteur (s)
+        """
+        self.sampler = sampler
+        self.sinks = list(sinks)
+        self.channel = channel
+        self.dark = dark
+        self.bright = bright
+        self.min_brightness = min_brightness
+        self.max_brightness = max_brightness
+        self.inverted = inverted
+        self.smoothing = smoothing
+        self.hysteresis = hysteresis
+        self.rate = rate
+        self.window = window
+
+        self.level = None       # Luminosité lissée (float)
+        self.applied = None     # Dernière luminosité appliquée
+        self.changes = 0
+        self._last_update = None
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def target(self, light):
+        """Luminosité cible pour une valeur ADC de lumière"""
+        k = (light - self.dark) / (self.bright - self.dark)
+        k = max(0.0, min(1.0, 1.0 - k if self.inverted else k))
+        return self.min_brightness + k * (self.max_brightness - self.min_brightness)
+
+    def update(self, now=None):
+        """Une mise à jour : lecture, lissage, application si l'écart dépasse l'hystérésis"""
+        if now is None:
+            now = time.monotonic()
+        light = self.sampler.stats(self.channel, self.window)['mean']
+        if light is None:
+            return False
+        target = self.target(light)
+        if self.level is None:
+            self.level = target
+        else:
+            dt = now - self._last_update
+            self.level += (target - self.level) * (1.0 - math.exp(-dt / self.smoothing))
+        self._last_update = now
+
+        brightness = int(round(self.level))
+        # Les bornes sont rejointes exactement, même sous l'hystérésis
+        at_limit = brightness in (self.min_brightness, self.max_brightness)
+        if self.applied is not None and (brightness == self.applied or
+                                         (abs(brightness - self.applied) < self.hysteresis and not at_limit)):
+            return False
+        self.apply(brightness)
+        return True
+
+    def apply(self, brightness):
+        """Applique une luminosité à tous les récepteurs (une trame par bande WS2812)"""
+        self.applied = brightness
+        self.changes += 1
+        for sink in self.sinks:
+            sink.led_brightness = brightness
+            if isinstance(sink, WS2812Controller):
+                sink.show()
+
+    def _run(self):
+        period = 1.0 / self.rate
+        while not self._stop_event.is_set():
+            self.update()
+            self._stop_event.wait(period)
+
+    def start(self):
+        """Démarre la régulation en tâche de fond"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="auto-brightness", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Arrête la régulation (la luminosité reste à sa dernière valeur)"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
 def manual_control():
     """
     Protocole manuel pour piloter les LED (Partie 2 de la tâche)
@@ -353,33 +725,33 @@ def demo_sequence():
     print("\n🎭 DÉMONSTRATION LED WS2812")
     print("="*40)
     
+    # Les animations tournent en tâche de fond : le thread principal reste libre
+    engine = AnimationEngine(controller, fps=30)
+    engine.start()
+    
     try:
         # Test 1: Allumage séquentiel
         print("🔄 Test 1: Allumage séquentiel...")
-        for i in range(controller.led_count):
-            controller.control_led(i, 'R', 100)
-            time.sleep(0.2)
+        engine.wait(engine.play(Wipe(color=(100, 0, 0), speed=5)))
         time.sleep(1)
         
-        # Test 2: Couleurs par position
+        # Test 2: Couleurs par position (clignotements déphasés par groupe)
         print("🔄 Test 2: Couleurs par position...")
-        positions = [('C', 'R'), ('BG', 'G'), ('BD', 'B'), ('AG', 'R'), ('AD', 'G')]
-        for position, color in positions:
-            controller.control_group(position, color, 150)
-            time.sleep(0.8)
-        time.sleep(1)
+        positions = [('C', (150, 0, 0), 0.6), ('BG', (0, 150, 0), 0.8), ('BD', (0, 0, 150), 1.0),
+                     ('AG', (150, 0, 0), 1.2), ('AD', (0, 150, 0), 1.4)]
+        for position, color, period in positions:
+            engine.play(Blink(position, color, period=period, duration=4.0))
+        time.sleep(4.2)
         
-        # Test 3: Variation d'intensité
+        # Test 3: Variation d'intensité + chenillard sur l'arrière
         print("🔄 Test 3: Variation d'intensité...")
-        for intensity in range(0, 256, 25):
-            controller.control_led(7, 'B', intensity)  # LED centrale
-            time.sleep(0.2)
+        engine.play(Chase('AG', (150, 80, 0), speed=6, tail=2, duration=4.0))
+        engine.play(Chase('AD', (150, 80, 0), speed=6, tail=2, duration=4.0))
+        engine.wait(engine.play(Breathe(7, (0, 0, 255), period=2.0, duration=4.0)))  # LED centrale
         
         # Test 4: Extinction progressive
         print("🔄 Test 4: Extinction progressive...")
-        for i in range(controller.led_count):
-            controller.control_led(i, 'N', 0)
-            time.sleep(0.1)
+        engine.wait(engine.play(Fade(start=(120, 120, 120), end=(0, 0, 0), duration=1.5)))
         
         print("✅ Démonstration terminée")
     
@@ -387,6 +759,8 @@ def demo_sequence():
         print("\n⏹️  Démonstration interrompue")
     
     finally:
+        engine.stop()
+        engine.print_stats()
         controller.close()
 
 if __name__ == "__main__":
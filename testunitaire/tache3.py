@@ -1,23 +1,26 @@
 #!/usr/bin/env python3
 
-import time
+import bisect
+import math
 import sys
+import threading
+import time
 
-try:
-    import Adafruit_PCA9685
-    print("Bibliotheque Adafruit_PCA9685 importee avec succes")
-except ImportError:
-    print("Erreur: Module Adafruit_PCA9685 non trouve")
-    print("Installation: sudo pip3 install Adafruit-PCA9685")
-    sys.exit(1)
+import calibration
+import hal
 
 class ServoController:
-    def __init__(self):
-        """Initialise le controleur PCA9685 a l'adresse 0x5f"""
+    def __init__(self, lut_resolution=0.25):
+        """
+        Initialise le controleur PCA9685 a l'adresse 0x5f
+        
+        Args:
+            lut_resolution (float): Pas angulaire des tables angle -> PWM (degrés)
+        """
         try:
             # PCA9685 a l'adresse 0x5f (selon votre configuration)
-            self.pwm = Adafruit_PCA9685.PCA9685(address=0x5f, busnum=1)
-            self.pwm.set_pwm_freq(50)
+            self.pwm = hal.pca9685(address=0x5f, busnum=1)
+            self.pwm.lock_frequency(hal.SERVO_FREQUENCY)
             print("PCA9685 initialise avec succes a l'adresse 0x5f sur bus I2C 1")
             
         except Exception as e:
@@ -28,41 +31,108 @@ class ServoController:
             sys.exit(1)
         
         # Configuration des servos avec OFFSET DE CALIBRAGE
+        # max_speed (°/s) et max_accel (°/s²) limitent les trajectoires du planificateur
+        # Optionnel: "calibration_points": [(angle mécanique, PWM), ...] pour un servo non linéaire
         self.servo_configs = {
-            0: {"name": "Direction roues", "min_angle": -90, "max_angle": 5, "offset": -35},  # Roues - pas changé
-            1: {"name": "Tete L/R", "min_angle": -90, "max_angle": 90, "offset": -45},        # Tête L/R - décalé de 5° de plus vers la DROITE
-            2: {"name": "Tete H/B", "min_angle": -45, "max_angle": 45, "offset": -45},        # Tête H/B - décalé de 5° de plus vers la DROITE  
-            15: {"name": "Servo libre", "min_angle": -90, "max_angle": 90, "offset": -45}     # Servo libre - décalé de 5° de plus vers la DROITE
+            0: {"name": "Direction roues", "min_angle": -90, "max_angle": 5, "offset": -35,   # Roues - pas changé
+                "max_speed": 250, "max_accel": 2000},
+            1: {"name": "Tete L/R", "min_angle": -90, "max_angle": 90, "offset": -45,         # Tête L/R - décalé de 5° de plus vers la DROITE
+                "max_speed": 180, "max_accel": 900},
+            2: {"name": "Tete H/B", "min_angle": -45, "max_angle": 45, "offset": -45,         # Tête H/B - décalé de 5° de plus vers la DROITE  
+                "max_speed": 180, "max_accel": 900},
+            15: {"name": "Servo libre", "min_angle": -90, "max_angle": 90, "offset": -45,     # Servo libre - décalé de 5° de plus vers la DROITE
+                 "max_speed": 120, "max_accel": 600}
         }
         
+        # Valeurs calibrées (offsets, points de calibrage) enregistrées par 'calibrate'
+        self.calibration = calibration.get_store()
+        for channel, values in self.calibration.section("servos").items():
+            if int(channel) in self.servo_configs:
+                self.servo_configs[int(channel)].update(values)
+        self._load_steering_calibration(self.calibration.section("steering"))
+        
         # Positions actuelles (angles logiques, pas mécaniques)
         self.current_positions = {ch: 0 for ch in self.servo_configs.keys()}
         
+        # Planificateur de trajectoires (démarré au premier glide_to)
+        self.planner = ServoMotionPlanner(self)
+        
         # Valeurs PWM calibrees pour servos standard
         self.servo_min = 150
         self.servo_max = 650
         self.servo_center = 400
         
+        # Tables angle -> PWM compilées par canal (recalculées si offset/limites changent)
+        self.lut_resolution = lut_resolution
+        self._curves = {}
+        # Table sans offset pour l'assistant de calibrage (angles mécaniques)
+        self.mechanical_curve = ServoCurve(0, -90, 90, self.servo_min, self.servo_center,
+                                           self.servo_max, resolution=lut_resolution)
+        
         print("Configuration terminee - Initialisation des servos...")
         self.move_to_center()
     
+    def _load_steering_calibration(self, steering):
+        """
+        Applique le centre et les limites PWM de la direction (section 'steering')
+        
+        Mesurés par tache4.servo_calibration : PWM roues droites (angle logique 0)
+        et à ±50°. Ils deviennent les points de calibrage du canal, sauf si
+        celui-ci a déjà ses propres points. Sans section, la loi linéaire
+        servo_min/servo_center/servo_max s'applique.
+        """
+        if not steering:
+            return
+        address = steering.get("address", 0x5f)
+        if isinstance(address, str):
+            address = int(address, 16)      # enregistrée comme "0x5f" par servo_calibration
+        if address != self.pwm.address:
+            return
+        config = self.servo_configs.get(int(steering.get("channel", 0)))
+        if config is None or config.get("calibration_points"):
+            return
+        offset = config["offset"]
+        config["calibration_points"] = [
+            (offset - 50, steering.get("left_50", 250)),
+            (offset, steering.get("center", 300)),
+            (offset + 50, steering.get("right_50", 350)),
+        ]
+    
     def angle_to_pwm(self, channel, logical_angle):
-        """Convertit un angle logique en valeur PWM avec calibrage"""
+        """Convertit un angle logique en valeur PWM avec calibrage (table compilée du canal)"""
         config = self.servo_configs[channel]
-        
-        # Appliquer l'offset de calibrage
-        mechanical_angle = logical_angle + config["offset"]
-        
-        # Limiter l'angle mécanique
-        mechanical_angle = max(-90, min(90, mechanical_angle))
-        
-        # Convertir en PWM
-        pwm_range = self.servo_max - self.servo_min
-        pwm_value = self.servo_center + int((mechanical_angle / 90.0) * (pwm_range / 2))
-        return max(self.servo_min, min(self.servo_max, pwm_value))
+        curve = self._curves.get(channel)
+        if (curve is None or curve.offset != config["offset"]
+                or curve.min_angle != config["min_angle"] or curve.max_angle != config["max_angle"]):
+            curve = self._compile_curve(channel)
+        return curve.pwm(logical_angle)
+    
+    def _compile_curve(self, channel):
+        """Compile la table angle -> PWM d'un canal à partir de servo_configs"""
+        config = self.servo_configs[channel]
+        curve = ServoCurve(config["offset"], config["min_angle"], config["max_angle"],
+                           self.servo_min, self.servo_center, self.servo_max,
+                           resolution=self.lut_resolution,
+                           points=config.get("calibration_points"))
+        self._curves[channel] = curve
+        return curve
     
-    def set_angle(self, channel, logical_angle):
-        """Definit l'angle logique d'un servo (avec calibrage automatique)"""
+    def invalidate_curves(self, channel=None):
+        """Force la recompilation des tables (après modification des points de calibrage)"""
+        if channel is None:
+            self._curves.clear()
+        else:
+            self._curves.pop(channel, None)
+    
+    def set_angle(self, channel, logical_angle, verbose=True):
+        """
+        Definit l'angle logique d'un servo (avec calibrage automatique)
+        
+        Args:
+            channel (int): Canal du servo
+            logical_angle (float): Angle logique (fractionnaire accepté)
+            verbose (bool): Affiche la consigne (désactivé dans les boucles rapides)
+        """
         if channel not in self.servo_configs:
             print(f"Canal {channel} non configure")
             return False
@@ -81,8 +151,9 @@ class ServoController:
             self.pwm.set_pwm(channel, 0, pwm_value)
             self.current_positions[channel] = logical_angle
             
-            print(f"✓ {config['name']} (CH{channel}) -> {logical_angle:+4.0f}° logique "
-                  f"({mechanical_angle:+4.0f}° mécanique, PWM: {pwm_value})")
+            if verbose:
+                print(f"✓ {config['name']} (CH{channel}) -> {logical_angle:+4.0f}° logique "
+                      f"({mechanical_angle:+4.0f}° mécanique, PWM: {pwm_value})")
             return True
             
         except Exception as e:
@@ -90,32 +161,20 @@ class ServoController:
             return False
     
     def save_config_to_file(self):
-        """Sauvegarde automatiquement la configuration dans le fichier"""
+        """Enregistre les offsets de calibrage dans la base de calibrage (calibration.json)"""
         try:
-            # Lire le fichier actuel
-            with open(__file__, 'r') as file:
-                lines = file.readlines()
-            
-            # Modifier les lignes contenant les offsets
-            for i, line in enumerate(lines):
-                for channel, config in self.servo_configs.items():
-                    if f'"{channel}":' in line and '"offset":' in line:
-                        # Remplacer l'ancienne valeur d'offset
-                        import re
-                        new_line = re.sub(r'"offset":\s*[+-]?\d+', f'"offset": {config["offset"]}', line)
-                        lines[i] = new_line
-                        break
-            
-            # Écrire le fichier modifié
-            with open(__file__, 'w') as file:
-                file.writelines(lines)
-            
-            print(f"✅ Configuration sauvegardée dans {__file__}")
+            self.calibration.update("servos", {
+                channel: {"offset": config["offset"]}
+                for channel, config in self.servo_configs.items()
+            })
+            print(f"✅ Configuration sauvegardée dans {self.calibration.path}")
             return True
             
         except Exception as e:
             print(f"❌ Erreur lors de la sauvegarde: {e}")
             return False
+    
+    def calibrate_servo(self, channel):
         """Assistant de calibrage pour un servo"""
         if channel not in self.servo_configs:
             print(f"Canal {channel} non configure")
@@ -136,11 +195,8 @@ class ServoController:
         test_angles = [-30, -25, -20, -15, -10, -8, -6, -4, -2, 0, 2, 4]
         
         for angle in test_angles:
-            # Utiliser l'ancien calcul (sans offset) pour le calibrage
-            mechanical_angle = angle
-            pwm_range = self.servo_max - self.servo_min
-            pwm_value = self.servo_center + int((mechanical_angle / 90.0) * (pwm_range / 2))
-            pwm_value = max(self.servo_min, min(self.servo_max, pwm_value))
+            # Table sans offset : l'angle testé est l'angle mécanique
+            pwm_value = self.mechanical_curve.pwm(angle)
             
             self.pwm.set_pwm(channel, 0, pwm_value)
             print(f"\nPosition test: {angle}° (PWM: {pwm_value})")
@@ -149,14 +205,12 @@ class ServoController:
             
             if response == 'y':
                 # L'utilisateur a trouvé le centre
-                offset = -angle  # Si angle==-30 donne le centre, offset = +30
+                offset = angle  # Si angle==-30 donne le centre, 0° logique = -30° mécanique
                 config["offset"] = offset
                 print(f"\n✅ Calibrage terminé!")
                 print(f"   Offset trouvé: {offset}°")
                 print(f"   Maintenant 0° logique = centre mécanique")
-                print(f"   ⚠️  IMPORTANT: Pour sauvegarder définitivement,")
-                print(f"   modifiez manuellement le fichier:")
-                print(f"   Changez 'offset': {config['offset']-offset} en 'offset': {offset}")
+                self.save_config_to_file()
                 
                 # Test du calibrage
                 self.set_angle(channel, 0)
@@ -169,8 +223,8 @@ class ServoController:
         
         # Si aucune position n'était correcte
         print("\n⚠️  Aucune position ne correspondait au centre.")
-        print("Vous pouvez ajuster manuellement l'offset dans le code:")
-        print(f"Dans servo_configs[{channel}], changez 'offset': {config['offset']}")
+        print("Vous pouvez ajuster manuellement l'offset dans la base de calibrage:")
+        print(f"{self.calibration.path}, section \"servos\" > \"{channel}\" (actuel: 'offset': {config['offset']})")
     
     def test_servo(self, channel):
         """Test d'un servo avec mouvement fluide"""
@@ -185,31 +239,46 @@ class ServoController:
         min_angle = config["min_angle"]
         max_angle = config["max_angle"]
         
-        # Mouvement lent de min a max
+        # Mouvement lent de min a max (vitesse limitée à la moitié du maximum)
         print(f"   Mouvement {min_angle}° -> {max_angle}°")
-        for angle in range(min_angle, max_angle + 1, 10):
-            self.set_angle(channel, angle)
-            time.sleep(0.2)
+        self.glide_to(channel, min_angle)
+        self.glide_to(channel, max_angle, max_speed=config["max_speed"] / 2)
         
         time.sleep(0.5)
         
         # Mouvement rapide de max a min
         print(f"   Mouvement {max_angle}° -> {min_angle}°")
-        for angle in range(max_angle, min_angle - 1, -15):
-            self.set_angle(channel, angle)
-            time.sleep(0.1)
+        self.glide_to(channel, min_angle)
         
         # Retour au centre
         print("   Retour au centre logique (0°)")
-        self.set_angle(channel, 0)
+        self.glide_to(channel, 0)
         print(f"✅ Test servo {channel} termine")
     
+    def glide_to(self, channel, logical_angle, wait=True, max_speed=None):
+        """
+        Déplacement fluide vers un angle (vitesse et accélération limitées)
+        
+        Args:
+            channel (int): Canal du servo
+            logical_angle (float): Angle logique cible
+            wait (bool): Attend la fin du mouvement
+            max_speed (float): Vitesse max pour ce mouvement (°/s, défaut: servo_configs)
+        """
+        self.planner.start()
+        if not self.planner.set_target(channel, logical_angle, max_speed=max_speed):
+            return False
+        if wait:
+            self.planner.wait(channel)
+        return True
+    
     def move_to_center(self):
         """Place tous les servos au centre LOGIQUE (0°)"""
         print("\n🎯 Deplacement vers le centre logique...")
-        for channel in self.servo_configs.keys():
-            self.set_angle(channel, 0)
-            time.sleep(0.3)
+        # Une seule écriture I2C en bloc pour tous les servos
+        with self.pwm.transaction():
+            for channel in self.servo_configs.keys():
+                self.set_angle(channel, 0)
         print("✅ Tous les servos au centre logique")
     
     def show_status(self):
@@ -239,6 +308,7 @@ class ServoController:
         print(f"\n{'='*55}")
         print("⌨️  COMMANDES:")
         print("  <canal> <angle>    → Déplacer servo (ex: 0 30)")
+        print("  glide <canal> <angle> → Déplacement fluide (ex: glide 1 45)")
         print("  center             → Tous les servos à 0° logique")
         print("  status             → Afficher positions")
         print("  test <canal>       → Test d'un servo (ex: test 15)")
@@ -283,6 +353,208 @@ class ServoController:
         print("\n✅ Test de tous les servos terminé")
         self.move_to_center()
 
+class ServoMotionPlanner:
+    """
+    Planificateur de trajectoires pour tous les servos
+    
+    Chaque canal avance vers sa cible avec un profil trapézoïdal (vitesse et
+    accélération bornées par servo_configs). Un seul timer met à jour tous les
+    canaux, en une transaction PCA9685 par tick. Une nouvelle cible peut être
+    donnée en plein mouvement : la vitesse courante est conservée.
+    """
+    
+    def __init__(self, controller, rate=100):
+        """
+        Args:
+            controller (ServoController): Contrôleur des servos
+            rate (float): Fréquence de mise à jour (Hz)
+        """
+        self.controller = controller
+        self.rate = rate
+        self.targets = dict(controller.current_positions)
+        self.positions = {ch: float(a) for ch, a in controller.current_positions.items()}
+        self.velocities = {ch: 0.0 for ch in controller.current_positions}
+        self._speed_limits = {}
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._stop_event = threading.Event()
+        self._thread = None
+        self.ticks = 0
+        self.late_ticks = 0
+    
+    def set_target(self, channel, logical_angle, max_speed=None):
+        """
+        Change la cible d'un canal (en plein mouvement si besoin)
+        
+        Returns:
+            bool: False si le canal ou l'angle est invalide
+        """
+        config = self.controller.servo_configs.get(channel)
+        if config is None:
+            print(f"Canal {channel} non configure")
+            return False
+        if not math.isfinite(logical_angle):
+            # nan passerait les comparaisons de bornes et la cible ne serait jamais atteinte
+            print(f"Angle {logical_angle} invalide pour {config['name']}")
+            return False
+        if logical_angle < config["min_angle"] or logical_angle > config["max_angle"]:
+            print(f"Angle {logical_angle} hors limites pour {config['name']}")
+            return False
+        with self._lock:
+            if channel not in self.positions or not self.is_moving(channel):
+                # Repart de la dernière position écrite (éventuellement par set_angle)
+                self.positions[channel] = float(self.controller.current_positions.get(channel, 0))
+                self.velocities[channel] = 0.0
+            self.targets[channel] = logical_angle
+            self._speed_limits[channel] = max_speed
+        return True
+    
+    def is_moving(self, channel=None):
+        """Indique si un canal (ou n'importe lequel) est en mouvement"""
+        channels = [channel] if channel is not None else list(self.targets)
+        return any(self.positions[ch] != self.targets[ch] or self.velocities[ch] != 0.0
+                   for ch in channels)
+    
+    def wait(self, channel=None, timeout=None):
+        """Attend que le canal (ou tous les canaux) ait atteint sa cible"""
+        with self._idle:
+            return self._idle.wait_for(lambda: not self.is_moving(channel), timeout)
+    
+    def _advance(self, channel, dt):
+        """Fait avancer un canal d'un pas dt (profil trapézoïdal)"""
+        config = self.controller.servo_configs[channel]
+        max_speed = self._speed_limits.get(channel) or config["max_speed"]
+        max_accel = config["max_accel"]
+        position = self.positions[channel]
+        velocity = self.velocities[channel]
+        error = self.targets[channel] - position
+        
+        # Vitesse permettant encore de s'arrêter sur la cible
+        desired = math.copysign(min(max_speed, math.sqrt(2 * max_accel * abs(error))), error)
+        dv = max(-max_accel * dt, min(max_accel * dt, desired - velocity))
+        velocity += dv
+        position += velocity * dt
+        
+        # Cible atteinte ou dépassée : on s'y fixe
+        if abs(error) < 1e-3 or (self.targets[channel] - position) * error <= 0:
+            position = self.targets[channel]
+            velocity = 0.0
+        self.positions[channel] = position
+        self.velocities[channel] = velocity
+    
+    def step(self, dt):
+        """Met à jour tous les canaux en mouvement (un tick du timer)"""
+        with self._lock:
+            moving = [ch for ch in self.targets if self.positions[ch] != self.targets[ch]
+                      or self.velocities[ch] != 0.0]
+            for channel in moving:
+                self._advance(channel, dt)
+            if moving:
+                with self.controller.pwm.transaction():
+                    for channel in moving:
+                        self.controller.set_angle(channel, self.positions[channel], verbose=False)
+            self.ticks += 1
+            # Réveille les wait(canal) dès qu'un canal arrive, même si d'autres bougent encore
+            if any(not self.is_moving(channel) for channel in moving):
+                self._idle.notify_all()
+    
+    def _run(self):
+        period = 1.0 / self.rate
+        deadline = time.monotonic()
+        while not self._stop_event.is_set():
+            self.step(period)
+            deadline += period
+            delay = deadline - time.monotonic()
+            if delay < 0:
+                self.late_ticks += 1
+                deadline = time.monotonic()
+                delay = 0
+            self._stop_event.wait(delay)
+    
+    def start(self):
+        """Démarre le timer partagé (sans effet s'il tourne déjà)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="servo-planner", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Arrête le timer (les servos restent à leur position)"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+class ServoCurve:
+    """
+    Correspondance angle logique -> PWM compilée pour un canal
+    
+    La table couvre [min_angle, max_angle] au pas `resolution` : une conversion
+    se réduit à un index arrondi au pas le plus proche (angles fractionnaires).
+    Sans points de calibrage la loi est linéaire (servo standard) ; avec des
+    points (angle mécanique, PWM) elle est interpolée par morceaux, pour les
+    servos non linéaires.
+    """
+    
+    def __init__(self, offset, min_angle, max_angle, servo_min, servo_center, servo_max,
+                 resolution=0.25, points=None):
+        """
+        Args:
+            offset (float): Offset de calibrage (angle mécanique = logique + offset)
+            min_angle, max_angle (float): Limites logiques du canal
+            servo_min, servo_center, servo_max (int): Valeurs PWM de référence
+            resolution (float): Pas angulaire de la table (degrés)
+            points (list): Points (angle mécanique, PWM) mesurés, ou None (linéaire)
+        """
+        self.offset = offset
+        self.min_angle = min_angle
+        self.max_angle = max_angle
+        self.servo_min = servo_min
+        self.servo_center = servo_center
+        self.servo_max = servo_max
+        self.resolution = resolution
+        self._scale = 1.0 / resolution
+        
+        if points and len(points) >= 2:
+            points = sorted(points)
+            self._xs = [float(angle) for angle, _ in points]
+            self._ys = [float(pwm) for _, pwm in points]
+        else:
+            self._xs = self._ys = None
+        
+        size = int(math.ceil((max_angle - min_angle) * self._scale)) + 1
+        self.table = [self._compute(min_angle + i * resolution) for i in range(size)]
+        self._last = size - 1
+    
+    def _compute(self, logical_angle):
+        """Calcul exact d'une entrée de la table"""
+        mechanical_angle = max(-90, min(90, logical_angle + self.offset))
+        
+        if self._xs is None:
+            pwm_range = self.servo_max - self.servo_min
+            pwm_value = self.servo_center + int((mechanical_angle / 90.0) * (pwm_range / 2))
+        else:
+            # Segment encadrant l'angle (prolongé aux extrémités)
+            i = bisect.bisect_right(self._xs, mechanical_angle) - 1
+            i = max(0, min(len(self._xs) - 2, i))
+            x0, x1 = self._xs[i], self._xs[i + 1]
+            y0, y1 = self._ys[i], self._ys[i + 1]
+            pwm_value = int(round(y0 + (mechanical_angle - x0) * (y1 - y0) / (x1 - x0)))
+        
+        return max(self.servo_min, min(self.servo_max, pwm_value))
+    
+    def pwm(self, logical_angle):
+        """Valeur PWM pour un angle logique (borné aux limites du canal)"""
+        i = int((logical_angle - self.min_angle) * self._scale + 0.5)
+        if i < 0:
+            i = 0
+        elif i > self._last:
+            i = self._last
+        return self.table[i]
+
+
 def main():
     """Programme principal"""
     print("="*55)
@@ -324,6 +596,17 @@ def main():
                     except (ValueError, IndexError):
                         print("❌ Usage: test <canal> (ex: test 15)")
                 
+                elif command.startswith('glide '):
+                    try:
+                        _, channel, angle = command.split()
+                        angle = float(angle)
+                        if not math.isfinite(angle):
+                            raise ValueError(angle)
+                        controller.glide_to(int(channel), angle)
+                        controller.show_status()
+                    except ValueError:
+                        print("❌ Usage: glide <canal> <angle> (ex: glide 1 45)")
+                
                 elif command.startswith('calibrate '):
                     try:
                         channel = int(command.split()[1])
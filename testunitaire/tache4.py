@@ -22,11 +22,14 @@ ATTENTION:
     Module de transmission fragile - vitesse limitée à 25% pour sécurité!
 """
 
+import asyncio
+import math
 import time
-from board import SCL, SDA
-import busio
-from adafruit_pca9685 import PCA9685
-from adafruit_motor import motor
+
+_IMPORT_START = time.perf_counter()
+
+import calibration
+import hal
 
 # ═══════════════════════════════════════════════════════════════════════════════
 #                           CONFIGURATION SYSTÈME
@@ -59,26 +62,63 @@ def map_function(x, in_min, in_max, out_min, out_max):
     """Fonction de mapping Adeept - convertit une plage vers une autre"""
     return (x - in_min) / (in_max - in_min) * (out_max - out_min) + out_min
 
-# Configuration I2C et moteurs (exacte d'Adeept)
-print("🔧 Initialisation système Adeept...")
+# Configuration I2C et moteurs (exacte d'Adeept), créés au premier usage :
+# importer ce module (ex: pour map_function) ne touche pas au bus I2C
+pwm_motor = None
+motor1 = None
+motor2 = None
+motor3 = None
+motor4 = None
 
-# Configuration I2C
-i2c = busio.I2C(SCL, SDA)
-pwm_motor = PCA9685(i2c, address=0x5f)
-pwm_motor.frequency = 1000
+# Zones mortes par moteur (% de throttle en dessous duquel le moteur ne tourne pas),
+# lues dans la base de calibrage à l'initialisation
+motor_deadbands = {}
 
-# Création des 4 moteurs
-motor1 = motor.DCMotor(pwm_motor.channels[MOTOR_M1_IN1], pwm_motor.channels[MOTOR_M1_IN2])
-motor1.decay_mode = motor.SLOW_DECAY
+# Durées de démarrage mesurées (secondes)
+startup_times = {}
 
-motor2 = motor.DCMotor(pwm_motor.channels[MOTOR_M2_IN1], pwm_motor.channels[MOTOR_M2_IN2])
-motor2.decay_mode = motor.SLOW_DECAY
-
-motor3 = motor.DCMotor(pwm_motor.channels[MOTOR_M3_IN1], pwm_motor.channels[MOTOR_M3_IN2])
-motor3.decay_mode = motor.SLOW_DECAY
+def init_motors():
+    """Initialise le PCA9685 et les 4 moteurs (une seule fois, au premier usage)"""
+    global pwm_motor, motor1, motor2, motor3, motor4
+    if pwm_motor is not None:
+        return
+    
+    start = time.perf_counter()
+    print("🔧 Initialisation système Adeept...")
+    
+    # Configuration I2C (PCA9685 réel ou simulé selon le backend HAL)
+    # Puce partagée avec les servos de tache3 : elle reste à leur fréquence de 50 Hz
+    # (le 1 kHz de motor.py d'Adeept rendrait les impulsions des servos invalides)
+    pca = hal.pca9685(address=0x5f)
+    pca.lock_frequency(hal.SERVO_FREQUENCY)
+    
+    # Création des 4 moteurs (mode SLOW_DECAY)
+    motor1 = hal.dc_motor(pca, MOTOR_M1_IN1, MOTOR_M1_IN2)
+    motor2 = hal.dc_motor(pca, MOTOR_M2_IN1, MOTOR_M2_IN2)
+    motor3 = hal.dc_motor(pca, MOTOR_M3_IN1, MOTOR_M3_IN2)
+    motor4 = hal.dc_motor(pca, MOTOR_M4_IN1, MOTOR_M4_IN2)
+    pwm_motor = pca
+    
+    # Zones mortes mesurées par deadband_calibration()
+    for channel, values in calibration.get_store().section('motors').items():
+        motor_deadbands[int(channel)] = values.get('deadband', 0)
+    
+    startup_times['motor_init'] = time.perf_counter() - start
+    print("✅ Système Adeept initialisé")
 
-motor4 = motor.DCMotor(pwm_motor.channels[MOTOR_M4_IN1], pwm_motor.channels[MOTOR_M4_IN2])
-motor4.decay_mode = motor.SLOW_DECAY
+def startup_report():
+    """Affiche les durées de démarrage (import, init I2C/moteurs, auto-test)"""
+    print("⏱️ RAPPORT DE DÉMARRAGE TÂCHE 4:")
+    labels = {
+        'import': "Import du module",
+        'motor_init': "Init I2C + moteurs",
+        'self_test': "Auto-test moteur",
+    }
+    for key, label in labels.items():
+        if key in startup_times:
+            print(f"   {label:<20}: {startup_times[key] * 1000:8.2f} ms")
+        else:
+            print(f"   {label:<20}:   non effectué")
 
 def Motor(channel, direction, motor_speed):
     """
@@ -89,40 +129,169 @@ def Motor(channel, direction, motor_speed):
         direction (int): Direction (1=avant, -1=arrière)
         motor_speed (int): Vitesse 0-100%
     """
+    init_motors()
+    
     # Limitation vitesse
     if motor_speed > 100:
         motor_speed = 100
     elif motor_speed < 0:
         motor_speed = 0
     
+    # Compensation de la zone morte : 1% commandé = premier throttle qui fait tourner
+    deadband = motor_deadbands.get(channel, 0)
+    if deadband and motor_speed > 0:
+        motor_speed = deadband + motor_speed * (100 - deadband) / 100
+    
     # Conversion vitesse
     speed = map_function(motor_speed, 0, 100, 0, 1.0)
     if direction == -1:
         speed = -speed
     
-    # Application aux moteurs
-    if channel == 1:
-        motor1.throttle = speed
-    elif channel == 2:
-        motor2.throttle = speed
-    elif channel == 3:
-        motor3.throttle = speed
-    elif channel == 4:
-        motor4.throttle = speed
+    # Application aux moteurs (les deux canaux du pont en une écriture I2C)
+    with pwm_motor.transaction():
+        if channel == 1:
+            motor1.throttle = speed
+        elif channel == 2:
+            motor2.throttle = speed
+        elif channel == 3:
+            motor3.throttle = speed
+        elif channel == 4:
+            motor4.throttle = speed
 
 def motorStop():
     """Arrêt de tous les moteurs - fonction Adeept"""
-    motor1.throttle = 0
-    motor2.throttle = 0
-    motor3.throttle = 0
-    motor4.throttle = 0
+    if pwm_motor is None:
+        return  # moteurs jamais initialisés : rien à arrêter
+    with pwm_motor.transaction():
+        motor1.throttle = 0
+        motor2.throttle = 0
+        motor3.throttle = 0
+        motor4.throttle = 0
 
 def destroy():
     """Nettoyage système - fonction Adeept"""
+    global pwm_motor
+    if pwm_motor is None:
+        return
     motorStop()
     pwm_motor.deinit()
+    pwm_motor = None
 
-print("✅ Système Adeept initialisé")
+# ═══════════════════════════════════════════════════════════════════════════════
+#                           GÉNÉRATEUR DE RAMPE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# Profils de rampe : progression temporelle (0-1) -> progression de vitesse (0-1)
+RAMP_PROFILES = {
+    'linear': lambda x: x,
+    'scurve': lambda x: x * x * (3 - 2 * x),                        # départ et arrivée en douceur
+    'exponential': lambda x: (1 - math.exp(-5 * x)) / (1 - math.exp(-5)),
+}
+
+RAMP_TICK = 0.02     # Période de mise à jour par défaut (50 Hz)
+
+class MotorRamp:
+    """
+    Générateur de rampe non bloquant pour un moteur
+    
+    La consigne est calculée à partir du temps monotone écoulé depuis le début
+    de la rampe : tick() peut être appelé à n'importe quelle cadence (boucle
+    principale, ordonnanceur, tâche asyncio) sans fausser la durée de la rampe.
+    Les vitesses sont signées : +x% en avant, -x% en arrière.
+    """
+    
+    def __init__(self, motor_channel=PROPULSION_MOTOR, clock=time.monotonic):
+        """
+        Args:
+            motor_channel (int): Canal moteur (1, 2, 3, 4)
+            clock: Horloge monotone en secondes (injectable pour la simulation)
+        """
+        self.motor_channel = motor_channel
+        self.clock = clock
+        self.speed = 0.0              # Dernière vitesse signée appliquée (%)
+        self.active = False
+        self.duration_error = None    # Retard de fin de rampe mesuré (s)
+        self._start_speed = 0.0
+        self._target_speed = 0.0
+        self._duration = 0.0
+        self._profile = RAMP_PROFILES['linear']
+        self._t0 = 0.0
+    
+    def start(self, target_speed, direction=DIR_FORWARD, duration=1.0, profile='linear',
+              from_speed=None):
+        """
+        Démarre une rampe (accélération, décélération ou inversion de sens)
+        
+        Args:
+            target_speed (float): Vitesse cible (0-100%)
+            direction (int): Direction (DIR_FORWARD ou DIR_BACKWARD)
+            duration (float): Durée de la rampe en secondes
+            profile (str): 'linear', 's-curve' ('scurve') ou 'exponential'
+            from_speed (float): Vitesse signée de départ (par défaut: vitesse actuelle)
+        """
+        profile = profile.replace('-', '')
+        if profile not in RAMP_PROFILES:
+            raise ValueError(f"Profil de rampe '{profile}' inconnu ({', '.join(RAMP_PROFILES)})")
+        # max/min laisseraient passer nan (min(100, nan) vaut 100 : pleine vitesse)
+        for name, value in (('vitesse', target_speed), ('durée', duration), ('vitesse de départ', from_speed)):
+            if value is not None and not math.isfinite(value):
+                raise ValueError(f"{name} non finie: {value}")
+        
+        self._start_speed = self.speed if from_speed is None else from_speed
+        self._target_speed = max(0, min(100, target_speed)) * direction
+        self._duration = max(duration, 0.0)
+        self._profile = RAMP_PROFILES[profile]
+        self._t0 = self.clock()
+        self.duration_error = None
+        self.active = True
+    
+    def value_at(self, now):
+        """Vitesse signée de la rampe à l'instant now"""
+        if self._duration <= 0:
+            return self._target_speed
+        progress = min(1.0, max(0.0, (now - self._t0) / self._duration))
+        return self._start_speed + (self._target_speed - self._start_speed) * self._profile(progress)
+    
+    def tick(self, now=None):
+        """
+        Met à jour le moteur selon le temps écoulé
+        
+        Returns:
+            bool: True tant que la rampe est en cours
+        """
+        if not self.active:
+            return False
+        if now is None:
+            now = self.clock()
+        
+        speed = self.value_at(now)
+        if speed != self.speed:
+            direction = DIR_FORWARD if speed >= 0 else DIR_BACKWARD
+            Motor(self.motor_channel, direction, abs(speed))
+            self.speed = speed
+        
+        if now - self._t0 >= self._duration:
+            self.active = False
+            self.duration_error = (now - self._t0) - self._duration
+        return self.active
+    
+    def cancel(self):
+        """Interrompt la rampe en laissant le moteur à sa vitesse actuelle"""
+        self.active = False
+    
+    def run_blocking(self, period=RAMP_TICK):
+        """Exécute la rampe jusqu'au bout (échéances fixes, sans dérive)"""
+        deadline = self.clock()
+        while self.tick():
+            deadline += period
+            delay = deadline - self.clock()
+            if delay > 0:
+                time.sleep(delay)
+    
+    async def run_async(self, period=RAMP_TICK):
+        """Exécute la rampe dans une tâche asyncio"""
+        while self.tick():
+            await asyncio.sleep(period)
 
 # ═══════════════════════════════════════════════════════════════════════════════
 #                              TÂCHE 4 - CLASSE PRINCIPALE
@@ -131,28 +300,32 @@ print("✅ Système Adeept initialisé")
 class Task4Controller:
     """Contrôleur principal pour la Tâche 4"""
     
-    def __init__(self, motor_channel=PROPULSION_MOTOR):
+    def __init__(self, motor_channel=PROPULSION_MOTOR, self_test=False):
         """
         Initialisation du contrôleur Tâche 4
         
         Args:
             motor_channel (int): Canal du moteur de propulsion (par défaut: 1)
+            self_test (bool): Fait tourner le moteur 300 ms pour vérifier la connexion
         """
         self.motor_channel = motor_channel
         self.current_speed = 0
         self.current_direction = DIR_FORWARD
         self.is_running = False
+        self.ramp = MotorRamp(motor_channel)
         
         print(f"🤖 Contrôleur Tâche 4 initialisé")
         print(f"   Moteur de propulsion: {motor_channel}")
         print(f"   Vitesse max sécurisée: {MAX_SAFE_SPEED}%")
         
-        # Test initial
-        self._test_motor_connection()
+        # Test initial (optionnel : bloque 0.3 s)
+        if self_test:
+            self._test_motor_connection()
     
     def _test_motor_connection(self):
         """Test de connexion du moteur sélectionné"""
         print(f"🧪 Test connexion moteur {self.motor_channel}...")
+        start = time.perf_counter()
         try:
             Motor(self.motor_channel, DIR_FORWARD, 5)  # Test 5%
             time.sleep(0.3)
@@ -160,6 +333,7 @@ class Task4Controller:
             print("   ✅ Moteur répond correctement")
         except Exception as e:
             print(f"   ❌ Erreur test moteur: {e}")
+        startup_times['self_test'] = time.perf_counter() - start
     
     def _validate_speed(self, speed):
         """Validation et limitation de vitesse"""
@@ -183,6 +357,7 @@ class Task4Controller:
         self.current_speed = speed
         self.current_direction = direction
         self.is_running = (speed > 0)
+        self.ramp.speed = speed * direction
     
     # ═══════════════════════════════════════════════════════════════════════════
     #                           TÂCHE 4.1 - FONCTION SIMPLE
@@ -198,6 +373,7 @@ class Task4Controller:
         print(f"🐌 Fonction simple - Commande: {command}")
         
         command = command.lower().strip()
+        self.ramp.cancel()
         
         if command == "avant":
             Motor(self.motor_channel, DIR_FORWARD, MAX_SAFE_SPEED)
@@ -222,64 +398,34 @@ class Task4Controller:
     #                         TÂCHE 4.2 - RAMPE 1 SECONDE
     # ═══════════════════════════════════════════════════════════════════════════
     
-    def ramp_1_second(self, target_speed, direction=DIR_FORWARD):
+    def ramp_1_second(self, target_speed, direction=DIR_FORWARD, profile='linear', blocking=True):
         """
         2. Rampe de montée en vitesse d'environ 1 seconde pour 0 à vitesse max
         
+        La rampe part de la vitesse actuelle (0 si le moteur est arrêté).
+        
         Args:
             target_speed (int): Vitesse cible (0-100%)
             direction (int): Direction (DIR_FORWARD ou DIR_BACKWARD)
+            profile (str): Profil de rampe ('linear', 'scurve', 'exponential')
+            blocking (bool): Si False, retourne immédiatement ; la boucle appelante
+                             fait avancer la rampe avec update()
         """
         # Validation des paramètres
         target_speed = self._validate_speed(target_speed)
         direction = self._validate_direction(direction)
         
         direction_str = "avant" if direction == DIR_FORWARD else "arrière"
-        print(f"📈 Rampe 1 seconde - 0 → {target_speed}% ({direction_str})")
-        
-        # Arrêt initial pour sécurité
-        Motor(self.motor_channel, DIR_FORWARD, 0)
-        time.sleep(0.1)
-        
-        # Configuration rampe
-        ramp_duration = 1.0  # 1 seconde exactement
-        num_steps = 20       # 20 étapes = 50ms par étape
-        step_delay = ramp_duration / num_steps
-        speed_increment = target_speed / num_steps
-        
-        print(f"   Configuration: {num_steps} étapes, {step_delay*1000:.1f}ms/étape")
+        print(f"📈 Rampe 1 seconde - {self.current_speed:.0f}% → {target_speed}% "
+              f"({direction_str}, profil {profile})")
         
-        try:
-            # Exécution de la rampe
-            for step in range(num_steps + 1):
-                current_speed = int(speed_increment * step)
-                Motor(self.motor_channel, direction, current_speed)
-                
-                # Affichage progrès (tous les 4 étapes + final)
-                if step % 4 == 0 or step == num_steps:
-                    progress = (step / num_steps) * 100
-                    print(f"   Étape {step:2d}/{num_steps}: {current_speed:3d}% ({progress:3.0f}%)")
-                
-                if step < num_steps:
-                    time.sleep(step_delay)
-            
-            self._update_status(target_speed, direction)
-            print(f"   ✅ Rampe terminée - Vitesse finale: {target_speed}%")
-            
-        except KeyboardInterrupt:
-            print("\n   ⚠ Rampe interrompue par utilisateur")
-            Motor(self.motor_channel, DIR_FORWARD, 0)
-            self._update_status(0, DIR_FORWARD)
-        except Exception as e:
-            print(f"\n   ❌ Erreur pendant rampe: {e}")
-            Motor(self.motor_channel, DIR_FORWARD, 0)
-            self._update_status(0, DIR_FORWARD)
+        self._run_ramp(target_speed, direction, 1.0, profile, blocking)
     
     # ═══════════════════════════════════════════════════════════════════════════
     #                      TÂCHE 4.3 - RAMPE PERSONNALISÉE
     # ═══════════════════════════════════════════════════════════════════════════
     
-    def custom_ramp(self, vitesse, sens, pente_rampe):
+    def custom_ramp(self, vitesse, sens, pente_rampe, profile='linear', blocking=True):
         """
         3. Fonction avec 3 paramètres : vitesse, sens, pente de la rampe
         
@@ -287,6 +433,8 @@ class Task4Controller:
             vitesse (int): Vitesse cible (0-100%)
             sens (int): Direction (DIR_FORWARD=1 ou DIR_BACKWARD=-1)
             pente_rampe (float): Temps de rampe en secondes
+            profile (str): Profil de rampe ('linear', 'scurve', 'exponential')
+            blocking (bool): Si False, la rampe avance avec update()
         """
         # Validation des paramètres
         vitesse = self._validate_speed(vitesse)
@@ -298,46 +446,52 @@ class Task4Controller:
         
         sens_str = "avant" if sens == DIR_FORWARD else "arrière"
         print(f"⚙️ Rampe personnalisée")
-        print(f"   Vitesse cible: {vitesse}%")
+        print(f"   Vitesse: {self.current_speed:.0f}% → {vitesse}%")
         print(f"   Direction: {sens_str}")
-        print(f"   Durée rampe: {pente_rampe}s")
-        
-        # Arrêt initial
-        Motor(self.motor_channel, DIR_FORWARD, 0)
-        time.sleep(0.1)
+        print(f"   Durée rampe: {pente_rampe}s (profil {profile})")
         
-        # Calcul des étapes (min 10, max 100)
-        num_steps = max(10, min(100, int(pente_rampe * 20)))
-        step_delay = pente_rampe / num_steps
-        speed_increment = vitesse / num_steps
-        
-        print(f"   Configuration: {num_steps} étapes, {step_delay*1000:.1f}ms/étape")
+        self._run_ramp(vitesse, sens, pente_rampe, profile, blocking)
+    
+    def _run_ramp(self, speed, direction, duration, profile, blocking):
+        """Démarre une rampe et l'exécute jusqu'au bout si blocking"""
+        self.ramp.start(speed, direction, duration, profile,
+                        from_speed=self.current_speed * self.current_direction)
+        if not blocking:
+            return
         
         try:
-            # Exécution de la rampe
-            for step in range(num_steps + 1):
-                current_speed = int(speed_increment * step)
-                Motor(self.motor_channel, sens, current_speed)
-                
-                # Affichage progrès (tous les 10% + final)
-                if step % max(1, num_steps // 10) == 0 or step == num_steps:
-                    progress = (step / num_steps) * 100
-                    print(f"   Étape {step:3d}/{num_steps}: {current_speed:3d}% ({progress:3.0f}%)")
-                
-                if step < num_steps:
-                    time.sleep(step_delay)
-            
-            self._update_status(vitesse, sens)
-            print(f"   ✅ Rampe personnalisée terminée")
+            self.ramp.run_blocking()
+            self.update()
+            print(f"   ✅ Rampe terminée - Vitesse finale: {speed}% "
+                  f"(écart de durée: {self.ramp.duration_error * 1000:+.1f} ms)")
             
         except KeyboardInterrupt:
             print("\n   ⚠ Rampe interrompue par utilisateur")
-            Motor(self.motor_channel, DIR_FORWARD, 0)
-            self._update_status(0, DIR_FORWARD)
+            self.emergency_stop()
         except Exception as e:
             print(f"\n   ❌ Erreur pendant rampe: {e}")
-            Motor(self.motor_channel, DIR_FORWARD, 0)
-            self._update_status(0, DIR_FORWARD)
+            self.emergency_stop()
+    
+    def update(self, now=None):
+        """
+        Fait avancer la rampe en cours (mode non bloquant)
+        
+        À appeler à chaque tour de la boucle principale : la direction, les
+        capteurs et les LED continuent de tourner pendant l'accélération.
+        
+        Returns:
+            bool: True tant qu'une rampe est en cours
+        """
+        running = self.ramp.tick(now)
+        speed = self.ramp.speed
+        self._update_status(abs(speed), DIR_FORWARD if speed >= 0 else DIR_BACKWARD)
+        return running
+    
+    def emergency_stop(self):
+        """Annule la rampe en cours et arrête le moteur"""
+        self.ramp.cancel()
+        Motor(self.motor_channel, DIR_FORWARD, 0)
+        self._update_status(0, DIR_FORWARD)
     
     # ═══════════════════════════════════════════════════════════════════════════
     #                        TÂCHE 4.4 - COMMANDE MANUELLE
@@ -381,8 +535,7 @@ class Task4Controller:
                     self._handle_test_command(command)
                 
                 elif command == 'stop':
-                    Motor(self.motor_channel, DIR_FORWARD, 0)
-                    self._update_status(0, DIR_FORWARD)
+                    self.emergency_stop()
                     print("🛑 Arrêt d'urgence")
                 
                 elif command == 'status':
@@ -415,7 +568,7 @@ class Task4Controller:
         """Génération de la chaîne de statut"""
         if self.is_running:
             direction_str = "AVANT" if self.current_direction == DIR_FORWARD else "ARRIÈRE"
-            return f"🟢 M{self.motor_channel}: {self.current_speed}% {direction_str}"
+            return f"🟢 M{self.motor_channel}: {self.current_speed:.0f}% {direction_str}"
         else:
             return f"🔴 M{self.motor_channel}: ARRÊTÉ"
     
@@ -423,7 +576,7 @@ class Task4Controller:
         """Affichage du statut détaillé"""
         print("📊 STATUT DÉTAILLÉ:")
         print(f"   Moteur: {self.motor_channel}")
-        print(f"   Vitesse: {self.current_speed}%")
+        print(f"   Vitesse: {self.current_speed:.0f}%")
         print(f"   Direction: {'Avant' if self.current_direction == DIR_FORWARD else 'Arrière'}")
         print(f"   État: {'En marche' if self.is_running else 'Arrêté'}")
         print(f"   Sécurité: Vitesse max {MAX_SAFE_SPEED}%")
@@ -451,8 +604,9 @@ class Task4Controller:
             sens_input = input("   Sens (avant/arriere): ").strip().lower()
             sens = DIR_FORWARD if sens_input == 'avant' else DIR_BACKWARD
             pente = float(input("   Temps de rampe (secondes): "))
+            profil = input("   Profil (linear/scurve/exponential) [linear]: ").strip().lower() or 'linear'
             
-            self.custom_ramp(vitesse, sens, pente)
+            self.custom_ramp(vitesse, sens, pente, profile=profil)
             
         except ValueError:
             print("   ❌ Paramètres invalides")
@@ -517,7 +671,7 @@ def demo_task4_complete():
     print("\n🚀 DÉMONSTRATION COMPLÈTE TÂCHE 4")
     print("─" * 50)
     
-    controller = Task4Controller(PROPULSION_MOTOR)
+    controller = Task4Controller(PROPULSION_MOTOR, self_test=True)
     
     try:
         # Test 1: Fonction simple
@@ -624,6 +778,7 @@ def main():
                 
             elif choice == "6":
                 destroy()
+                startup_report()
                 print("\n👋 Programme terminé - Au revoir!")
                 break
                 
@@ -649,11 +804,12 @@ def submenu_individual_tests():
         print("│  2. 📈 Test rampe 1 seconde            │")
         print("│  3. ⚙️  Test rampe personnalisée        │")
         print("│  4. 📊 Afficher statut moteur          │")
-        print("│  5. 🔙 Retour au menu principal        │")
+        print("│  5. 🔧 Étalonnage zone morte moteur    │")
+        print("│  6. 🔙 Retour au menu principal        │")
         print("└────────────────────────────────────────┘")
         
         try:
-            choice = input("\n➤ Choisissez un test (1-5): ").strip()
+            choice = input("\n➤ Choisissez un test (1-6): ").strip()
             
             if choice == "1":
                 print("\n🐌 TEST FONCTION SIMPLE")
@@ -699,11 +855,14 @@ def submenu_individual_tests():
                 controller._show_detailed_status()
                 
             elif choice == "5":
+                deadband_calibration(PROPULSION_MOTOR)
+                
+            elif choice == "6":
                 Motor(PROPULSION_MOTOR, DIR_FORWARD, 0)
                 break
                 
             else:
-                print("❌ Option invalide - Choisissez entre 1 et 5")
+                print("❌ Option invalide - Choisissez entre 1 et 6")
                 
         except KeyboardInterrupt:
             print("\n⚠ Test interrompu")
@@ -719,8 +878,6 @@ def submenu_individual_tests():
 def servo_calibration():
     """5. Étalonnage du servomoteur de direction (bonus)"""
     try:
-        import Adafruit_PCA9685
-        
         print("\n🔧 ÉTALONNAGE SERVOMOTEUR DE DIRECTION")
         print("═" * 50)
         print("ATTENTION: Surveillez les servos pendant l'étalonnage!")
@@ -729,10 +886,10 @@ def servo_calibration():
         
         # Configuration servo (adresse 0x40 ou 0x5f selon le robot)
         try:
-            servo_pwm = Adafruit_PCA9685.PCA9685(address=0x40)
+            servo_pwm = hal.pca9685(address=0x40)
             servo_addr = "0x40"
         except:
-            servo_pwm = Adafruit_PCA9685.PCA9685(address=0x5f)  # Même adresse que moteurs
+            servo_pwm = hal.pca9685(address=0x5f)  # Même adresse que moteurs
             servo_addr = "0x5f"
             
         servo_pwm.set_pwm_freq(50)  # 50Hz pour servos
@@ -833,20 +990,64 @@ def servo_calibration():
             print(f"Gauche (-50°):   PWM {calibration_data.get('left_50', 'N/A')}")
             print(f"Droite (+50°):   PWM {calibration_data.get('right_50', 'N/A')}")
             
-            print("\n💾 CODE À UTILISER:")
-            print(f"SERVO_CENTER = {calibration_data.get('center', 300)}")
-            print(f"SERVO_LEFT_50 = {calibration_data.get('left_50', 250)}")
-            print(f"SERVO_RIGHT_50 = {calibration_data.get('right_50', 350)}")
+            # Sauvegarde dans la base de calibrage (plus de copie manuelle)
+            store = calibration.get_store()
+            store.update('steering', {
+                'address': servo_addr,
+                'channel': direction_channel,
+                'center': calibration_data.get('center', 300),
+                'left_50': calibration_data.get('left_50', 250),
+                'right_50': calibration_data.get('right_50', 350),
+            })
+            print(f"\n💾 Étalonnage sauvegardé dans {store.path} (section 'steering', chargée par ServoController)")
             
         print("\n✅ Étalonnage terminé")
         
     except ImportError:
-        print("❌ Module Adafruit_PCA9685 non disponible")
+        print("❌ Module adafruit_pca9685 non disponible")
     except KeyboardInterrupt:
         print("\n⚠ Étalonnage interrompu")
     except Exception as e:
         print(f"❌ Erreur étalonnage: {e}")
 
+def deadband_calibration(channel=PROPULSION_MOTOR):
+    """Mesure la zone morte d'un moteur (throttle minimal qui le fait tourner)"""
+    print(f"\n🔧 ÉTALONNAGE ZONE MORTE - MOTEUR {channel}")
+    print("═" * 50)
+    print("Le throttle augmente de 1% en 1% jusqu'à ce que la roue tourne.")
+    print("⚠️  Robot sur cales recommandé!")
+    
+    init_motors()
+    previous = motor_deadbands.pop(channel, None)  # mesure sans compensation
+    deadband = None
+    try:
+        for speed in range(1, MAX_SAFE_SPEED + 1):
+            Motor(channel, DIR_FORWARD, speed)
+            response = input(f"Throttle {speed}% - La roue tourne? (o/n/q): ").strip().lower()
+            if response == 'o':
+                deadband = speed
+                break
+            if response == 'q':
+                break
+    except KeyboardInterrupt:
+        print("\n⚠ Étalonnage interrompu")
+    finally:
+        Motor(channel, DIR_FORWARD, 0)
+    
+    if deadband is None:
+        if previous is not None:
+            motor_deadbands[channel] = previous
+        print("❌ Zone morte non mesurée - valeur précédente conservée")
+        return None
+    
+    motor_deadbands[channel] = deadband
+    store = calibration.get_store()
+    store.update('motors', {channel: {'deadband': deadband}})
+    print(f"✅ Zone morte: {deadband}% - sauvegardée dans {store.path}")
+    return deadband
+
+startup_times['import'] = time.perf_counter() - _IMPORT_START
+
 # ═══════════════════════════════════════════════════════════════════════════════
 #                               POINT D'ENTRÉE
 # ═══════════════════════════════════════════════════════════════════════════════
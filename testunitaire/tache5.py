@@ -1,17 +1,158 @@
-from gpiozero import DistanceSensor
+import threading
+import time
+from collections import deque
 from time import sleep
 
+import hal
+
 Tr = 23
 Ec = 24
-sensor = DistanceSensor(echo=Ec, trigger=Tr,max_distance=2) # Maximum detection distance 2m.
+sensor = hal.distance_sensor(echo=Ec, trigger=Tr, max_distance=2) # Maximum detection distance 2m.
 
 # Get the distance of ultrasonic detection.
 def checkdist():
     return (sensor.distance) *100 # Unit: cm
 
+
+# Intervalle minimal entre deux mesures HC-SR04 (laisse mourir les échos parasites)
+MIN_INTERVAL = 0.06
+
+
+class RangingService:
+    """
+    Mesure de distance en continu sur un thread dédié
+
+    Chaque mesure passe par un filtre médian (rejet des valeurs aberrantes)
+    puis par un filtre de Kalman à vitesse constante qui donne la distance
+    lissée et la vitesse de rapprochement. latest() retourne la dernière
+    estimation sans attendre de cycle trigger/écho.
+    """
+
+    def __init__(self, sensor=sensor, interval=MIN_INTERVAL, median_window=5,
+                 measurement_noise=0.01, accel_noise=2.0):
+        """
+        Args:
+            sensor: Capteur à ultrasons (interface gpiozero.DistanceSensor)
+            interval (float): Période d'échantillonnage (s), au moins MIN_INTERVAL
+            median_window (int): Taille de la fenêtre du filtre médian (impair)
+            measurement_noise (float): Écart-type du bruit de mesure (m)
+            accel_noise (float): Écart-type de l'accélération de l'obstacle (m/s²)
+        """
+        self.sensor = sensor
+        self.interval = max(MIN_INTERVAL, interval)
+        self.window = deque(maxlen=median_window)
+        self.r = measurement_noise ** 2
+        self.q = accel_noise ** 2
+
+        # État du filtre : distance (m), vitesse (m/s), covariance P
+        self._x = None
+        self._v = 0.0
+        self._p = [[1.0, 0.0], [0.0, 1.0]]
+        self._last_time = None
+
+        # Dernière estimation (distance m, vitesse de rapprochement m/s, horodatage, brut m)
+        self._latest = (None, 0.0, None, None)
+        self._stop_event = threading.Event()
+        self._thread = None
+        self.samples = 0
+        self.read_time_total = 0.0
+
+    def _median(self, distance):
+        """Filtre médian glissant (rejette les échos isolés aberrants)"""
+        self.window.append(distance)
+        ordered = sorted(self.window)
+        return ordered[len(ordered) // 2]
+
+    def _kalman(self, z, now):
+        """Filtre de Kalman à vitesse constante sur la distance médiane"""
+        if self._x is None:
+            self._x = z
+            self._last_time = now
+            return
+        dt = max(1e-3, now - self._last_time)
+        self._last_time = now
+
+        # Prédiction
+        x = self._x + self._v * dt
+        v = self._v
+        (p00, p01), (p10, p11) = self._p
+        p00 = p00 + dt * (p01 + p10) + dt * dt * p11 + self.q * dt ** 4 / 4
+        p01 = p01 + dt * p11 + self.q * dt ** 3 / 2
+        p10 = p10 + dt * p11 + self.q * dt ** 3 / 2
+        p11 = p11 + self.q * dt * dt
+
+        # Correction
+        s = p00 + self.r
+        k0, k1 = p00 / s, p10 / s
+        innovation = z - x
+        self._x = x + k0 * innovation
+        self._v = v + k1 * innovation
+        self._p = [[(1 - k0) * p00, (1 - k0) * p01],
+                   [p10 - k1 * p00, p11 - k1 * p01]]
+
+    def update(self, now=None):
+        """Une mesure : lecture du capteur, filtrage, publication"""
+        start = time.perf_counter()
+        raw = self.sensor.distance
+        self.read_time_total += time.perf_counter() - start
+        if now is None:
+            now = time.monotonic()
+        self._kalman(self._median(raw), now)
+        self.samples += 1
+        # Tuple remplacé d'un bloc : lecture cohérente sans verrou
+        self._latest = (self._x, -self._v, now, raw)
+
+    def latest(self):
+        """
+        Dernière estimation, sans bloquer
+
+        Returns:
+            tuple: (distance m ou None, vitesse de rapprochement m/s, horodatage monotonic, mesure brute m)
+        """
+        return self._latest
+
+    def distance_cm(self):
+        """Dernière distance filtrée en cm (None avant la première mesure)"""
+        distance = self._latest[0]
+        return None if distance is None else distance * 100
+
+    def _run(self):
+        deadline = time.monotonic()
+        while not self._stop_event.is_set():
+            self.update()
+            deadline += self.interval
+            delay = deadline - time.monotonic()
+            if delay < 0:
+                deadline = time.monotonic()
+                delay = 0
+            self._stop_event.wait(delay)
+
+    def start(self):
+        """Démarre l'échantillonnage en tâche de fond"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="ranging", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Arrête l'échantillonnage"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
 if __name__ == "__main__":
     print("Mesure de la distance à l'aide du capteur à ultrason")
-    while True:
-        distance = checkdist() 
-        print("Distance de l'obstacle : %.2f cm" %distance)
-        sleep(0.2)
+    ranging = RangingService()
+    ranging.start()
+    try:
+        while True:
+            distance, closing, _, raw = ranging.latest()
+            if distance is not None:
+                print("Distance de l'obstacle : %.2f cm (brut %.2f cm, rapprochement %+.2f m/s)"
+                      % (distance * 100, raw * 100, closing))
+            sleep(0.2)
+    except KeyboardInterrupt:
+        ranging.stop()
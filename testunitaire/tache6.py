@@ -1,50 +1,390 @@
+import queue
+import threading
 import time
-import busio
-from board import SCL, SDA
-from adafruit_pca9685 import PCA9685
-from adafruit_motor import motor
-from gpiozero import InputDevice
-
-# === Initialisation des capteurs IR ===
-LEFT_SENSOR = InputDevice(22)
-MIDDLE_SENSOR = InputDevice(27)
-RIGHT_SENSOR = InputDevice(17)
-
-# === Initialisation I2C pour le Robot HAT ===
-i2c = busio.I2C(SCL, SDA)
-pwm = PCA9685(i2c, address=0x5f)  # Remplace par 0x40 si nécessaire
-pwm.frequency = 1000
-
-# === Initialisation moteur M1 (marche/arrêt uniquement) ===
-motor1 = motor.DCMotor(pwm.channels[15], pwm.channels[14])
-motor1.decay_mode = motor.SLOW_DECAY
-
-def avancer(vitesse=0.6):
-    print("→ AVANCER")
-    motor1.throttle = vitesse
-
-def stop():
-    print("→ STOP")
-    motor1.throttle = 0
-
-# === Boucle principale ===
-try:
-    print("Suivi de ligne actif... Ctrl+C pour arrêter.")
-    while True:
-        left = LEFT_SENSOR.value
-        middle = MIDDLE_SENSOR.value
-        right = RIGHT_SENSOR.value
-
-        print(f"Capteurs : L={left} | M={middle} | R={right}")
-
-        if middle == 1:
-            avancer()
+
+import hal
+
+# === Broches des capteurs IR ===
+LEFT_PIN = 22
+MIDDLE_PIN = 27
+RIGHT_PIN = 17
+
+# === Consignes ===
+VITESSE = 0.6          # Throttle en ligne droite
+VITESSE_VIRAGE = 0.45  # Throttle quand la ligne est sous un capteur latéral
+ANGLE_VIRAGE = 30      # Angle logique de direction quand la ligne est sur le côté
+
+# Action (throttle, angle de direction) pour chaque état (L, M, R) des capteurs.
+# Ligne perdue (0, 0, 0) : arrêt immédiat.
+ACTIONS = {
+    (0, 1, 0): (VITESSE, 0),
+    (1, 1, 1): (VITESSE, 0),          # croisement : tout droit
+    (1, 0, 1): (VITESSE, 0),          # ambigu : tout droit
+    (1, 0, 0): (VITESSE_VIRAGE, -ANGLE_VIRAGE),
+    (1, 1, 0): (VITESSE_VIRAGE, -ANGLE_VIRAGE / 2),
+    (0, 0, 1): (VITESSE_VIRAGE, ANGLE_VIRAGE),
+    (0, 1, 1): (VITESSE_VIRAGE, ANGLE_VIRAGE / 2),
+    (0, 0, 0): (0, None),
+}
+
+
+class LineFollower:
+    """
+    Suivi de ligne piloté par événements
+
+    Chaque front d'un capteur IR (callback gpiozero) dépose l'état (L, M, R)
+    horodaté dans une queue. Le thread de contrôle ne commande le moteur et la
+    direction que lorsque l'action change, et mesure la latence entre le front
+    et la commande. Si les fronts ne sont pas disponibles, un thread
+    d'échantillonnage rapide (sample_rate) alimente la même queue.
+    """
+
+    def __init__(self, motor=None, steer=None, sensors=None, sample_rate=None, verbose=True):
+        """
+        Args:
+            motor: Moteur de propulsion (interface adafruit_motor DCMotor), créé si None
+            steer (callable): steer(angle_logique) pour la direction, ou None (moteur seul)
+            sensors (tuple): Entrées (gauche, milieu, droite), créées si None
+            sample_rate (float): Fréquence d'échantillonnage (Hz) au lieu des fronts, ou None
+            verbose (bool): Affiche chaque changement d'action
+        """
+        if sensors is None:
+            sensors = (hal.digital_input(LEFT_PIN), hal.digital_input(MIDDLE_PIN),
+                       hal.digital_input(RIGHT_PIN))
+        self.sensors = sensors
+        self.pwm = None
+        if motor is None:
+            # === Initialisation I2C pour le Robot HAT et moteur M1 ===
+            # Puce partagée avec la direction (steer=) : elle reste à la fréquence des servos
+            self.pwm = hal.pca9685(address=0x5f)  # Remplace par 0x40 si nécessaire
+            self.pwm.lock_frequency(hal.SERVO_FREQUENCY)
+            motor = hal.dc_motor(self.pwm, 15, 14)
+        self.motor = motor
+        self.steer = steer
+        self.sample_rate = sample_rate
+        self.verbose = verbose
+
+        self.events = queue.Queue()
+        self.state = None
+        self.action = None
+        self._stop_event = threading.Event()
+        self._threads = []
+
+        # Latences front capteur -> commande (secondes)
+        self.latencies = []
+        self.line_loss_latencies = []
+        self.events_received = 0
+        self.commands_sent = 0
+
+    def read_state(self):
+        """Lit les trois capteurs (L, M, R)"""
+        return tuple(int(sensor.value) for sensor in self.sensors)
+
+    def _on_edge(self):
+        self.events.put((time.perf_counter(), self.read_state()))
+
+    def _sample(self):
+        period = 1.0 / self.sample_rate
+        last = None
+        while not self._stop_event.is_set():
+            state = self.read_state()
+            if state != last:
+                self.events.put((time.perf_counter(), state))
+                last = state
+            self._stop_event.wait(period)
+
+    def apply(self, state, event_time=None):
+        """Applique l'action correspondant à un état, seulement si elle change"""
+        self.state = state
+        action = ACTIONS.get(state, (0, None))
+        if action == self.action:
+            return False
+        throttle, angle = action
+        if angle is not None and self.steer is not None:
+            self.steer(angle)
+        self.motor.throttle = throttle
+        self.action = action
+        self.commands_sent += 1
+
+        if event_time is not None:
+            latency = time.perf_counter() - event_time
+            self.latencies.append(latency)
+            if throttle == 0:
+                self.line_loss_latencies.append(latency)
+        if self.verbose:
+            print(f"Capteurs : L={state[0]} | M={state[1]} | R={state[2]} -> "
+                  f"{'STOP' if throttle == 0 else f'AVANCER {throttle:.2f}'}"
+                  f"{'' if angle is None else f', direction {angle:+.0f}°'}")
+        return True
+
+    def _control(self):
+        while not self._stop_event.is_set():
+            try:
+                event_time, state = self.events.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            self.events_received += 1
+            # Rafale de fronts : seul l'état le plus récent compte
+            while True:
+                try:
+                    event_time, state = self.events.get_nowait()
+                    self.events_received += 1
+                except queue.Empty:
+                    break
+            self.apply(state, event_time)
+
+    def start(self):
+        """Démarre le suivi (callbacks ou échantillonnage + thread de contrôle)"""
+        self._stop_event.clear()
+        if self.sample_rate:
+            self._threads.append(threading.Thread(target=self._sample, name="ir-sampler", daemon=True))
+        else:
+            for sensor in self.sensors:
+                sensor.when_activated = self._on_edge
+                sensor.when_deactivated = self._on_edge
+        self._threads.append(threading.Thread(target=self._control, name="line-follower", daemon=True))
+        for thread in self._threads:
+            thread.start()
+        # État initial, sans attendre le premier front
+        self.events.put((time.perf_counter(), self.read_state()))
+
+    def stop(self):
+        """Arrête le suivi et le moteur"""
+        self._stop_event.set()
+        for sensor in self.sensors:
+            sensor.when_activated = None
+            sensor.when_deactivated = None
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        self.motor.throttle = 0
+        self.action = None
+
+    def latency_stats(self):
+        """Latences front -> commande (ms) : moyenne, max, et pour les pertes de ligne"""
+        def summary(values):
+            if not values:
+                return {'count': 0, 'mean_ms': 0.0, 'max_ms': 0.0}
+            return {'count': len(values), 'mean_ms': sum(values) / len(values) * 1000,
+                    'max_ms': max(values) * 1000}
+        return {'all': summary(self.latencies), 'line_loss': summary(self.line_loss_latencies)}
+
+    def print_stats(self):
+        """Affiche les compteurs et latences"""
+        stats = self.latency_stats()
+        print(f"📊 Suivi de ligne: {self.events_received} fronts, {self.commands_sent} commandes")
+        for key, label in (('all', "front -> commande"), ('line_loss', "perte de ligne")):
+            s = stats[key]
+            print(f"   {label:<18}: {s['count']} mesures, {s['mean_ms']:.3f} ms moy, {s['max_ms']:.3f} ms max")
+
+
+# === Suivi de ligne continu (PID) ===
+SENSOR_WEIGHTS = (-1.0, 0.0, 1.0)   # Position latérale de chaque capteur (L, M, R)
+LOST_ERROR = 2.0                     # Erreur imposée quand la ligne est perdue (du dernier côté vu)
+LOST_TIMEOUT = 0.3                   # Arrêt si la ligne reste perdue plus longtemps (s)
+STEERING_CHANNEL = 0                 # Servo de direction (tache3)
+
+
+def line_error(state, last_error=0.0):
+    """
+    Position de la ligne sous les capteurs : -1 (gauche) ... +1 (droite)
+
+    Moyenne pondérée des capteurs actifs. Ligne perdue : ±LOST_ERROR du côté
+    où elle a été vue en dernier, pour continuer à braquer vers elle.
+    """
+    active = [w for w, s in zip(SENSOR_WEIGHTS, state) if s]
+    if active:
+        return sum(active) / len(active)
+    if last_error == 0:
+        return 0.0
+    return LOST_ERROR if last_error > 0 else -LOST_ERROR
+
+
+class PID:
+    """Régulateur PID avec sortie bornée et anti-windup (intégration conditionnelle)"""
+
+    def __init__(self, kp, ki, kd, output_min, output_max):
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+        self.output_min = output_min
+        self.output_max = output_max
+        self.reset()
+
+    def reset(self):
+        self.integral = 0.0
+        self.last_error = None
+
+    def update(self, error, dt):
+        """Retourne la commande pour une erreur mesurée après dt secondes"""
+        derivative = 0.0 if self.last_error is None or dt <= 0 else (error - self.last_error) / dt
+        self.last_error = error
+        integral = self.integral + error * dt
+        output = self.kp * error + self.ki * integral + self.kd * derivative
+
+        # Anti-windup : on n'intègre pas si la sortie sature dans le sens de l'erreur
+        if output > self.output_max:
+            output = self.output_max
+            if error < 0:
+                self.integral = integral
+        elif output < self.output_min:
+            output = self.output_min
+            if error > 0:
+                self.integral = integral
         else:
-            stop()
+            self.integral = integral
+        return output
+
+
+class PIDLineFollower:
+    """
+    Suivi de ligne continu à fréquence fixe
+
+    À chaque tick, les trois capteurs donnent une erreur de position de ligne ;
+    un PID la convertit en angle de direction (ServoController.set_angle(0, ...))
+    et la vitesse baisse proportionnellement au braquage. Le robot ne s'arrête
+    que si la ligne reste perdue plus de LOST_TIMEOUT.
+    """
+
+    def __init__(self, servos=None, motor=None, sensors=None, rate=100,
+                 kp=30.0, ki=2.0, kd=0.3, max_steer=30, speed=0.6, min_speed=0.5):
+        """
+        Args:
+            servos (ServoController): Contrôleur des servos (tache3), créé si None
+            motor: Moteur de propulsion, créé sur le PCA9685 des servos si None
+            sensors (tuple): Entrées (gauche, milieu, droite), créées si None
+            rate (float): Fréquence de la boucle de contrôle (Hz)
+            kp, ki, kd (float): Gains du PID (degrés de braquage par unité d'erreur)
+            max_steer (float): Braquage maximal (degrés logiques, borné par servo_configs)
+            speed (float): Throttle en ligne droite
+            min_speed (float): Throttle au braquage maximal
+        """
+        if servos is None:
+            from tache3 import ServoController
+            servos = ServoController()
+        if motor is None:
+            # Même PCA9685 que les servos : on garde leur fréquence de 50 Hz
+            motor = hal.dc_motor(servos.pwm, 15, 14)
+        if sensors is None:
+            sensors = (hal.digital_input(LEFT_PIN), hal.digital_input(MIDDLE_PIN),
+                       hal.digital_input(RIGHT_PIN))
+        self.servos = servos
+        self.motor = motor
+        self.sensors = sensors
+        self.rate = rate
+        self.speed = speed
+        self.min_speed = min_speed
+
+        config = servos.servo_configs[STEERING_CHANNEL]
+        self.steer_min = max(-max_steer, config["min_angle"])
+        self.steer_max = min(max_steer, config["max_angle"])
+        self.max_steer = max_steer
+        if self.steer_min > -max_steer or self.steer_max < max_steer:
+            print(f"⚠️  Braquage limité à {self.steer_min:+.0f}° → {self.steer_max:+.0f}° "
+                  f"par servo_configs[{STEERING_CHANNEL}] (demandé ±{max_steer}°)")
+        self.pid = PID(kp, ki, kd, self.steer_min, self.steer_max)
+
+        self.error = 0.0
+        self.angle = 0.0
+        self.throttle = 0.0
+        self._lost_since = None
+        self._stop_event = threading.Event()
+        self._thread = None
+
+        # Statistiques
+        self.ticks = 0
+        self.late_ticks = 0
+        self.tick_time_total = 0.0
+        self.tick_time_max = 0.0
+
+    def step(self, dt, now=None):
+        """Un tick de contrôle : capteurs -> PID -> direction et propulsion"""
+        start = time.perf_counter()
+        if now is None:
+            now = time.monotonic()
+        state = tuple(int(sensor.value) for sensor in self.sensors)
+        self.error = line_error(state, self.error)
+
+        if any(state):
+            self._lost_since = None
+        elif self._lost_since is None:
+            self._lost_since = now
+
+        if self._lost_since is not None and now - self._lost_since > LOST_TIMEOUT:
+            throttle = 0.0
+            self.pid.reset()
+        else:
+            self.angle = self.pid.update(self.error, dt)
+            # Ralentissement proportionnel au braquage
+            k = min(1.0, abs(self.angle) / self.max_steer)
+            throttle = self.speed - (self.speed - self.min_speed) * k
+
+        with self.servos.pwm.transaction():
+            self.servos.set_angle(STEERING_CHANNEL, round(self.angle, 1), verbose=False)
+            if throttle != self.throttle:
+                self.motor.throttle = throttle
+        self.throttle = throttle
+
+        elapsed = time.perf_counter() - start
+        self.ticks += 1
+        self.tick_time_total += elapsed
+        self.tick_time_max = max(self.tick_time_max, elapsed)
+
+    def _run(self):
+        period = 1.0 / self.rate
+        deadline = time.monotonic()
+        while not self._stop_event.is_set():
+            self.step(period, deadline)
+            deadline += period
+            delay = deadline - time.monotonic()
+            if delay < 0:
+                self.late_ticks += 1
+                deadline = time.monotonic()
+                delay = 0
+            self._stop_event.wait(delay)
+
+    def start(self):
+        """Démarre la boucle de contrôle à fréquence fixe"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self.pid.reset()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="line-pid", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Arrête la boucle, le moteur, et remet la direction au centre"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.motor.throttle = 0
+        self.throttle = 0.0
+        self.servos.set_angle(STEERING_CHANNEL, 0, verbose=False)
+
+    def print_stats(self):
+        """Affiche les statistiques de la boucle"""
+        mean_us = self.tick_time_total / self.ticks * 1e6 if self.ticks else 0.0
+        print(f"📊 Suivi PID: {self.ticks} ticks à {self.rate} Hz, {self.late_ticks} en retard, "
+              f"{mean_us:.1f} µs moy, {self.tick_time_max * 1e6:.1f} µs max par tick")
+
 
-        time.sleep(0.05)
+# === Programme principal ===
+# python3 tache6.py       : suivi par événements (moteur seul)
+# python3 tache6.py pid   : suivi continu PID avec le servo de direction
+if __name__ == "__main__":
+    import sys
+    if sys.argv[1:] == ["pid"]:
+        follower = PIDLineFollower()
+    else:
+        follower = LineFollower()
+    try:
+        print("Suivi de ligne actif... Ctrl+C pour arrêter.")
+        follower.start()
+        while True:
+            time.sleep(1)
 
-except KeyboardInterrupt:
-    print("Arrêt manuel.")
-    stop()
-    pwm.deinit()
+    except KeyboardInterrupt:
+        print("Arrêt manuel.")
+        follower.stop()
+        follower.print_stats()
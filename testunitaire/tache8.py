@@ -1,21 +1,157 @@
+import threading
 import time
-import board
-import adafruit_ads7830.ads7830 as ADC
-from adafruit_ads7830.analog_in import AnalogIn
-
-i2c = board.I2C()
-adc = ADC.ADS7830(i2c,0x48)
-chan1 = AnalogIn(adc, 1)
-chan2 = AnalogIn(adc, 2)
-chan3 = AnalogIn(adc, 3)
-chan4 = AnalogIn(adc, 4)
-chan5 = AnalogIn(adc, 5)
-chan6 = AnalogIn(adc, 6)
-chan7 = AnalogIn(adc, 7)
-chan0 = AnalogIn(adc, 0)
+
+import numpy
+
+import hal
+
+adc = hal.ads7830(0x48)
+chan1 = adc.channel(1)
+chan2 = adc.channel(2)
+chan3 = adc.channel(3)
+chan4 = adc.channel(4)
+chan5 = adc.channel(5)
+chan6 = adc.channel(6)
+chan7 = adc.channel(7)
+chan0 = adc.channel(0)
+
+LIGHT_CHANNEL = 1   # Capteur de luminosité
+
+
+class ADCSampler:
+    """
+    Acquisition continue de plusieurs canaux de l'ADS7830
+
+    Tous les canaux configurés sont lus dans une même boucle serrée, à
+    fréquence fixe, et rangés dans des buffers circulaires numpy (une ligne
+    par canal, un horodatage par balayage). Plusieurs consommateurs
+    (luminosité, batterie...) partagent ainsi une seule acquisition.
+    """
+
+    def __init__(self, adc=adc, channels=range(8), rate=50, capacity=1024):
+        """
+        Args:
+            adc: ADS7830 (hal.ads7830)
+            channels (iterable): Canaux à échantillonner
+            rate (float): Fréquence de balayage (Hz)
+            capacity (int): Nombre de balayages conservés par canal
+        """
+        self.adc = adc
+        self.channels = tuple(channels)
+        self._rows = {channel: row for row, channel in enumerate(self.channels)}
+        self._inputs = [adc.channel(channel) for channel in self.channels]
+        self.rate = rate
+        self.capacity = capacity
+
+        self.values = numpy.zeros((len(self.channels), capacity), dtype=numpy.uint16)
+        self.times = numpy.zeros(capacity)
+        self.count = 0
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+        # Statistiques
+        self.late_scans = 0
+        self.scan_time_total = 0.0
+        self.scan_time_max = 0.0
+
+    def scan(self, now=None):
+        """Lit tous les canaux une fois et ajoute le balayage aux buffers"""
+        start = time.perf_counter()
+        samples = [analog_in.value for analog_in in self._inputs]
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            column = self.count % self.capacity
+            self.values[:, column] = samples
+            self.times[column] = now
+            self.count += 1
+        elapsed = time.perf_counter() - start
+        self.scan_time_total += elapsed
+        self.scan_time_max = max(self.scan_time_max, elapsed)
+
+    def latest(self, channel):
+        """Dernière valeur (16 bits) d'un canal et son horodatage, ou (None, None)"""
+        with self._lock:
+            if self.count == 0:
+                return None, None
+            column = (self.count - 1) % self.capacity
+            return int(self.values[self._rows[channel], column]), float(self.times[column])
+
+    def window(self, channel, seconds):
+        """
+        Échantillons d'un canal sur les dernières `seconds` secondes
+
+        Returns:
+            tuple: (horodatages, valeurs), numpy, dans l'ordre chronologique
+        """
+        with self._lock:
+            n = min(self.count, self.capacity)
+            if n == 0:
+                return numpy.empty(0), numpy.empty(0, dtype=numpy.uint16)
+            # Remise dans l'ordre chronologique du buffer circulaire
+            order = (numpy.arange(self.count - n, self.count)) % self.capacity
+            times = self.times[order]
+            values = self.values[self._rows[channel], order]
+        keep = times >= times[-1] - seconds
+        return times[keep], values[keep]
+
+    def stats(self, channel, seconds=1.0):
+        """
+        Statistiques d'un canal sur une fenêtre glissante
+
+        Returns:
+            dict: mean, min, max, rate (variation par seconde, pente des moindres carrés), samples
+        """
+        times, values = self.window(channel, seconds)
+        if len(values) == 0:
+            return {'mean': None, 'min': None, 'max': None, 'rate': 0.0, 'samples': 0}
+        values = values.astype(float)
+        rate = 0.0
+        if len(values) >= 2 and times[-1] > times[0]:
+            t = times - times.mean()
+            rate = float(numpy.dot(t, values - values.mean()) / numpy.dot(t, t))
+        return {'mean': float(values.mean()), 'min': float(values.min()),
+                'max': float(values.max()), 'rate': rate, 'samples': len(values)}
+
+    def _run(self):
+        period = 1.0 / self.rate
+        deadline = time.monotonic()
+        while not self._stop_event.is_set():
+            self.scan()
+            deadline += period
+            delay = deadline - time.monotonic()
+            if delay < 0:
+                self.late_scans += 1
+                deadline = time.monotonic()
+                delay = 0
+            self._stop_event.wait(delay)
+
+    def start(self):
+        """Démarre l'acquisition en tâche de fond"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="adc-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Arrête l'acquisition"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
 if __name__ == "__main__":
     print("Mesure de l'intensité lumineuse")
-    while True:
-        LT_value = chan1.value
-        print(f"L'intensité de la lumière est de : {LT_value} lux")
-        time.sleep(0.5)
+    sampler = ADCSampler()
+    sampler.start()
+    try:
+        while True:
+            time.sleep(0.5)
+            s = sampler.stats(LIGHT_CHANNEL, seconds=0.5)
+            print(f"L'intensité de la lumière est de : {s['mean']:.0f} lux "
+                  f"(min {s['min']:.0f}, max {s['max']:.0f}, {s['rate']:+.0f}/s)")
+    except KeyboardInterrupt:
+        sampler.stop()
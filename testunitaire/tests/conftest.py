@@ -0,0 +1,33 @@
+"""
+Configuration commune des tests : backend simulé, calibrage dans un dossier
+temporaire, périphériques partagés remis à zéro entre deux tests.
+
+Lancement depuis la racine du dépôt :
+    python -m pytest -q testunitaire/tests
+"""
+
+import os
+import sys
+import tempfile
+
+# Avant tout import de hal : aucun accès au matériel, pas d'écriture dans calibration.json
+os.environ['JCVD_BACKEND'] = 'sim'
+os.environ['JCVD_CALIBRATION'] = os.path.join(tempfile.mkdtemp(prefix='jcvd-tests-'), 'calibration.json')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import hal
+
+
+@pytest.fixture(autouse=True)
+def fresh_hardware():
+    """PCA9685 neufs (fréquence non verrouillée) et moteurs de tache4 à réinitialiser"""
+    hal._pca9685_devices.clear()
+    tache4 = sys.modules.get('tache4')
+    if tache4 is not None:
+        tache4.pwm_motor = None
+    yield
+    hal._pca9685_devices.clear()
+    if tache4 is not None:
+        tache4.pwm_motor = None
@@ -0,0 +1,72 @@
+import pytest
+
+import hal
+from animations import AnimationEngine, Blink, Breathe, Effect, Fade, Sequence, Wipe
+from tache2 import WS2812Controller
+
+
+@pytest.fixture
+def engine(capsys):
+    engine = AnimationEngine(WS2812Controller(count=14, spi=hal.SimSPI()), fps=100)
+    yield engine
+    engine.stop()
+
+
+class Broken(Effect):
+    def __init__(self):
+        super().__init__(duration=1.0)
+
+    def _colors(self, t):
+        raise IndexError("trame invalide")
+
+
+@pytest.mark.parametrize("leds", [14, [0, 20], -1])
+def test_bind_rejects_out_of_range_leds(engine, leds):
+    with pytest.raises(ValueError):
+        engine.play(Fade(leds))
+    assert not engine.effects
+
+
+@pytest.mark.parametrize("speed", [0, -5, float('nan'), float('inf')])
+def test_wipe_rejects_invalid_speed(speed):
+    with pytest.raises(ValueError):
+        Wipe(speed=speed)
+
+
+def test_wipe_lights_every_led_then_finishes(engine):
+    effect = engine.play(Wipe('BG', (0, 255, 0), speed=30))
+    for i in range(5):
+        engine.render_frame(now=i * 0.05)
+    assert effect.done.is_set() and engine.wait(effect, 0)
+    assert (engine.controller.pixels[2:5] == (0, 255, 0)).all()
+
+
+def test_render_error_is_raised_by_wait(engine):
+    effect = engine.play(Broken())
+    other = engine.play(Fade('C', duration=10.0))
+    engine.start()
+    with pytest.raises(IndexError):
+        engine.wait(effect, timeout=1.0)
+    assert engine.effects == [other]
+
+
+def test_send_failure_releases_waiting_effects(engine):
+    def fail():
+        raise OSError("SPI débranché")
+    engine.controller.show = fail
+    effect = engine.play(Fade('C', duration=10.0))
+    engine.start()
+    with pytest.raises(OSError):
+        engine.wait(effect, timeout=1.0)
+
+
+@pytest.mark.parametrize("make", [
+    lambda: Blink(period=0), lambda: Blink(period=-1), lambda: Blink(duty=1.5),
+    lambda: Breathe(period=0), lambda: Breathe(period=float('nan')),
+    lambda: Sequence(),
+    lambda: AnimationEngine(WS2812Controller(count=14, spi=hal.SimSPI()), fps=0),
+    lambda: AnimationEngine(WS2812Controller(count=14, spi=hal.SimSPI()), fps=-30),
+])
+def test_invalid_animation_parameters_rejected(capsys, make):
+    with pytest.raises(ValueError):
+        make()
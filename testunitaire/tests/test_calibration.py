@@ -0,0 +1,49 @@
+import json
+import os
+
+import pytest
+
+from calibration import CalibrationStore
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'calibration.json')
+
+
+def test_missing_file_is_empty_calibration(path):
+    store = CalibrationStore(path)
+    assert store.section('servos') == {}
+    assert store.get('motors', 1, default=5) == 5
+    assert not os.path.exists(path)
+
+
+def test_update_merges_and_persists(path):
+    store = CalibrationStore(path)
+    store.update('servos', {0: {'offset': -35, 'min': 150}})
+    store.update('servos', {0: {'offset': -30}, 1: {'offset': 4}})
+    assert CalibrationStore(path).section('servos') == {'0': {'offset': -30, 'min': 150}, '1': {'offset': 4}}
+
+
+def test_section_is_a_copy(path):
+    store = CalibrationStore(path)
+    store.update('steering', {'center': 300})
+    store.section('steering')['center'] = 0
+    assert store.get('steering', 'center') == 300
+
+
+def test_corrupt_file_falls_back_to_defaults(path, capsys):
+    with open(path, 'w') as file:
+        file.write('{"servos": ')
+    assert CalibrationStore(path).section('servos') == {}
+    assert "illisible" in capsys.readouterr().out
+
+
+def test_failed_save_keeps_previous_file(path):
+    store = CalibrationStore(path)
+    store.update('motors', {1: {'deadband': 8}})
+    with pytest.raises(TypeError):
+        store.update('motors', {2: {'deadband': object()}})
+    with open(path) as file:
+        assert json.load(file) == {'motors': {'1': {'deadband': 8}}}
+    assert os.listdir(os.path.dirname(path)) == ['calibration.json']
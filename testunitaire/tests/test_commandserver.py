@@ -0,0 +1,88 @@
+import math
+
+import pytest
+
+import hal
+import tache4
+from commandserver import CommandServer, build_server, replay
+from tache3 import ServoController
+
+
+@pytest.fixture
+def server(capsys):
+    servos = ServoController()
+    server = CommandServer(servos=servos, motor=tache4.MotorRamp())
+    yield server
+    server.planner.stop()
+
+
+def ok(reply):
+    return reply.startswith("OK ")
+
+
+def test_servo_pulses_stay_valid_after_motor_command(server):
+    pca = server.servos.pwm
+    assert ok(server.execute("motor avant"))
+    assert ok(server.execute("servo 1 30"))
+    assert pca.frequency == hal.SERVO_FREQUENCY
+    assert pca.device.regs[1] == (0, server.servos.angle_to_pwm(1, 30))
+    assert server.servos.servo_min <= pca.device.regs[1][1] <= server.servos.servo_max
+
+
+def test_motor_command_does_not_retune_shared_chip(server, tmp_path):
+    path = str(tmp_path / 'jcvd.sock')
+    server.start(path=path)
+    try:
+        replies = replay(["motor ramp 20 1 0.1", "sleep 0.2", "motor stop"], path=path)
+    finally:
+        server.stop()
+    assert all(ok(reply) for _, reply, _ in replies)
+    assert server.servos.pwm.frequency == hal.SERVO_FREQUENCY
+
+
+def test_shared_chip_refuses_motor_frequency(server):
+    with pytest.raises(RuntimeError):
+        server.servos.pwm.frequency = 1000
+    assert server.servos.pwm.frequency == hal.SERVO_FREQUENCY
+
+
+@pytest.mark.parametrize("line", ["motor ramp nan 1 1", "motor ramp 50 1 inf", "motor ramp 1e400 1 1",
+                                  "servo glide 0 nan", "servo 1 nan", "servo 1 -inf"])
+def test_non_finite_arguments_rejected(server, line):
+    reply = server.execute(line)
+    assert reply.startswith("ERR ")
+    assert "non fini" in reply
+    assert server.motor._target_speed == 0
+    assert all(math.isfinite(angle) for angle in server.planner.targets.values())
+
+
+@pytest.mark.parametrize("error", [OverflowError, IndexError, KeyError])
+def test_unexpected_handler_error_is_reported(server, error):
+    def handler(args):
+        raise error("boom")
+    server.handlers['boom'] = handler
+    reply = server.execute("boom")
+    assert reply.startswith("ERR ") and error.__name__ in reply
+    assert ok(server.execute("ping"))
+
+
+def test_build_server_drives_front_rgb(tmp_path, capsys):
+    server = build_server()
+    assert server.rgb is not None
+    server.start(path=str(tmp_path / 'jcvd.sock'))
+    try:
+        replies = replay(['rgb both 255 0 0', 'rgb left 0 128 0'], path=str(tmp_path / 'jcvd.sock'))
+        assert all(ok(reply) for _, reply, _ in replies)
+        assert server.rgb.colors == {'left': (0, 128, 0), 'right': (255, 0, 0)}
+        assert server.rgb.backend != 'thread' or server.rgb._thread.is_alive()
+    finally:
+        server.stop()
+    assert server.rgb._thread is None
+
+
+def test_server_drives_the_controller_planner(server):
+    assert server.planner is server.servos.planner
+    assert ok(server.execute("servo glide 1 20"))
+    assert server.servos.planner.targets[1] == 20
+    assert server.servos.planner.wait(1, timeout=2.0)
+    assert server.servos.current_positions[1] == 20
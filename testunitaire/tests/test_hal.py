@@ -0,0 +1,83 @@
+import threading
+
+import pytest
+
+import hal
+
+
+@pytest.fixture
+def pca():
+    return hal.pca9685(address=0x5f)
+
+
+def test_pca9685_is_shared_per_address(pca):
+    assert hal.pca9685(address=0x5f) is pca
+    assert hal.pca9685(address=0x40) is not pca
+
+
+def test_cache_skips_unchanged_writes(pca):
+    assert pca.set_pwm(3, 0, 300)
+    assert not pca.set_pwm(3, 0, 300)
+    pca.invalidate(3)
+    assert pca.set_pwm(3, 0, 300)
+    assert pca.cache_stats()['hits'] == 1
+
+
+def test_transaction_writes_consecutive_channels_in_one_block(pca):
+    for channel in range(4):
+        pca.set_pwm(channel, 0, 100)
+    with pca.transaction():
+        pca.set_pwm(0, 0, 200)
+        pca.set_pwm(2, 0, 200)
+        pca.set_pwm(3, 0, 200)
+    assert pca.block_writes == 1
+    assert [pca.device.regs[c] for c in range(4)] == [(0, 200), (0, 100), (0, 200), (0, 200)]
+
+
+def test_invalidate_waits_for_pending_transaction(pca):
+    pca.set_pwm(5, 0, 100)
+    entered, release = threading.Event(), threading.Event()
+
+    def tick():
+        with pca.transaction():
+            pca.set_pwm(5, 0, 150)
+            entered.set()
+            release.wait(1.0)
+    worker = threading.Thread(target=tick)
+    worker.start()
+    entered.wait(1.0)
+    invalidate = threading.Thread(target=pca.invalidate)
+    invalidate.start()
+    invalidate.join(0.05)
+    assert invalidate.is_alive()
+    release.set()
+    worker.join(1.0)
+    invalidate.join(1.0)
+    assert pca.last_regs == [None] * 16
+
+
+def test_frequency_lock_refuses_other_values(pca):
+    pca.lock_frequency()
+    pca.lock_frequency(hal.SERVO_FREQUENCY)
+    pca.set_pwm_freq(hal.SERVO_FREQUENCY)
+    with pytest.raises(RuntimeError):
+        pca.set_pwm_freq(1000)
+    with pytest.raises(RuntimeError):
+        pca.lock_frequency(1000)
+    assert pca.frequency == hal.SERVO_FREQUENCY
+
+
+@pytest.mark.parametrize("value, expected", [(0x1234, 0x1200), (0xFFFF, 0xFF00), (70000, 0xFF00),
+                                             (-1, 0), (127.9, 0)])
+def test_ads7830_keeps_8_significant_bits(value, expected):
+    adc = hal.SimADS7830()
+    adc.set_value(2, value)
+    assert adc.read(2) == expected
+    assert adc.channel(2).value == expected
+
+
+@pytest.mark.parametrize("value", [float('nan'), float('inf')])
+def test_ads7830_rejects_non_finite_values(value):
+    adc = hal.SimADS7830()
+    with pytest.raises(ValueError):
+        adc.set_value(0, value)
@@ -0,0 +1,50 @@
+import math
+
+import pytest
+
+import hal
+from scanner import HEAD_CHANNEL, SweepScanner
+from tache3 import ServoController
+
+
+@pytest.fixture
+def servos(capsys):
+    servos = ServoController()
+    yield servos
+    servos.planner.stop()
+
+
+@pytest.fixture
+def sensor(servos):
+    sensor = hal.SimDistanceSensor(max_distance=2.0)
+    # Obstacle à 0.3 m vers la droite (angles positifs), rien ailleurs
+    sensor.source = lambda: 0.3 if servos.current_positions[HEAD_CHANNEL] > 15 else 1.5
+    return sensor
+
+
+def test_sweep_fills_polar_map_in_both_directions(servos, sensor):
+    scanner = SweepScanner(servos, sensor, min_angle=-30, max_angle=30, step=15, settle=0.0)
+    scanner.sweep(passes=2)
+    angles, distances, ages = scanner.snapshot()
+    assert list(angles) == [-30, -15, 0, 15, 30]
+    assert list(distances) == [1.5, 1.5, 1.5, 1.5, 0.3]
+    assert (ages < 1.0).all()
+    assert scanner.scans == 2 and scanner.measurements == 9
+    assert scanner.closest() == (30.0, 0.3)
+    assert list(scanner.occupancy(max_distance=0.5)) == [False, False, False, False, True]
+
+
+def test_unmeasured_cells_are_nan_with_infinite_age(servos, sensor):
+    scanner = SweepScanner(servos, sensor, min_angle=-30, max_angle=30, step=15)
+    angles, distances, ages = scanner.snapshot()
+    assert all(math.isnan(d) for d in distances)
+    assert all(math.isinf(a) for a in ages)
+    assert scanner.closest() is None
+
+
+@pytest.mark.parametrize("kwargs", [dict(min_angle=-120), dict(max_angle=100), dict(step=0),
+                                    dict(min_angle=30, max_angle=-30), dict(step=float('nan')),
+                                    dict(channel=7)])
+def test_invalid_sweep_range_rejected(servos, sensor, kwargs):
+    with pytest.raises(ValueError):
+        SweepScanner(servos, sensor, **kwargs)
@@ -0,0 +1,65 @@
+import pytest
+
+import hal
+from scheduler import Scheduler, build_robot
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_build_robot_reuses_follower_drivers(capsys):
+    scheduler = Scheduler()
+    robot = build_robot(scheduler)
+    follower = robot['follower']
+    assert robot['planner'] is follower.servos.planner
+    assert robot['motor'] is follower.motor
+    assert 'ramp' not in scheduler.tasks
+    assert follower.servos.pwm.frequency == hal.SERVO_FREQUENCY
+
+
+def test_highest_priority_due_task_runs_first():
+    clock = FakeClock()
+    scheduler = Scheduler(clock=clock)
+    calls = []
+    scheduler.add('low', lambda now: calls.append('low'), period=0.01, priority=1)
+    scheduler.add('high', lambda now: calls.append('high'), period=0.01, priority=5)
+    for task in scheduler.tasks.values():
+        task.deadline = 0.0
+    scheduler.run_once()
+    scheduler.run_once()
+    assert calls == ['high', 'low']
+
+
+def test_missed_periods_are_skipped_not_replayed():
+    clock = FakeClock()
+    scheduler = Scheduler(clock=clock)
+    task = scheduler.add('slow', lambda now: None, period=0.01)
+    task.deadline = 0.0
+    clock.now = 0.055
+    scheduler.run_once()
+    assert task.skipped == 4
+    assert abs(task.deadline - 0.05) < 1e-9      # période en cours : démarre dès que possible
+
+
+def test_task_error_is_counted_and_scheduling_continues(capsys):
+    clock = FakeClock()
+    scheduler = Scheduler(clock=clock)
+
+    def fail(now):
+        raise ValueError("boom")
+    task = scheduler.add('fail', fail, period=0.01)
+    task.deadline = 0.0
+    scheduler.run_once()
+    assert scheduler.errors == 1
+    assert task.runs == 1 and task.deadline == 0.01
+    assert "boom" in capsys.readouterr().out
+
+
+def test_add_requires_rate_or_period():
+    with pytest.raises(ValueError):
+        Scheduler().add('none', lambda now: None)
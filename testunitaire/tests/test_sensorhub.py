@@ -0,0 +1,72 @@
+import os
+import time
+from multiprocessing import shared_memory
+
+import pytest
+
+from sensorhub import RECORD, SeqlockWriter, SensorHub, SensorHubClient
+
+
+@pytest.fixture
+def block():
+    name = f"jcvd_test_{os.getpid()}"
+    shm = shared_memory.SharedMemory(name=name, create=True, size=RECORD.itemsize)
+    writer = SeqlockWriter(shm.buf)
+    client = SensorHubClient(name, timeout=0.02)
+    yield writer, client
+    client.close()
+    writer._seq = writer._dst = None
+    shm.close()
+    shm.unlink()
+
+
+def test_read_returns_last_publication(block):
+    writer, client = block
+    writer.record['distance'] = 0.42
+    writer.record['ir'] = [1, 0, 1]
+    writer.publish(now=5.0)
+    record = client.read()
+    assert record['distance'] == pytest.approx(0.42)
+    assert tuple(record['ir']) == (1, 0, 1)
+    assert client.ir()[0] == (1, 0, 1)
+    assert client.staleness(now=6.0)['distance'] == float('inf')
+
+
+def test_read_is_a_view_overwritten_by_next_read(block):
+    writer, client = block
+    writer.record['distance'] = 1.0
+    writer.publish()
+    first = client.read()
+    kept = first.copy()
+    writer.record['distance'] = 2.0
+    writer.publish()
+    client.read()
+    assert first['distance'] == 2.0
+    assert kept['distance'] == 1.0
+
+
+def test_read_gives_up_when_writer_died_mid_write(block):
+    writer, client = block
+    writer._seq[0] += 1            # écrivain tué entre les deux incréments
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        client.read()
+    assert time.monotonic() - start < 1.0
+    assert client.retries > 0
+
+
+def test_hub_process_publishes_sensors():
+    hub = SensorHub(name=f"jcvd_hub_{os.getpid()}")
+    hub.start()
+    try:
+        client = hub.client()
+        deadline = time.monotonic() + 5.0
+        while client.staleness()['ir'] == float('inf') and time.monotonic() < deadline:
+            time.sleep(0.01)
+        ages = client.staleness()
+        assert ages['ir'] < 1.0 and ages['adc'] < 1.0
+        assert client.read()['publishes'] > 1
+        client.close()
+    finally:
+        hub.stop()
+    assert hub.process is None and hub.shm is None
@@ -0,0 +1,82 @@
+import math
+
+import pytest
+
+import simulator
+import tache6
+from tache3 import ServoController
+
+
+@pytest.fixture(scope='module')
+def track():
+    return simulator.Track.from_segments(simulator.OVAL_S)
+
+
+def test_track_is_closed_loop(track):
+    start, end = track.centerline[0], track.centerline[-1]
+    assert math.hypot(*(end - start)) < 0.01
+    assert track.on_line(0.0, 0.0)
+    assert not track.on_line(0.0, 0.2)
+
+
+def test_straight_run_at_constant_throttle(track):
+    sim = simulator.RobotSimulator(track)
+    sim.motor.throttle = 0.5
+    for _ in range(50):
+        sim.step(0.01)
+    assert sim.x > 0 and sim.y == pytest.approx(0.0)
+    assert 0 < sim.speed < 0.5
+
+
+def test_positive_steering_turns_right(track):
+    sim = simulator.RobotSimulator(track)
+    sim.motor.throttle = 0.5
+    for _ in range(50):
+        sim.step(0.01, steer_deg=20)
+    assert sim.heading < 0 and sim.y < 0
+
+
+def test_ir_sensors_see_the_line_at_start(track):
+    sim = simulator.RobotSimulator(track)
+    assert tuple(sensor.value for sensor in sim.ir_sensors()) == (0, 1, 0)
+
+
+def test_ultrasonic_raycast_hits_obstacle():
+    track = simulator.Track.from_segments(simulator.OVAL_S)
+    sim = simulator.RobotSimulator(track)
+    track.add_obstacle(sim.ULTRASONIC_MOUNT + 0.5, -0.2, 0.05, 0.4)
+    assert sim.ultrasonic_distance() == pytest.approx(0.5, abs=track.resolution)
+    assert sim.ultrasonic_distance(pan=90) > 0.5
+
+
+def run_pid(track, steering, seed=0):
+    servos = ServoController()
+    if steering is not None:
+        servos.servo_configs[0].update(min_angle=steering[0], max_angle=steering[1])
+    sim = simulator.RobotSimulator(track, ir_noise=0.01, seed=seed)
+    pid = tache6.PIDLineFollower(servos=servos, motor=sim.motor, sensors=sim.ir_sensors())
+    return sim.run(pid.step, steering=lambda: pid.angle, rate=100)
+
+
+def test_runs_are_deterministic(track, capsys):
+    first, second = run_pid(track, (-30, 30)), run_pid(track, (-30, 30))
+    assert first['lap_time'] == second['lap_time'] and first['ticks'] == second['ticks']
+
+
+def test_pid_lap_depends_on_steering_range(track, capsys):
+    assert run_pid(track, (-30, 30))['lap_time'] is not None
+    real = run_pid(track, None)          # direction réelle : +5° au plus vers la droite
+    assert real['lap_time'] is None and real['laps'] < 1
+
+
+@pytest.mark.parametrize("rate", [0, -10, float('nan')])
+def test_run_rejects_invalid_rate(track, rate):
+    with pytest.raises(ValueError):
+        simulator.RobotSimulator(track).run(lambda dt, now: None, rate=rate)
+
+
+def test_step_rejects_non_finite_steering(track):
+    sim = simulator.RobotSimulator(track)
+    with pytest.raises(ValueError):
+        sim.step(0.01, steer_deg=float('nan'))
+    assert sim.heading == 0.0
@@ -0,0 +1,90 @@
+import os
+import time
+
+import pytest
+
+import hal
+import tache1
+
+
+def wait_for(condition, timeout=1.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.001)
+    return condition()
+
+
+def test_rgb_cpu_time_is_accounted_while_running(capsys):
+    engine = tache1.FrontRGBEngine(backend='thread')
+    engine.set_color('both', (128, 64, 32))
+    engine.start()
+    try:
+        assert wait_for(lambda: engine.periods > 20)
+        assert engine.stats()['cpu_percent'] > 0
+    finally:
+        engine.stop()
+
+
+def test_rgb_static_colour_change_wakes_pwm_thread(capsys):
+    gpio = hal.sim_gpio()
+    engine = tache1.FrontRGBEngine(backend='thread')
+    red = engine.pins[0]
+    on, off = engine._on[0], engine._off[0]
+    engine.set_color('left', (255, 0, 0))
+    engine.start()
+    try:
+        assert wait_for(lambda: gpio.levels[red] == on)
+        start = time.monotonic()
+        engine.set_color('left', (0, 0, 0))
+        assert wait_for(lambda: gpio.levels[red] == off, timeout=0.05)
+        assert time.monotonic() - start < 0.05     # sans attendre le délai de 0.1 s
+    finally:
+        engine.stop()
+
+
+@pytest.fixture
+def no_setup(monkeypatch):
+    monkeypatch.setattr(tache1, '_pins', [None] * 10)
+    monkeypatch.setattr(tache1, '_names', [None] * 10)
+    monkeypatch.setattr(tache1, '_invert', [0] * 10)
+
+
+def test_switch_sets_pins_up_on_first_use(no_setup, capsys):
+    gpio = hal.sim_gpio()
+    tache1.switch(1, 1, verbose=False)
+    assert gpio.levels[tache1.LED_TABLE[1][1]] == 1
+    tache1.switch(4, 1, verbose=False)             # feu avant : logique inversée
+    assert gpio.levels[tache1.LED_TABLE[4][1]] == 0
+
+
+def test_switch_many_sets_pins_up_on_first_use(no_setup, capsys):
+    gpio = hal.sim_gpio()
+    tache1.set_all_switch_on(verbose=False)
+    assert all(gpio.levels[pin] == (0 if inverted else 1) for _, pin, inverted in tache1.LED_TABLE.values())
+
+
+def test_switch_many_rejects_unknown_leds(capsys):
+    tache1.switch_many([1, 12], 1, verbose=False)
+    assert "n'existe pas" in capsys.readouterr().out
+
+
+def test_rgb_gamma_is_shared_with_ws2812():
+    import gamma
+    import tache2
+    assert tache1.RGB_GAMMA == tache2.DEFAULT_GAMMA == gamma.DEFAULT_GAMMA
+
+
+def test_tache1_does_not_load_ws2812_driver():
+    import subprocess
+    import sys
+    code = "import sys, tache1; sys.exit('tache2' in sys.modules)"
+    assert subprocess.run([sys.executable, '-c', code], cwd=os.path.dirname(tache1.__file__)).returncode == 0
+
+
+@pytest.mark.parametrize("statuses", [[1], [1, 0, 1]])
+def test_switch_many_rejects_length_mismatch(statuses):
+    gpio = hal.sim_gpio()
+    tache1.switch_many([1, 2], 0, verbose=False)
+    with pytest.raises(ValueError):
+        tache1.switch_many([1, 2], statuses, verbose=False)
+    assert gpio.levels[tache1.LED_TABLE[1][1]] == 0 and gpio.levels[tache1.LED_TABLE[2][1]] == 0
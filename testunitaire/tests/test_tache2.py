@@ -0,0 +1,119 @@
+import threading
+
+import numpy
+import pytest
+
+import hal
+import tache2
+from tache2 import WS2812Controller
+
+
+def make_controller(count=14):
+    return WS2812Controller(count=count, spi=hal.SimSPI())
+
+
+def test_brightness_setter_waits_for_render_lock(capsys):
+    controller = make_controller()
+    held, release = threading.Event(), threading.Event()
+
+    def render():
+        with controller.lock:
+            held.set()
+            release.wait(1.0)
+    worker = threading.Thread(target=render)
+    worker.start()
+    held.wait(1.0)
+    setter = threading.Thread(target=setattr, args=(controller, 'led_brightness', 10))
+    setter.start()
+    setter.join(0.05)
+    assert setter.is_alive()           # bloqué tant que la trame est en cours
+    release.set()
+    setter.join(1.0)
+    worker.join(1.0)
+    assert controller.led_brightness == 10
+
+
+def test_brightness_change_is_applied_to_next_frame(capsys):
+    controller = make_controller()
+    controller.fill(slice(None), (255, 255, 255))
+    controller._render()
+    assert controller._frame.max() == 255
+    controller.led_brightness = 100
+    controller._render()
+    assert controller._frame.max() == 100
+    assert not controller._lut_stale
+
+
+@pytest.mark.parametrize("rgb", [(300, 0, 0), (0, -1, 0), (0, 0, 256)])
+def test_set_ledpixel_rejects_out_of_range_components(capsys, rgb):
+    controller = make_controller()
+    with pytest.raises(ValueError):
+        controller.set_ledpixel(5, *rgb)
+    assert not controller.pixels[5].any()
+
+
+def test_control_led_rejects_out_of_range_intensity(capsys):
+    controller = make_controller()
+    with pytest.raises(ValueError):
+        controller.control_led(5, 'R', 300)
+    controller.control_led(5, 'R', 255)
+    assert tuple(controller.pixels[5]) == (255, 0, 0)
+
+
+def test_manual_control_survives_out_of_range_intensity(monkeypatch, capsys):
+    commands = iter(["5,R,300", "5,R,128", "exit"])
+    monkeypatch.setattr('builtins.input', lambda prompt='': next(commands))
+    monkeypatch.setattr(tache2, 'WS2812Controller', lambda: make_controller())
+    tache2.manual_control()
+    out = capsys.readouterr().out
+    assert "hors de 0-255" in out
+
+
+@pytest.mark.parametrize("write", [
+    lambda c: c.set_pixels([1, 2], numpy.array([[0, 0, 0], [300, 0, 0]])),
+    lambda c: c.set_pixels(slice(None), (0, -1, 0)),
+    lambda c: c.fill(slice(2, 5), (256, 0, 0)),
+    lambda c: c.fill([3], numpy.array([0.0, float('nan'), 0.0])),
+    lambda c: c.blit(numpy.full((4, 3), 1000), offset=2),
+    lambda c: c.blit([[10, 20, 30], [-5, 0, 0]]),
+])
+def test_bulk_writers_reject_out_of_range_colors(capsys, write):
+    controller = make_controller()
+    with pytest.raises(ValueError):
+        write(controller)
+    assert not controller.pixels.any()
+
+
+def test_bulk_writers_accept_valid_colors(capsys):
+    controller = make_controller()
+    controller.set_pixels([0, 1], numpy.array([[1, 2, 3], [4, 5, 6]], dtype=numpy.uint8))
+    controller.fill(slice(2, 4), (255, 0, 0))
+    controller.blit([[7, 8, 9]], offset=4)
+    assert controller.pixels[:5].tolist() == [[1, 2, 3], [4, 5, 6], [255, 0, 0], [255, 0, 0], [7, 8, 9]]
+
+
+@pytest.mark.parametrize("write", [
+    lambda c: c.set_ledpixel(0, 9, 9, 9),
+    lambda c: c.set_pixels([0], (9, 9, 9)),
+    lambda c: c.fill(slice(None), (9, 9, 9)),
+    lambda c: c.blit([[9, 9, 9]]),
+])
+def test_writers_wait_for_frame_in_progress(capsys, write):
+    controller = make_controller()
+    held, release = threading.Event(), threading.Event()
+
+    def render():
+        with controller.lock:
+            held.set()
+            release.wait(1.0)
+    worker = threading.Thread(target=render)
+    worker.start()
+    held.wait(1.0)
+    writer = threading.Thread(target=write, args=(controller,))
+    writer.start()
+    writer.join(0.05)
+    assert writer.is_alive() and not controller.pixels.any()
+    release.set()
+    writer.join(1.0)
+    worker.join(1.0)
+    assert controller.pixels[0].tolist() == [9, 9, 9]
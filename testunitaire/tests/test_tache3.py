@@ -0,0 +1,62 @@
+import pytest
+
+import calibration
+from tache3 import ServoController, ServoMotionPlanner
+
+
+@pytest.fixture
+def planner(capsys):
+    planner = ServoMotionPlanner(ServoController())
+    yield planner
+    planner.stop()
+
+
+@pytest.mark.parametrize("angle", [float('nan'), float('inf'), float('-inf')])
+def test_set_target_rejects_non_finite_angle(planner, angle):
+    before = dict(planner.targets)
+    assert not planner.set_target(1, angle)
+    assert planner.targets == before
+
+
+def test_set_target_rejects_out_of_range_angle(planner):
+    config = planner.controller.servo_configs[0]
+    assert not planner.set_target(0, config['max_angle'] + 1)
+    assert planner.set_target(0, config['max_angle'])
+
+
+def test_wait_returns_when_its_channel_arrives_while_another_moves(planner):
+    planner.set_target(2, 10)                       # tête H/B : arrivée rapide
+    planner.set_target(15, 90, max_speed=10)        # servo libre : encore ~9 s de mouvement
+    planner.start()
+    assert planner.wait(2, timeout=2.0)
+    assert planner.positions[2] == 10
+    assert planner.is_moving(15)
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = calibration.CalibrationStore(str(tmp_path / 'calibration.json'))
+    monkeypatch.setattr(calibration, '_store', store)
+    return store
+
+
+def test_steering_calibration_is_loaded_at_startup(store, capsys):
+    # Mêmes clés que tache4.servo_calibration
+    store.update('steering', {'address': '0x5f', 'channel': 0, 'center': 325, 'left_50': 250, 'right_50': 400})
+    servos = ServoController()
+    assert servos.angle_to_pwm(0, 0) == 325
+    assert servos.angle_to_pwm(0, -50) == 250
+    assert servos.pwm.device.regs[0] == (0, 325)      # move_to_center au démarrage
+
+
+def test_steering_defaults_without_calibration(store, capsys):
+    servos = ServoController()
+    config = servos.servo_configs[0]
+    assert 'calibration_points' not in config
+    expected = servos.servo_center + int(config['offset'] / 90.0 * (servos.servo_max - servos.servo_min) / 2)
+    assert servos.angle_to_pwm(0, 0) == expected
+
+
+def test_steering_calibration_for_other_chip_is_ignored(store, capsys):
+    store.update('steering', {'address': '0x40', 'channel': 0, 'center': 325})
+    assert 'calibration_points' not in ServoController().servo_configs[0]
@@ -0,0 +1,20 @@
+import pytest
+
+import tache4
+
+
+@pytest.mark.parametrize("kwargs", [dict(target_speed=float('nan')), dict(target_speed=float('inf')),
+                                    dict(target_speed=50, duration=float('nan')),
+                                    dict(target_speed=50, from_speed=float('nan'))])
+def test_ramp_rejects_non_finite_values(kwargs):
+    ramp = tache4.MotorRamp(clock=lambda: 0.0)
+    with pytest.raises(ValueError):
+        ramp.start(**kwargs)
+    assert not ramp.active
+    assert ramp.value_at(0.0) == 0.0
+
+
+def test_ramp_clamps_speed():
+    ramp = tache4.MotorRamp(clock=lambda: 0.0)
+    ramp.start(150, tache4.DIR_BACKWARD, duration=1.0)
+    assert ramp.value_at(1.0) == -100
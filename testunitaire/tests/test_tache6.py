@@ -0,0 +1,23 @@
+import hal
+import tache6
+from tache3 import ServoController
+
+
+def test_line_follower_keeps_servo_frequency(capsys):
+    follower = tache6.LineFollower(verbose=False)
+    servos = ServoController()
+    follower.steer = lambda angle: servos.set_angle(0, angle, verbose=False)
+    follower.apply((1, 1, 0))      # ligne à gauche : -15°
+    assert follower.pwm.frequency == hal.SERVO_FREQUENCY
+    assert follower.pwm is servos.pwm
+    assert servos.current_positions[0] == -15
+    assert follower.pwm.device.regs[0] == (0, servos.angle_to_pwm(0, -15))
+
+
+def test_pid_steering_bounded_by_real_servo_config(capsys):
+    servos = ServoController()
+    follower = tache6.PIDLineFollower(servos=servos, motor=object(), sensors=(), max_steer=30)
+    config = servos.servo_configs[tache6.STEERING_CHANNEL]
+    assert (follower.steer_min, follower.steer_max) == (-30, config['max_angle'])
+    assert follower.steer_max == 5
+    assert "Braquage limité" in capsys.readouterr().out